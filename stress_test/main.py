@@ -1,11 +1,41 @@
+import argparse
+import ast
+import asyncio
+import builtins
+import concurrent.futures
+import ctypes
+import csv
+import hashlib
+import importlib
+import importlib.util
+import io
+import itertools
 import json
+import linecache
+import math
+import mmap
 import multiprocessing
 import os
+import pstats
+import queue
+import random
 import re
+import selectors
 import shlex
 import signal
+import socket
+import sqlite3
+import statistics
+import struct
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import traceback
+from collections import deque
+from multiprocessing.managers import BaseManager
 from pathlib import Path
 
 # --- ANSI Color Codes ---
@@ -27,6 +57,252 @@ except ImportError:
 # This is the standard, required pattern for signal handlers
 # to access the pool, and it prevents pickling errors.
 pool = None
+# Set to stop the main-process task producer (see _batched_tasks)
+# before terminating the pool, whose task thread may be waiting on it.
+tasks_stop = None
+# Proxy to the shared seen-set of generated cases (see CaseDeduplicator).
+# Set before the pool is created so forked workers inherit it.
+deduplicator = None
+# Process groups of children run by the asyncio supervisor (which has no
+# pool workers to kill them on shutdown)
+async_child_pgids = set()
+
+# Watch mode's run counter, shared with the (forked) workers so tasks
+# queued before an edit are skipped instead of run
+watch_epoch = None
+# Watch mode: the process group each worker is running (-1 when idle,
+# 0 for a free slot), so the parent can kill tests of a cancelled run
+watch_pgids = None
+# This worker's slot in 'watch_pgids', and the epoch of its current task
+_watch_slot = None
+_watch_task_epoch = None
+
+# --- Warm Fork-Server State ---
+# Each pool worker compiles a Python script (and imports its modules)
+# once, then forks a pre-initialized child per test.
+# Lives at module level so it survives between imap_unordered tasks.
+# {command: (script mtime, (code, script_path) or None)}
+_warm_programs = {}
+
+# Bytes this process has added to the brute cache since it last evicted
+_brute_cache_written = 0
+
+# Child launchers (see ChildLauncher), one per process and thread:
+# {(pid, thread id): ChildLauncher}
+_launchers = {}
+
+# Environment variable telling a batched generator how many cases to emit
+BATCH_SIZE_ENV = "STRESS_BATCH_SIZE"
+
+# Environment variable carrying the seed a generator should use.
+# Every test index is its own seed, so any case can be regenerated.
+SEED_ENV = "STRESS_SEED"
+
+# Environment variable telling a generator which input size to produce
+BENCHMARK_SIZE_ENV = "STRESS_N"
+
+# Growth models for the benchmark's empirical big-O fit
+COMPLEXITY_MODELS = {
+    "O(1)": lambda n: 0.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n sqrt n)": lambda n: n * math.sqrt(n),
+    "O(n^2)": lambda n: n * n,
+    "O(n^2 log n)": lambda n: n * n * math.log2(n),
+    "O(n^3)": lambda n: n**3,
+}
+
+# Stages of the pipelined scheduler, in dispatch priority order
+PIPELINE_STAGES = ("solution_a", "solution_b", "generate")
+
+# Verdicts that say nothing about solution_a, so are not minimized
+UNMINIMIZABLE_VERDICTS = (
+    "Generator Error",
+    "Brute Force Error",
+    "Interactor Error",
+    "Measure Error",
+    "Checker Error",
+    # The tester could not run solution_a at all
+    "Tester RE",
+)
+
+# The worst-case hunter passes generator parameter NAME as STRESS_NAME
+HUNT_PARAM_ENV_PREFIX = "STRESS_"
+
+# Interactive mode keeps at most this much of each side of the dialogue
+TRANSCRIPT_LIMIT = 64 * 1024
+
+# stderr text of a program that hit its RLIMIT_AS cap (Python, C++, Rust)
+MEMORY_ERROR_SIGNATURES = ("MemoryError", "std::bad_alloc", "memory allocation of")
+
+# Interpreter names that can be served by forking this interpreter
+PYTHON_INTERPRETER_RE = re.compile(r"python(\d+(\.\d+)?)?$")
+
+# Runs a script under cProfile: python -c PROFILE_WRAPPER script out cap_s.
+# The cap is enforced in-process (CPU timer) so a profile is still saved
+# for a program that never finishes.
+PROFILE_WRAPPER = """
+import cProfile, os, signal, sys
+script, out_path, cap_s = sys.argv[1], sys.argv[2], float(sys.argv[3])
+sys.argv = [script]
+sys.path[0] = os.path.dirname(os.path.abspath(script))
+with open(script, "rb") as f:
+    code = compile(f.read(), script, "exec")
+globs = {"__name__": "__main__", "__file__": script, "__builtins__": __builtins__}
+
+class CapReached(BaseException):
+    pass
+
+def on_cap(signum, frame):
+    raise CapReached
+
+signal.signal(signal.SIGPROF, on_cap)
+signal.setitimer(signal.ITIMER_PROF, cap_s)
+profiler = cProfile.Profile()
+status = 0
+try:
+    profiler.enable()
+    exec(code, globs)
+except CapReached:
+    status = 124
+except SystemExit as e:
+    status = e.code if isinstance(e.code, int) else 1
+except BaseException:
+    import traceback
+    traceback.print_exc()
+    status = 1
+finally:
+    profiler.disable()
+    signal.setitimer(signal.ITIMER_PROF, 0)
+    profiler.dump_stats(out_path)
+sys.stdout.flush()
+os._exit(status)
+"""
+
+# Runs a script under tracemalloc: python -c MEMORY_WRAPPER script out.
+# A watcher thread snapshots the heap each time it grows by a quarter, so
+# the snapshot dumped at exit is (close to) the one at peak.
+MEMORY_WRAPPER = """
+import os, sys, threading, tracemalloc
+script, out_path = sys.argv[1], sys.argv[2]
+sys.argv = [script]
+sys.path[0] = os.path.dirname(os.path.abspath(script))
+with open(script, "rb") as f:
+    code = compile(f.read(), script, "exec")
+globs = {"__name__": "__main__", "__file__": script, "__builtins__": __builtins__}
+peak = [0, None]
+done = threading.Event()
+
+def snapshot_if_peak():
+    current = tracemalloc.get_traced_memory()[0]
+    if current > peak[0] * 1.25:
+        peak[:] = [current, tracemalloc.take_snapshot()]
+
+def watch():
+    while not done.wait(0.005):
+        snapshot_if_peak()
+
+tracemalloc.start()
+watcher = threading.Thread(target=watch, daemon=True)
+watcher.start()
+status = 0
+try:
+    exec(code, globs)
+except SystemExit as e:
+    status = e.code if isinstance(e.code, int) else 1
+except BaseException:
+    import traceback
+    traceback.print_exc()
+    status = 1
+finally:
+    done.set()
+    watcher.join()
+    snapshot_if_peak()
+    tracemalloc.stop()
+    globs.clear()
+    peak[1].dump(out_path)
+sys.stdout.flush()
+os._exit(status)
+"""
+
+# The process ChildLauncher runs (python -S -I -c LAUNCHER_SCRIPT <fd>).
+# Requests and replies are JSON messages on a SOCK_SEQPACKET socket;
+# a spawn request carries the child's stdin/stdout/stderr as fds.
+LAUNCHER_SCRIPT = """
+import json, os, resource, selectors, signal, socket, sys
+signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is the tester's job
+sock = socket.socket(fileno=int(sys.argv[1]))
+sock.set_inheritable(False)
+sel = selectors.DefaultSelector()
+sel.register(sock, selectors.EVENT_READ)
+
+def reply(message):
+    try:
+        sock.send(json.dumps(message).encode())
+    except ConnectionError:
+        sys.exit(0)  # The tester went away
+
+def spawn(request, fds):
+    err_r, err_w = os.pipe()  # Both close-on-exec: EOF means exec worked
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.setpgid(0, request["pgid"])
+            for signum in (signal.SIGINT, signal.SIGPIPE, signal.SIGXFSZ):
+                signal.signal(signum, signal.SIG_DFL)
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+            for fd in fds:
+                if fd > 2:
+                    os.close(fd)
+            time_s, mem_bytes = request["time_s"], request["mem_mb"] * 1024 * 1024
+            # Hard limit 1s later: the soft one sends SIGXCPU, not SIGKILL
+            resource.setrlimit(resource.RLIMIT_CPU, (time_s, time_s + 1))
+            resource.setrlimit(resource.RLIMIT_AS, (mem_bytes, mem_bytes))
+            if request["env"] is None:
+                os.execvp(request["argv"][0], request["argv"])
+            os.execvpe(request["argv"][0], request["argv"], request["env"])
+        except BaseException as e:
+            os.write(err_w, f"{type(e).__name__}: {e}".encode())
+        os._exit(127)
+    os.close(err_w)
+    for fd in fds:
+        os.close(fd)
+    error = b""
+    while chunk := os.read(err_r, 4096):
+        error += chunk
+    os.close(err_r)
+    if error:
+        os.waitpid(pid, 0)
+        reply({"error": error.decode(errors="replace")})
+        return
+    sel.register(os.pidfd_open(pid), selectors.EVENT_READ, pid)
+    reply({"spawned": pid})
+
+while True:
+    for key, _ in sel.select():
+        if key.fileobj is sock:
+            try:
+                message, fds, _, _ = socket.recv_fds(sock, 1 << 20, 3)
+            except ConnectionError:
+                message = b""  # Killed mid-exchange
+            if not message:
+                sys.exit(0)  # The tester went away
+            spawn(json.loads(message), fds)
+        else:
+            sel.unregister(key.fileobj)
+            os.close(key.fileobj)
+            _, status, rusage = os.wait4(key.data, 0)
+            reply(
+                {
+                    "exited": key.data,
+                    "status": status,
+                    "time": rusage.ru_utime + rusage.ru_stime,
+                    "maxrss_kb": rusage.ru_maxrss,
+                }
+            )
+"""
 
 
 def _main_shutdown_handler(signum, frame):
@@ -35,6 +311,8 @@ def _main_shutdown_handler(signum, frame):
     Catches SIGTERM/SIGINT and gracefully shuts down the global pool.
     """
     global pool
+    if tasks_stop:
+        tasks_stop.set()
     if signum == signal.SIGTERM:
         print(f"\n\n{YELLOW}SIGTERM received. Shutting down pool...{RESET}")
     elif signum == signal.SIGINT:
@@ -43,26 +321,611 @@ def _main_shutdown_handler(signum, frame):
     if pool:
         pool.terminate()
         pool.join()
+    for pgid in list(async_child_pgids):
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
     print("Pool shut down. Exiting.")
     sys.exit(0)
 
 
+def _pin_worker(free_cores):
+    """
+    Pool initializer for timing-accurate mode: pins this worker (and so
+    every child it spawns) to one dedicated core.
+    """
+    # Every core is handed out once: a worker the pool starts to replace
+    # a dead one finds the queue empty and stays unpinned
+    try:
+        core = free_cores.get(timeout=1)
+    except queue.Empty:
+        return
+    os.sched_setaffinity(0, {core})
+
+
+def _exec_warm_program(code, script_path, extra_env=None):
+    """
+    Runs a precompiled script as '__main__' inside a freshly forked child.
+    Returns the exit code the script would have produced as a process.
+    """
+    # The pool worker's stdin is /dev/null; rebind the std streams to fds 0/1/2
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", closefd=False)
+    sys.stderr = open(2, "w", closefd=False)
+    sys.argv = [script_path]
+    sys.path[0] = str(Path(script_path).parent)
+    if extra_env:
+        os.environ.update(extra_env)
+
+    # Every forked child inherits the same RNG state; reseed it
+    if "random" in sys.modules:
+        sys.modules["random"].seed()
+
+    exit_code = 0
+    try:
+        exec(
+            code,
+            {
+                "__name__": "__main__",
+                "__file__": script_path,
+                "__builtins__": builtins,
+            },
+        )
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    return exit_code
+
+
+class ChildLauncher:
+    """
+    A small helper process that forks, limits and reaps children on the
+    tester's behalf (as '/usr/bin/time' does). ru_maxrss is a high-water
+    mark that survives exec, so a child forked straight from a pool
+    worker reports at least the worker's own RSS; forked from this
+    freshly exec'd helper, it starts from a few MB instead.
+    Used by one thread only (see _get_launcher).
+    """
+
+    def __init__(self):
+        self.sock, launcher_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-S", "-I", "-c", LAUNCHER_SCRIPT, str(launcher_sock.fileno())],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                pass_fds=(launcher_sock.fileno(),),
+            )
+        finally:
+            launcher_sock.close()
+        self.exits = {}  # {pid: exit message} not yet claimed by reap()
+
+    def _receive(self):
+        data = self.sock.recv(1 << 16)
+        if not data:
+            raise OSError("child launcher exited")
+        message = json.loads(data)
+        if "exited" in message:
+            self.exits[message["exited"]] = message
+        return message
+
+    def spawn(self, argv, fds, time_s, mem_mb, env=None, pgid=0):
+        """
+        Starts 'argv' with fds (stdin, stdout, stderr), the given limits,
+        and in process group 'pgid' (0: a new one). Returns its pid once
+        it has exec'd; raises OSError if it could not.
+        """
+        request = {
+            "argv": argv,
+            "env": env,
+            "time_s": time_s,
+            "mem_mb": mem_mb,
+            "pgid": pgid,
+        }
+        socket.send_fds(self.sock, [json.dumps(request).encode()], fds)
+        while True:
+            message = self._receive()
+            if "spawned" in message:
+                return message["spawned"]
+            if "error" in message:
+                raise OSError(message["error"])
+
+    def reap(self, pid):
+        """Waits for 'pid' to exit: (wait status, CPU seconds, peak RSS in kB)."""
+        while pid not in self.exits:
+            self._receive()
+        message = self.exits.pop(pid)
+        return message["status"], message["time"], message["maxrss_kb"]
+
+    def close(self):
+        self.sock.close()
+        self.process.wait()
+
+
+def _get_launcher():
+    """This thread's ChildLauncher (started on first use, and after a crash)."""
+    key = (os.getpid(), threading.get_ident())
+    launcher = _launchers.get(key)
+    if launcher is None or launcher.process.poll() is not None:
+        launcher = _launchers[key] = ChildLauncher()
+    return launcher
+
+
+def _close_launcher():
+    """Stops this thread's ChildLauncher, if any (before the thread ends)."""
+    launcher = _launchers.pop((os.getpid(), threading.get_ident()), None)
+    if launcher:
+        launcher.close()
+
+
+class CaseDeduplicator:
+    """
+    Seen-set of generated test case digests, shared by all workers
+    through a manager process. Exact up to 'exact_limit' entries; after
+    that every digest moves into a Bloom filter, which keeps memory
+    bounded at the cost of rarely skipping a genuinely new case.
+    """
+
+    BLOOM_HASHES = 7
+
+    def __init__(self, exact_limit, bloom_mb):
+        self.exact_limit = exact_limit
+        self.bloom_bits = bloom_mb * 8 * 1024 * 1024
+        self.exact = set()
+        self.bloom = None
+        self.unique = 0
+        self.duplicates = 0
+
+    def _bloom_positions(self, digest):
+        # Double hashing on two 64-bit halves of the (16-byte) digest
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [(h1 + i * h2) % self.bloom_bits for i in range(self.BLOOM_HASHES)]
+
+    def _bloom_add(self, digest):
+        """Sets the digest's bits; returns True if they were all set."""
+        seen = True
+        for bit in self._bloom_positions(digest):
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.bloom[byte] & mask:
+                seen = False
+                self.bloom[byte] |= mask
+        return seen
+
+    def mark_seen(self, digests):
+        """Records digests; returns for each whether it was seen before."""
+        results = []
+        for digest in digests:
+            if self.bloom is None:
+                seen = digest in self.exact
+                self.exact.add(digest)
+                if len(self.exact) > self.exact_limit:
+                    self.bloom = bytearray(self.bloom_bits // 8)
+                    for old in self.exact:
+                        self._bloom_add(old)
+                    self.exact = set()
+            else:
+                seen = self._bloom_add(digest)
+            if seen:
+                self.duplicates += 1
+            else:
+                self.unique += 1
+            results.append(seen)
+        return results
+
+    def stats(self):
+        return {
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "bloom": self.bloom is not None,
+        }
+
+
+class DedupManager(BaseManager):
+    pass
+
+
+DedupManager.register("CaseDeduplicator", CaseDeduplicator)
+
+
+class RunTelemetry:
+    """
+    Live throughput statistics of a stress run, plus an optional
+    JSON-lines log with one record per judged test.
+    """
+
+    # Per-stage latency percentiles are taken over this many recent tests
+    WINDOW = 10000
+    STAGES = (("gen", 5), ("a", 3), ("b", 4))  # (label, index in result)
+
+    def __init__(self, num_workers, log_path=None):
+        self.num_workers = num_workers
+        self.started = time.monotonic()
+        self.last_print = 0.0
+        self.tests = 0
+        self.busy = 0.0
+        self.latency = {label: deque(maxlen=self.WINDOW) for label, _ in self.STAGES}
+        self.slowest = (0, 0.0)  # (test_index, cpu time)
+        self.max_rss = 0.0
+        self.log = open(log_path, "a") if log_path else None
+
+    def record(self, result):
+        """Accounts for one judged test (a _run_single_test tuple)."""
+        test_index, verdict, test_case, sol_a, sol_b, gen_result = result
+        self.tests += 1
+        for label, position in self.STAGES:
+            wall = result[position].get("wall")
+            if wall is not None:
+                self.latency[label].append(wall)
+                self.busy += wall
+        if sol_a.get("time", 0) > self.slowest[1]:
+            self.slowest = (test_index, sol_a["time"])
+        self.max_rss = max(self.max_rss, sol_a.get("mem_mb", 0))
+
+        if self.log:
+            record = {
+                "test": test_index,
+                "verdict": verdict,
+                "input_sha256": gen_result.get("input_sha256")
+                or hashlib.sha256(test_case.encode()).hexdigest(),
+                "gen_time": gen_result.get("time"),
+                "a_time": sol_a.get("time"),
+                "a_wall": sol_a.get("wall"),
+                "a_mem_mb": sol_a.get("mem_mb"),
+                "b_time": sol_b.get("time"),
+                "b_wall": sol_b.get("wall"),
+                "b_mem_mb": sol_b.get("mem_mb"),
+                "b_cached": bool(sol_b.get("cached")),
+                "seed": gen_result.get("seed"),
+                "seed_offset": gen_result.get("seed_offset"),
+            }
+            self.log.write(json.dumps(record) + "\n")
+
+    @staticmethod
+    def _quantile(values, fraction):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def status_line(self):
+        """One-line summary: throughput, latencies, slowest test, RSS."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        parts = [f"{self.tests} tests", f"{self.tests / elapsed:.1f}/s"]
+        for label, _ in self.STAGES:
+            values = self.latency[label]
+            if values:
+                p50 = self._quantile(values, 0.50) * 1000
+                p99 = self._quantile(values, 0.99) * 1000
+                parts.append(f"{label} p50 {p50:.0f}ms p99 {p99:.0f}ms")
+        parts.append(f"slowest #{self.slowest[0]} {self.slowest[1]:.3f}s")
+        parts.append(f"max RSS {self.max_rss:.1f}MB")
+        utilization = self.busy / (elapsed * self.num_workers)
+        parts.append(f"util {min(utilization, 1.0):.0%}")
+        return " | ".join(parts)
+
+    def maybe_print(self, interval=0.25):
+        """Redraws the live status line at most every 'interval' seconds."""
+        now = time.monotonic()
+        if now - self.last_print >= interval:
+            self.last_print = now
+            print(f"\r\033[K{CYAN}[{RESET} {self.status_line()} {CYAN}]{RESET}", end="", flush=True)
+
+    def close(self):
+        if self.log:
+            self.log.close()
+            self.log = None
+
+
+class RunHistory:
+    """
+    SQLite record of stress runs: one 'runs' row per run (versions of
+    the scripts, limits, host) and one 'tests' row per judged test.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            started TEXT,
+            finished TEXT,
+            host TEXT,
+            outcome TEXT,
+            tests_run INTEGER,
+            solution_a TEXT,
+            solution_a_sha256 TEXT,
+            solution_b_sha256 TEXT,
+            generator_sha256 TEXT,
+            problem_time_s REAL,
+            problem_mem_mb REAL,
+            first_seed INTEGER,
+            max_tests INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS tests (
+            run_id INTEGER REFERENCES runs(id),
+            test_index INTEGER,
+            seed INTEGER,
+            input_sha256 TEXT,
+            verdict TEXT,
+            time_s REAL,
+            wall_s REAL,
+            mem_mb REAL
+        );
+        CREATE INDEX IF NOT EXISTS tests_by_run ON tests (run_id, input_sha256);
+    """
+    FLUSH_EVERY = 1000  # Test rows are inserted in batches
+
+    def __init__(self, db_path, run_info):
+        self.db = sqlite3.connect(db_path, timeout=30)  # Shards may share it
+        self.db.executescript(self.SCHEMA)
+        run_info = {**run_info, "started": time.strftime("%Y-%m-%d %H:%M:%S")}
+        columns = ", ".join(run_info)
+        marks = ", ".join("?" * len(run_info))
+        with self.db:
+            cursor = self.db.execute(
+                f"INSERT INTO runs ({columns}) VALUES ({marks})", list(run_info.values())
+            )
+        self.run_id = cursor.lastrowid
+        self.pending = []
+
+    def record(self, result):
+        """Queues one judged test (a _run_single_test tuple)."""
+        test_index, verdict, test_case, sol_a, sol_b, gen_result = result
+        self.pending.append(
+            (
+                self.run_id,
+                test_index,
+                gen_result.get("seed"),
+                gen_result.get("input_sha256")
+                or hashlib.sha256(test_case.encode()).hexdigest(),
+                verdict,
+                sol_a.get("time"),
+                sol_a.get("wall"),
+                sol_a.get("mem_mb"),
+            )
+        )
+        if len(self.pending) >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        with self.db:
+            self.db.executemany("INSERT INTO tests VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self.pending)
+        self.pending = []
+
+    def close(self, outcome, tests_run):
+        """Writes the remaining tests and the run's outcome."""
+        self.flush()
+        with self.db:
+            self.db.execute(
+                "UPDATE runs SET finished = ?, outcome = ?, tests_run = ? WHERE id = ?",
+                (time.strftime("%Y-%m-%d %H:%M:%S"), outcome, tests_run, self.run_id),
+            )
+        self.db.close()
+
+
+class FileWatcher:
+    """
+    Reports changes to a set of files. Uses inotify on Linux (through
+    libc via ctypes) on the files' directories, so editors that save by
+    rename are seen too; elsewhere it polls modification times.
+    """
+
+    # IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    INOTIFY_MASK = 0x08 | 0x80 | 0x100
+    EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self, paths):
+        self.paths = {Path(path).resolve() for path in paths}
+        self.mtimes = self._snapshot()
+        self.fd = None
+        self.watched_dirs = {}  # wd -> directory
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return
+            for directory in {path.parent for path in self.paths}:
+                wd = libc.inotify_add_watch(fd, str(directory).encode(), self.INOTIFY_MASK)
+                if wd >= 0:
+                    self.watched_dirs[wd] = directory
+            self.fd = fd
+        except (OSError, AttributeError):
+            pass  # No inotify: poll
+
+    def _snapshot(self):
+        mtimes = {}
+        for path in self.paths:
+            try:
+                mtimes[path] = path.stat().st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def _read_events(self):
+        """Drains pending inotify events; returns the watched paths hit."""
+        hit = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return hit
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                path = self.watched_dirs.get(wd, Path()) / name
+                if path in self.paths:
+                    hit.add(path)
+
+    def changed(self, timeout=0.0):
+        """
+        Waits up to 'timeout' seconds for a change and returns the sorted
+        list of changed files (empty if none).
+        """
+        if self.fd is not None:
+            with selectors.DefaultSelector() as sel:
+                sel.register(self.fd, selectors.EVENT_READ)
+                if not sel.select(timeout):
+                    return []
+            hit = self._read_events()
+            if not hit:
+                return []
+            time.sleep(0.1)  # Let multi-write saves settle
+            hit |= self._read_events()
+            self.mtimes = self._snapshot()
+            return sorted(hit)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            mtimes = self._snapshot()
+            hit = [path for path in self.paths if mtimes[path] != self.mtimes[path]]
+            if hit or time.monotonic() >= deadline:
+                self.mtimes = mtimes
+                return sorted(hit)
+            time.sleep(min(0.25, max(0.0, deadline - time.monotonic())))
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
 class StressTester:
-    def __init__(self, config_path: Path, script_dir: Path):
+    def __init__(self, config_path: Path, script_dir: Path, tester_overrides=None):
         print("Initializing Stress Tester...")
         self.config_path = Path(config_path)
         self.script_dir = script_dir
 
         self.config = self._load_config(self.config_path)
         self._validate_config(self.config)
-
-        self.can_measure = self._check_environment()
+        # Command-line options override the "tester" section
+        self.config["tester"].update(tester_overrides or {})
 
         self.current_child_pgid = None
 
         # Unpack config
         self._unpack_and_resolve_paths(self.config)
 
+        # Compile the "build" entries (or reuse cached binaries)
+        if self.config.get("build"):
+            self._build_commands(self.config["build"])
+
+        # "rusage" (wait4), "time" (/usr/bin/time -v) or None
+        self.measure_backend = self._check_environment()
+        self.can_measure = self.measure_backend is not None
+
+        # Commands that can be served by the warm fork-server
+        self.warm_commands = set()
+        if self.cfg_tester["warm_start"]:
+            self.warm_commands = self._find_warm_commands()
+
+        # Batched generation runs in the main process (alongside the pool's
+        # threads), where forking a Python child is unsafe. One exec per
+        # batch is cheap anyway.
+        self.batch_size = self.cfg_tester["generator_batch_size"]
+        if self.batch_size > 1:
+            self.warm_commands.discard(self.cfg_cmd["generator"])
+            print(
+                f"Batched generator: {CYAN}{self.batch_size}{RESET} cases per run."
+            )
+
+        # Fingerprint of the brute force (command + script contents), the
+        # fixed part of every brute cache key. None disables the cache.
+        self.brute_fingerprint = None
+        if self.cfg_tester["brute_cache_mb"] > 0 and "solution_b" in self.cfg_cmd:
+            self.brute_fingerprint = self._fingerprint_command(
+                self.cfg_cmd["solution_b"]
+            )
+
+        if self.cfg_tester["scheduler"] not in ("sequential", "pipelined", "asyncio"):
+            raise KeyError(
+                f"Config Error: 'scheduler' must be 'sequential', 'pipelined' or 'asyncio', got '{self.cfg_tester['scheduler']}'."
+            )
+        if self.cfg_tester["scheduler"] == "asyncio":
+            if self.measure_backend != "rusage" or not hasattr(os, "pidfd_open"):
+                print(
+                    f"{YELLOW}Warning: The asyncio scheduler needs wait4 rusage and pidfd (Linux 5.3+). Using 'sequential'.{RESET}"
+                )
+                self.cfg_tester["scheduler"] = "sequential"
+            elif self.batch_size > 1:
+                print(
+                    f"{YELLOW}Warning: The asyncio scheduler runs the generator once per test; 'generator_batch_size' is ignored.{RESET}"
+                )
+        if self.cfg_tester["checker"] not in ("exact", "tokens", "command"):
+            raise KeyError(
+                f"Config Error: 'checker' must be 'exact', 'tokens' or 'command', got '{self.cfg_tester['checker']}'."
+            )
+        if self.cfg_tester["checker"] == "command" and "checker" not in self.cfg_cmd:
+            raise KeyError(
+                "Config Error: checker 'command' needs a 'checker' entry in 'commands'."
+            )
+
+        # Interactive mode: solution_a talks to the interactor, which judges
+        self.interactive = self.cfg_tester["interactive"]
+        if self.interactive:
+            if "interactor" not in self.cfg_cmd:
+                raise KeyError(
+                    "Config Error: 'interactive' needs an 'interactor' entry in 'commands'."
+                )
+            if self.measure_backend != "rusage":
+                raise KeyError(
+                    "Config Error: 'interactive' needs the wait4 rusage backend."
+                )
+            if self.cfg_tester["scheduler"] != "sequential" or self.candidates:
+                print(
+                    f"{YELLOW}Warning: Interactive mode runs one solution per test on the 'sequential' scheduler.{RESET}"
+                )
+                self.cfg_tester["scheduler"] = "sequential"
+                self.candidates = None
+            self.cfg_tester["large_input"] = False
+            print(f"Interactive mode: {CYAN}{self.cfg_cmd['interactor']}{RESET} judges each test.")
+
+        # Large-input mode: bytes in memfds instead of text through pipes
+        self.large_input = self.cfg_tester["large_input"]
+        if self.large_input:
+            if self.measure_backend != "rusage" or not hasattr(os, "memfd_create"):
+                print(
+                    f"{YELLOW}Warning: Large-input mode needs wait4 rusage and memfd (Linux). Disabled.{RESET}"
+                )
+                self.large_input = False
+            else:
+                print(f"Large-input mode: {CYAN}memfd stdin/stdout, no pipes{RESET}.")
+                if self.cfg_tester["scheduler"] != "sequential" or self.batch_size > 1:
+                    print(
+                        f"{YELLOW}Warning: Large-input mode runs one generator per test on the 'sequential' scheduler.{RESET}"
+                    )
+                    self.cfg_tester["scheduler"] = "sequential"
+                    self.batch_size = 0
+                if self.brute_fingerprint:
+                    print(f"{YELLOW}Warning: The brute cache is not used in large-input mode.{RESET}")
+                if self.candidates:
+                    print(f"{YELLOW}Warning: Tournament mode ignores 'large_input'.{RESET}")
+
+        if self.candidates and self.cfg_tester["scheduler"] != "sequential":
+            print(
+                f"{YELLOW}Warning: Tournament mode only supports the 'sequential' scheduler. Using it.{RESET}"
+            )
+            self.cfg_tester["scheduler"] = "sequential"
+
+        # Per-stage queue depth samples of the pipelined scheduler
+        self.stage_stats = None
+        # The asyncio supervisor's thread for ChildLauncher round-trips
+        self.launcher_executor = None
+
         # Configure number of parallel processes
         max_cores = multiprocessing.cpu_count()
         if self.cfg_tester["num_cores"] <= 0:
@@ -70,6 +933,23 @@ class StressTester:
         else:
             self.num_workers = min(self.cfg_tester["num_cores"], max_cores)
 
+        # Timing-accurate mode: one dedicated core per worker, plus one
+        # left free for the parent (which also does serial re-runs)
+        self.worker_cores = None
+        if self.cfg_tester["pin_cpus"]:
+            cores = sorted(os.sched_getaffinity(0))
+            if len(cores) < 2:
+                print(
+                    f"{YELLOW}Warning: Need at least 2 cores to pin workers. Running unpinned.{RESET}"
+                )
+            else:
+                os.sched_setaffinity(0, {cores[0]})
+                self.num_workers = min(self.num_workers, len(cores) - 1)
+                self.worker_cores = cores[1 : self.num_workers + 1]
+                print(
+                    f"Pinning workers to cores {CYAN}{self.worker_cores}{RESET} (parent on core {cores[0]})."
+                )
+
         print(
             f"Loaded config. Using {CYAN}{self.num_workers}/{max_cores}{RESET} CPU cores for parallel testing."
         )
@@ -80,27 +960,69 @@ class StressTester:
         self.cfg_tester = config["tester"]
         self.cfg_paths = {}
 
+        # Optional tester settings. Features that cost time or write files
+        # are off unless the config turns them on: "brute_cache_mb" (> 0),
+        # "minimize", "profile_on_tle" / "profile_slowest_passing",
+        # "diagnose_mle", "dedup", and the "paths" "corpus_dir",
+        # "history_db", "checkpoint_file" and "run_log_file" (empty: off)
+        self.cfg_tester.setdefault("warm_start", False)
+        self.cfg_tester.setdefault("measure_backend", "auto")
+        self.cfg_tester.setdefault("generator_batch_size", 0)
+        self.cfg_tester.setdefault("generator_delimiter", "---")
+        self.cfg_tester.setdefault("brute_cache_mb", 0)
+        self.cfg_tester.setdefault("scheduler", "sequential")
+        self.cfg_tester.setdefault("checker", "exact")
+        self.cfg_tester.setdefault("float_eps", 1e-9)
+        self.cfg_tester.setdefault("minimize", False)
+        self.cfg_tester.setdefault("minimize_time_s", 60)
+        self.cfg_tester.setdefault("pin_cpus", False)
+        self.cfg_tester.setdefault("near_limit_margin", 0.0)
+        self.cfg_tester.setdefault("near_limit_reruns", 5)
+        self.cfg_tester.setdefault("live_status", False)
+        self.cfg_tester.setdefault("dedup", False)
+        self.cfg_tester.setdefault("dedup_exact_limit", 1000000)
+        self.cfg_tester.setdefault("dedup_bloom_mb", 64)
+        self.cfg_tester.setdefault("first_seed", 1)
+        self.cfg_tester.setdefault("shard_dir", None)
+        self.cfg_tester.setdefault("tournament_keep_going", False)
+        self.cfg_tester.setdefault("large_input", False)
+        self.cfg_tester.setdefault("interactive", False)
+        self.cfg_tester.setdefault("max_queries", 0)
+        self.cfg_tester.setdefault("profile_on_tle", False)
+        self.cfg_tester.setdefault("profile_slowest_passing", False)
+        self.cfg_tester.setdefault("profile_time_factor", 5)
+        self.cfg_tester.setdefault("profile_top", 15)
+        self.cfg_tester.setdefault("diagnose_mle", False)
+        self.cfg_tester.setdefault("mle_sample_ms", 5)
+        self.cfg_tester.setdefault("mle_top", 10)
+        self.cfg_tester.setdefault("checkpoint_interval_s", 30)
+
+        # Test indices double as generator seeds: [first_test, last_test]
+        self.first_test = self.cfg_tester["first_seed"]
+        self.last_test = self.first_test + self.cfg_tester["max_tests"] - 1
+
         # --- Resolve "commands" paths ---
         self.cfg_cmd = {}
+        # Tournament mode: solution_a given as a list of candidates,
+        # [(label, command), ...]. None for a normal run.
+        self.candidates = None
         print("Resolving script paths:")
         for key, command_str in config["commands"].items():
-            # e.g., command_str = "pypy3 generator.py"
-            parts = shlex.split(command_str)
-
-            # Find the script part (e.g., "generator.py")
-            # We assume it's the last part.
-            # This is robust for "python" vs "pypy3" vs "java -jar"
-            script_file = parts[-1]
-
-            # Create an absolute path to the script
-            # e.g., /home/shadow30812/.../stress_test/generator.py
-            absolute_script_path = self.script_dir / script_file
-
-            # Replace the relative path with the absolute one
-            parts[-1] = str(absolute_script_path)
+            if key == "solution_a" and isinstance(command_str, list):
+                if not command_str:
+                    raise KeyError(
+                        "Config Error: 'solution_a' must list at least one candidate."
+                    )
+                self.candidates = []
+                for number, label in enumerate(command_str, 1):
+                    command = self._resolve_command(label)
+                    self.candidates.append((label, command))
+                    print(f"  {key}[{number}]: {command}")
+                # Single-candidate features (benchmark, minimizer) use the first
+                self.cfg_cmd[key] = self.candidates[0][1]
+                continue
 
-            # Re-join the command
-            self.cfg_cmd[key] = shlex.join(parts)
+            self.cfg_cmd[key] = self._resolve_command(command_str)
             print(f"  {key}: {self.cfg_cmd[key]}")
 
         # --- Resolve "paths" paths ---
@@ -112,6 +1034,132 @@ class StressTester:
         self.cfg_paths["failing_input_file"] = str(failing_file_path)
         print(f"  failing_input_file: {self.cfg_paths['failing_input_file']}")
 
+        # The minimized counterexample goes next to it
+        minimized_file = config["paths"].get(
+            "minimized_input_file", "failing_input.min.txt"
+        )
+        self.cfg_paths["minimized_input_file"] = str(self.script_dir / minimized_file)
+
+        # Optional JSON-lines log, one record per test
+        run_log = config["paths"].get("run_log_file")
+        self.cfg_paths["run_log_file"] = str(self.script_dir / run_log) if run_log else None
+        if run_log:
+            print(f"  run_log_file: {self.cfg_paths['run_log_file']}")
+
+        # Make the brute force output cache absolute
+        cache_dir = config["paths"].get("brute_cache_dir", ".brute_cache")
+        self.cfg_paths["brute_cache_dir"] = str(self.script_dir / cache_dir)
+        if self.cfg_tester["brute_cache_mb"] > 0:
+            print(f"  brute_cache_dir: {self.cfg_paths['brute_cache_dir']}")
+
+        # Compiled binaries of the "build" section
+        build_dir = config["paths"].get("build_cache_dir", ".build_cache")
+        self.cfg_paths["build_cache_dir"] = str(self.script_dir / build_dir)
+
+        # Optional regression corpus of past failing inputs
+        corpus_dir = config["paths"].get("corpus_dir")
+        self.cfg_paths["corpus_dir"] = str(self.script_dir / corpus_dir) if corpus_dir else None
+        if corpus_dir:
+            print(f"  corpus_dir: {self.cfg_paths['corpus_dir']}")
+
+        # cProfile output; collapsed stacks go next to it (.folded)
+        profile_file = config["paths"].get("profile_file", "profile.prof")
+        self.cfg_paths["profile_file"] = str(self.script_dir / profile_file)
+
+        # RSS-over-time samples of MLE diagnostics (CSV)
+        timeline_file = config["paths"].get("memory_timeline_file", "memory.csv")
+        self.cfg_paths["memory_timeline_file"] = str(self.script_dir / timeline_file)
+
+        # Optional SQLite history of runs, for 'compare'
+        history_db = config["paths"].get("history_db")
+        self.cfg_paths["history_db"] = str(self.script_dir / history_db) if history_db else None
+        if history_db:
+            print(f"  history_db: {self.cfg_paths['history_db']}")
+
+        # Optional progress checkpoint for --resume (one per shard)
+        checkpoint = config["paths"].get("checkpoint_file")
+        if checkpoint and self.cfg_tester["shard_dir"]:
+            checkpoint = Path(checkpoint)
+            checkpoint = checkpoint.with_name(
+                f"{checkpoint.stem}.{self.first_test}-{self.last_test}{checkpoint.suffix}"
+            )
+        self.cfg_paths["checkpoint_file"] = str(self.script_dir / checkpoint) if checkpoint else None
+
+    def _resolve_command(self, command_str):
+        """Makes the script of a command absolute (relative to script_dir)."""
+        # e.g., command_str = "pypy3 generator.py"
+        parts = shlex.split(command_str)
+
+        # Find the script part (e.g., "generator.py")
+        # We assume it's the last part.
+        # This is robust for "python" vs "pypy3" vs "java -jar"
+        script_file = parts[-1]
+
+        # Create an absolute path to the script
+        # e.g., /home/shadow30812/.../stress_test/generator.py
+        absolute_script_path = self.script_dir / script_file
+
+        # Replace the relative path with the absolute one
+        parts[-1] = str(absolute_script_path)
+
+        # Re-join the command
+        return shlex.join(parts)
+
+    def _build_commands(self, builds):
+        """
+        Compiles each "build" entry, {"source": "sol.cpp", "compile":
+        "g++ -O2 -o {output} {source}", optional "args": [...]}, and makes
+        the binary its command.
+        Binaries are cached under the hash of the source and the compile
+        command, so unchanged solutions are never rebuilt.
+        Raises RuntimeError with the compiler's output if a build fails.
+        """
+        cache_dir = Path(self.cfg_paths["build_cache_dir"])
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        print("Building:")
+        for key, build in builds.items():
+            if "source" not in build or "compile" not in build:
+                raise KeyError(
+                    f"Config Error: build '{key}' needs 'source' and 'compile'."
+                )
+            source = self.script_dir / build["source"]
+            if not source.exists():
+                raise FileNotFoundError(f"Source for '{key}' not found: {source}")
+
+            digest = hashlib.sha256()
+            digest.update(build["compile"].encode() + b"\0")
+            digest.update(source.read_bytes())
+            binary = cache_dir / f"{source.stem}-{digest.hexdigest()[:16]}"
+
+            if binary.exists():
+                print(f"  {key}: {GREEN}cached{RESET} {binary.name}")
+            else:
+                # Build next to the final name, then rename atomically
+                partial = binary.with_name(f"{binary.name}.{os.getpid()}.tmp")
+                compile_command = build["compile"].format(
+                    source=shlex.quote(str(source)), output=shlex.quote(str(partial))
+                )
+                started = time.monotonic()
+                result = subprocess.run(
+                    compile_command,
+                    shell=True,
+                    cwd=self.script_dir,
+                    capture_output=True,
+                    text=True,
+                )
+                if result.returncode != 0 or not partial.exists():
+                    partial.unlink(missing_ok=True)
+                    raise RuntimeError(
+                        f"Build Error: '{key}' failed to compile:\n$ {compile_command}\n"
+                        f"{(result.stderr or result.stdout).strip()}"
+                    )
+                partial.replace(binary)
+                print(
+                    f"  {key}: {CYAN}built{RESET} {binary.name} "
+                    f"in {time.monotonic() - started:.1f}s"
+                )
+            self.cfg_cmd[key] = shlex.join([str(binary)] + build.get("args", []))
+
     def _load_config(self, config_path: Path):
         """Loads the JSON configuration file."""
         if not config_path.exists():
@@ -145,6 +1193,10 @@ class StressTester:
                 )
 
             for sub_key in sub_keys:
+                if main_key == "commands" and sub_key in config.get("build", {}):
+                    continue  # The command is the built binary
+                if sub_key == "solution_b" and config.get("tester", {}).get("interactive"):
+                    continue  # The interactor judges instead
                 if sub_key not in config[main_key]:
                     raise KeyError(
                         f"Config Error: Missing required key '{sub_key}' in '{main_key}' section."
@@ -152,81 +1204,899 @@ class StressTester:
         print("Config OK.")
 
     def _check_environment(self):
-        """Checks for 'resource' module and '/usr/bin/time'."""
+        """
+        Picks the measurement backend. Prefers reaping children with
+        os.wait4 (rusage); falls back to '/usr/bin/time -v' parsing.
+        """
         if not IS_UNIX:
             print(
                 f"{YELLOW}Warning: 'resource' module not found. Running without resource limits.{RESET}"
             )
-            return False
+            return None
+
+        requested = self.cfg_tester["measure_backend"]
+        if requested not in ("auto", "rusage", "time"):
+            raise KeyError(
+                f"Config Error: 'measure_backend' must be 'auto', 'rusage' or 'time', got '{requested}'."
+            )
+
+        if requested in ("auto", "rusage") and hasattr(os, "wait4"):
+            print(f"Measuring with {CYAN}wait4 rusage{RESET}.")
+            return "rusage"
 
-        time_binary = Path(self.config["paths"]["time_binary"])
+        time_binary = Path(self.cfg_paths["time_binary"])
         if not time_binary.exists():
             print(
                 f"{YELLOW}Warning: '{time_binary}' not found. Cannot measure peak memory.{RESET}"
             )
-            return False
-        return True
+            return None
+        print(f"Measuring with {CYAN}{time_binary} -v{RESET}.")
+        return "time"
+
+    def _find_warm_commands(self):
+        """Returns the set of commands that are plain 'python script.py'."""
+        warm = set()
+        print("Warm start (memory is counted above the preloaded interpreter):")
+        commands = [
+            (key, self.cfg_cmd[key])
+            for key in ("generator", "solution_a", "solution_b")
+            if key in self.cfg_cmd
+        ]
+        if self.candidates:
+            commands[1:2] = [
+                (f"solution_a[{number}]", command)
+                for number, (_, command) in enumerate(self.candidates, 1)
+            ]
+        for key, command in commands:
+            parts = shlex.split(command)
+            interpreter = Path(parts[0]).name
+            if len(parts) == 2 and PYTHON_INTERPRETER_RE.match(interpreter):
+                warm.add(command)
+                print(f"  {key}: {GREEN}warm{RESET}")
+            else:
+                print(f"  {key}: {YELLOW}cold (not a plain Python command){RESET}")
+        return warm
 
     @staticmethod
-    def _make_limits_setter(time_s, mem_mb):
-        """Returns a 'preexec_fn' function that sets resource limits."""
+    def _load_warm_program(command):
+        """
+        Compiles the command's script and imports its (non-local) modules
+        once per worker (again if the script changed since, as in watch
+        mode). Returns (code, script_path) or None on failure.
+        """
+        script_path = shlex.split(command)[-1]
+        try:
+            mtime = os.stat(script_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        cached = _warm_programs.get(command)
+        if cached and cached[0] == mtime:
+            return cached[1]
 
-        def set_limits():
-            # This function runs in the child process *before* exec
-            if IS_UNIX:
-                # Set CPU Time Limit (hard)
-                resource.setrlimit(resource.RLIMIT_CPU, (time_s, time_s))
+        script_dir = str(Path(script_path).parent)
+        try:
+            source = Path(script_path).read_text()
+            tree = ast.parse(source, filename=script_path)
+            code = compile(tree, script_path, "exec")
+        except (OSError, SyntaxError, ValueError):
+            # Let the cold path report the error the usual way
+            _warm_programs[command] = (mtime, None)
+            return None
 
-                # Set Address Space (Virtual Memory) Limit (hard)
-                memory_bytes = mem_mb * 1024 * 1024
-                resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        # Preload library modules so each child finds them in sys.modules.
+        # Modules next to the script are skipped: importing them may have
+        # side effects (e.g. reading stdin) that belong to the child.
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                try:
+                    spec = importlib.util.find_spec(name)
+                    if spec is None or (
+                        spec.origin and spec.origin.startswith(script_dir)
+                    ):
+                        continue
+                    importlib.import_module(name)
+                except Exception:
+                    pass
 
-        return set_limits
+        _warm_programs[command] = (mtime, (code, script_path))
+        return code, script_path
 
-    def _worker_sigterm_handler(self, signum, frame):
+    @staticmethod
+    def _communicate_fds(stdin_fd, stdout_fd, stderr_fd, input_bytes, deadline):
         """
-        WORKER'S HANDLER
-        Gracefully kill child process group on terminate.
+        Feeds stdin and drains stdout/stderr of a child until EOF or deadline.
+        stdin is non-blocking: a child that fills stdout before reading all
+        its input must not block the writer (and with it, the drain).
+        Returns (stdout_bytes, stderr_bytes, timed_out).
         """
-        if self.current_child_pgid:
-            try:
-                # Kill the entire process group, not just the child
-                os.killpg(self.current_child_pgid, signal.SIGKILL)
-            except ProcessLookupError:
-                pass  # Process already died
-        sys.exit(0)
+        chunks = {stdout_fd: [], stderr_fd: []}
+        with selectors.DefaultSelector() as sel:
+            if input_bytes:
+                os.set_blocking(stdin_fd, False)
+                sel.register(stdin_fd, selectors.EVENT_WRITE)
+            else:
+                os.close(stdin_fd)
+            sel.register(stdout_fd, selectors.EVENT_READ)
+            sel.register(stderr_fd, selectors.EVENT_READ)
 
-    def _parse_time_output(self, stderr_str):
-        """Parses the verbose output of /usr/bin/time (-v)."""
-        try:
-            user_time = float(
-                re.search(r"User time \(seconds\): ([\d\.]+)", stderr_str).group(1)
-            )
-            sys_time = float(
-                re.search(r"System time \(seconds\): ([\d\.]+)", stderr_str).group(1)
-            )
-            # This is the key: "Maximum resident set size" == "Peak RAM" (RSS)
-            mem_kb = int(
-                re.search(
-                    r"Maximum resident set size \(kbytes\): (\d+)", stderr_str
-                ).group(1)
-            )
+            input_view = memoryview(input_bytes or b"")
+            offset = 0
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    for key in list(sel.get_map().values()):
+                        sel.unregister(key.fileobj)
+                        os.close(key.fileobj)
+                    return b"".join(chunks[stdout_fd]), b"".join(chunks[stderr_fd]), True
 
-            return user_time + sys_time, mem_kb / 1024.0
-        except (AttributeError, TypeError):
-            # This is critical: if we can't parse, return 0.0
-            # Our logic in _run_single_test will handle this.
-            return 0.0, 0.0
+                for key, _ in sel.select(remaining):
+                    fd = key.fileobj
+                    if fd == stdin_fd:
+                        try:
+                            offset += os.write(fd, input_view[offset : offset + 65536])
+                        except BlockingIOError:
+                            continue  # Less room than PIPE_BUF; wait for more
+                        except BrokenPipeError:
+                            offset = len(input_view)
+                        if offset >= len(input_view):
+                            sel.unregister(fd)
+                            os.close(fd)
+                    else:
+                        data = os.read(fd, 65536)
+                        if data:
+                            chunks[fd].append(data)
+                        else:
+                            sel.unregister(fd)
+                            os.close(fd)
 
-    def _run_command(self, command, input_data, time_limit_s, mem_limit_mb):
+        return b"".join(chunks[stdout_fd]), b"".join(chunks[stderr_fd]), False
+
+    @staticmethod
+    def _classify_exit(
+        returncode, stderr_data, cpu_time=0, peak_mb=0, time_limit_s=None, mem_limit_mb=None
+    ):
         """
-        Runs a command with specified OS-level limits.
+        Maps a non-zero exit status (negative = signal) to a verdict.
+        Only RLIMIT_CPU's SIGXCPU is a TLE, and only a failed allocation
+        (see MEMORY_ERROR_SIGNATURES) is an MLE; any other fatal signal is
+        a runtime error. A SIGKILL the tester did not send (its wall
+        timeout is handled by the caller) is a TLE or an MLE only if
+        'cpu_time' / 'peak_mb' reached the limits it ran under: the hard
+        CPU limit of a child that ignores SIGXCPU, or the OOM killer.
         """
-        # shlex.split handles spaces in file paths (e.g., "python 'My Solution.py'")
-        command_parts = shlex.split(command)
+        out_of_memory = any(text in stderr_data for text in MEMORY_ERROR_SIGNATURES)
+        if returncode < 0:
+            sig = -returncode
+            if sig == signal.SIGXCPU:
+                return "TLE (OS)"
+            if sig == signal.SIGKILL:
+                if time_limit_s is not None and cpu_time >= time_limit_s:
+                    return "TLE (OS)"
+                if out_of_memory or (mem_limit_mb is not None and peak_mb >= mem_limit_mb):
+                    return "MLE (Safety Net)"
+            if out_of_memory:
+                # Our safety net AS limit (e.g. 2GB), e.g. bad_alloc -> SIGABRT
+                return "MLE (Safety Net)"
+            if sig == signal.SIGSEGV:
+                return "RE (Segfault)"
+            try:
+                return f"RE (signal {signal.Signals(sig).name})"
+            except ValueError:
+                return f"RE (signal {sig})"
+        if out_of_memory:
+            return "MLE (from Python)" if "MemoryError" in stderr_data else "MLE (Safety Net)"
+        return "RE"
 
-        if self.can_measure:
-            command_parts = [self.config["paths"]["time_binary"], "-v"] + command_parts
+    def _run_warm(
+        self, program, input_data, time_limit_s, mem_limit_mb, extra_env=None
+    ):
+        """
+        Forks a pre-initialized child that runs a preloaded Python script.
+        Returns the same result dict as _run_command.
+        """
+        code, script_path = program
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+        # The child reports its RSS when the script starts: it shares (and
+        # keeps mapped) the worker's memory, only what it adds is the script's
+        start_r, start_w = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            # --- Child ---
+            exit_code = 1
+            try:
+                os.setpgid(0, 0)
+                # The forked mm carries the worker's peak RSS; restart the
+                # high-water mark (ru_maxrss) from the memory it shares now
+                with open("/proc/self/clear_refs", "w") as clear_refs:
+                    clear_refs.write("5")
+                os.write(start_w, str(self._current_rss_kb()).encode())
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                os.dup2(in_r, 0)
+                os.dup2(out_w, 1)
+                os.dup2(err_w, 2)
+                for fd in (in_r, in_w, out_r, out_w, err_r, err_w, start_r, start_w):
+                    os.close(fd)
+                self._make_limits_setter(time_limit_s, mem_limit_mb)()
+                exit_code = _exec_warm_program(code, script_path, extra_env)
+            finally:
+                os._exit(exit_code)
+
+        # --- Parent ---
+        try:
+            os.setpgid(pid, pid)
+        except OSError:
+            pass  # Child already did it (or already exited)
+        for fd in (in_r, out_w, err_w, start_w):
+            os.close(fd)
+        result = self._supervise_child(
+            pid, in_w, out_r, err_r, input_data, time_limit_s, mem_limit_mb
+        )
+        with os.fdopen(start_r, "rb") as start_file:
+            start_kb = start_file.read()
+        if result["measured"] and start_kb:
+            result["mem_mb"] = max(result["mem_mb"] - int(start_kb) / 1024.0, 0)
+        # Only what the script added counts, not the preloaded interpreter
+        # a cold run also pays for: lower than, and not comparable to, cold
+        result["warm"] = True
+        return result
+
+    def _run_rusage(
+        self, command_parts, input_data, time_limit_s, mem_limit_mb, extra_env=None
+    ):
+        """
+        Execs a command directly (no '/usr/bin/time' wrapper) through this
+        thread's ChildLauncher, which measures it from the rusage of
+        os.wait4. Returns the same result dict as _run_command.
+        """
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+
+        try:
+            pid, reap = self._spawn_child(
+                command_parts, [in_r, out_w, err_w], time_limit_s, mem_limit_mb, extra_env
+            )
+        except Exception:
+            for fd in (in_w, out_r, err_r):
+                os.close(fd)
+            raise
+        finally:
+            # The child holds its own copies of these ends
+            for fd in (in_r, out_w, err_w):
+                os.close(fd)
+
+        return self._supervise_child(
+            pid, in_w, out_r, err_r, input_data, time_limit_s, mem_limit_mb, reap
+        )
+
+    def _spawn_child(
+        self, command_parts, fds, time_limit_s, mem_limit_mb, extra_env=None, pgid=0
+    ):
+        """
+        Starts a command on 'fds' (stdin, stdout, stderr) through this
+        thread's ChildLauncher, with the given limits and in process group
+        'pgid' (0: a new one). Every runner spawns its children here.
+        Returns (pid, reap); raises OSError if it could not be started.
+        """
+        launcher = _get_launcher()
+        pid = launcher.spawn(
+            command_parts,
+            fds,
+            time_limit_s,
+            mem_limit_mb,
+            env={**os.environ, **extra_env} if extra_env else None,
+            pgid=pgid,
+        )
+        return pid, launcher.reap
+
+    @staticmethod
+    def _wait_for_exit(pid, timeout):
+        """Waits up to 'timeout' seconds for a child (ours or the launcher's) to exit; True on timeout."""
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return False  # Already exited (and reaped by the launcher)
+        try:
+            # The pidfd becomes readable when the child exits
+            with selectors.DefaultSelector() as sel:
+                sel.register(pidfd, selectors.EVENT_READ)
+                return not sel.select(timeout)
+        finally:
+            os.close(pidfd)
+
+    @staticmethod
+    def _current_rss_kb():
+        """This process's resident set size, in kB."""
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+    @staticmethod
+    def _wait4(pid):
+        """Reaps our own child: (wait status, CPU seconds, peak RSS in kB)."""
+        _, status, rusage = os.wait4(pid, 0)
+        return status, rusage.ru_utime + rusage.ru_stime, rusage.ru_maxrss
+
+    def _supervise_child(
+        self, pid, in_w, out_r, err_r, input_data, time_limit_s, mem_limit_mb, reap=None
+    ):
+        """
+        Feeds input to a spawned child, enforces the wall timeout on its
+        process group, and reaps it ('reap': _wait4 for our own children,
+        ChildLauncher.reap for the launcher's) to read CPU time and peak
+        RSS. Verdicts come from the exit status / terminating signal.
+        """
+        self.current_child_pgid = pid
+        wall_timeout = time_limit_s + 2
+        started = time.monotonic()
+        deadline = started + wall_timeout
+        try:
+            input_bytes = input_data.encode() if input_data else None
+            stdout_bytes, stderr_bytes, timed_out = self._communicate_fds(
+                in_w, out_r, err_r, input_bytes, deadline
+            )
+            # EOF on both pipes is not an exit: a child that closed them
+            # and kept running must not block the reap past the deadline
+            if not timed_out:
+                timed_out = self._wait_for_exit(pid, max(deadline - time.monotonic(), 0))
+            if timed_out:
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            status, cpu_time, maxrss_kb = (reap or self._wait4)(pid)
+        finally:
+            self.current_child_pgid = None
+        wall_time = time.monotonic() - started
+
+        if timed_out:
+            return self._wall_timeout_result(wall_timeout, wall_time)
+        return self._measured_result(
+            status,
+            cpu_time,
+            maxrss_kb,
+            stdout_bytes.decode(errors="replace"),
+            stderr_bytes.decode(errors="replace"),
+            wall_time,
+            time_limit_s,
+            mem_limit_mb,
+        )
+
+    def _measured_result(
+        self,
+        status,
+        cpu_time,
+        maxrss_kb,
+        stdout_data,
+        stderr_data,
+        wall_time,
+        time_limit_s,
+        mem_limit_mb,
+    ):
+        """
+        Result dict of a reaped child, shared by all runners: the verdict
+        comes from its wait status / terminating signal (judged against
+        the limits it ran under), time and memory from its rusage.
+        """
+        returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in kilobytes on Linux
+        mem_mb = max(maxrss_kb, 0) / 1024.0
+        return {
+            "stdout": stdout_data.strip(),
+            "stderr": stderr_data.strip(),
+            "time": cpu_time,
+            "wall": wall_time,
+            "mem_mb": mem_mb,
+            "returncode": returncode,
+            "error": self._classify_exit(
+                returncode, stderr_data, cpu_time, mem_mb, time_limit_s, mem_limit_mb
+            )
+            if returncode != 0
+            else None,
+            "measured": True,
+        }
+
+    @staticmethod
+    def _wall_timeout_result(wall_timeout, wall_time):
+        """Result dict of a child killed at the wall timeout (nothing measured)."""
+        return {
+            "stdout": "",
+            "stderr": "",
+            "time": wall_timeout,
+            "wall": wall_time,
+            "mem_mb": 0,
+            "error": "TLE (Wall)",
+            "measured": False,
+        }
+
+    @staticmethod
+    def _tester_error_result(error):
+        """Result dict of a child the tester could not run."""
+        return {
+            "stdout": "",
+            "stderr": f"Tester RE: {error}",
+            "time": 0,
+            "mem_mb": 0,
+            "error": "Tester RE",
+            "measured": False,
+        }
+
+    def _run_to_memfd(
+        self, command, stdin_fd, time_limit_s, mem_limit_mb, extra_env=None
+    ):
+        """
+        Large-input counterpart of _run_rusage: no pipes at all. The child
+        reads stdin straight from 'stdin_fd' (a file, or None for
+        /dev/null) and writes stdout/stderr into fresh memfds, so no data
+        passes through this process. The result's "stdout" is left empty;
+        "stdout_fd" holds the memfd, which the caller must close.
+        """
+        out_fd = os.memfd_create("stdout")
+        err_fd = os.memfd_create("stderr")
+        stdin = os.open(os.devnull, os.O_RDONLY) if stdin_fd is None else stdin_fd
+
+        try:
+            pid, reap = self._spawn_child(
+                shlex.split(command), [stdin, out_fd, err_fd], time_limit_s, mem_limit_mb, extra_env
+            )
+        except Exception as e:
+            os.close(err_fd)
+            return {**self._tester_error_result(e), "stdout_fd": out_fd}
+        finally:
+            if stdin_fd is None:
+                os.close(stdin)
+
+        self.current_child_pgid = pid
+        wall_timeout = time_limit_s + 2
+        started = time.monotonic()
+        try:
+            timed_out = self._wait_for_exit(pid, wall_timeout)
+            if timed_out:
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            status, cpu_time, maxrss_kb = reap(pid)
+        finally:
+            self.current_child_pgid = None
+        wall_time = time.monotonic() - started
+
+        with os.fdopen(err_fd, "rb") as err_file:
+            err_file.seek(0)
+            stderr_data = err_file.read().decode(errors="replace")
+
+        if timed_out:
+            result = self._wall_timeout_result(wall_timeout, wall_time)
+        else:
+            result = self._measured_result(
+                status, cpu_time, maxrss_kb, "", stderr_data, wall_time, time_limit_s, mem_limit_mb
+            )
+        return {**result, "stdout_fd": out_fd}
+
+    def _run_interactive(self, test_case):
+        """
+        Runs solution_a against the interactor ('interactor <input file>')
+        with the parent relaying both directions through non-blocking
+        pipes. Data is forwarded as soon as it is read; each line the
+        solution writes counts as a query, and the time from forwarding a
+        response to the solution's next write is one round's latency.
+        Returns (sol_a_result, interactor_result) with the transcripts
+        (capped at TRANSCRIPT_LIMIT) as their "stdout".
+        """
+        time_limit_s = self.cfg_limits["problem_time_s"]
+        safety_time_s = self.cfg_limits["brute_force_time_s"]
+        safety_mem_mb = self.cfg_limits["brute_force_mem_mb"]
+        max_queries = self.cfg_tester["max_queries"]
+
+        with tempfile.TemporaryDirectory(prefix="stress_interact_") as tmp:
+            input_path = Path(tmp) / "input.txt"
+            input_path.write_text(test_case + "\n")
+
+            # Both children share the interactor's process group, so one
+            # killpg (ours, or the worker's SIGTERM handler) stops both
+            children, pgid = {}, 0
+            for name, command, limit_s in (
+                (
+                    "interactor",
+                    shlex.split(self.cfg_cmd["interactor"]) + [str(input_path)],
+                    safety_time_s,
+                ),
+                ("solution", shlex.split(self.cfg_cmd["solution_a"]), time_limit_s),
+            ):
+                in_r, in_w = os.pipe()
+                out_r, out_w = os.pipe()
+                stderr_file = open(Path(tmp) / f"{name}.err", "w+")
+                try:
+                    pid, reap = self._spawn_child(
+                        command,
+                        [in_r, out_w, stderr_file.fileno()],
+                        limit_s,
+                        safety_mem_mb,
+                        pgid=pgid,
+                    )
+                finally:
+                    os.close(in_r)
+                    os.close(out_w)
+                if not pgid:
+                    pgid = self.current_child_pgid = pid
+                children[name] = {
+                    "pid": pid,
+                    "limit_s": limit_s,
+                    "in": in_w,
+                    "out": out_r,
+                    "pending": bytearray(),
+                    "transcript": bytearray(),
+                    "stderr": stderr_file,
+                }
+
+            solution, interactor = children["solution"], children["interactor"]
+            # Data read from one child's stdout goes to the other's stdin
+            peer = {solution["out"]: interactor, interactor["out"]: solution}
+            queries, latencies, response_sent = 0, [], None
+            query_limit_hit = False
+            # The same wall timeout as every runner: solution_a's limit + 2s
+            wall_timeout = time_limit_s + 2
+            deadline = time.monotonic() + wall_timeout
+            started = time.monotonic()
+
+            with selectors.DefaultSelector() as sel:
+                for child in children.values():
+                    os.set_blocking(child["in"], False)
+                    sel.register(child["out"], selectors.EVENT_READ)
+                timed_out = False
+                while sel.get_map():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        timed_out = True
+                        break
+                    for key, events in sel.select(remaining):
+                        fd = key.fileobj
+                        if events & selectors.EVENT_WRITE:
+                            # 'fd' is a child's stdin with data pending
+                            child = solution if fd == solution["in"] else interactor
+                            try:
+                                sent = os.write(fd, child["pending"])
+                                del child["pending"][:sent]
+                            except BlockingIOError:
+                                pass
+                            except BrokenPipeError:
+                                child["pending"].clear()
+                            if not child["pending"]:
+                                sel.unregister(fd)
+                        elif not (data := os.read(fd, 65536)):
+                            # EOF: pass it on once the backlog is flushed
+                            sel.unregister(fd)
+                            peer[fd]["eof"] = True
+                        else:
+                            target = peer[fd]
+                            source = solution if target is interactor else interactor
+                            now = time.monotonic()
+                            if source is solution:
+                                queries += data.count(b"\n")
+                                if response_sent is not None:
+                                    latencies.append(now - response_sent)
+                                    response_sent = None
+                            else:
+                                response_sent = now
+                            room = TRANSCRIPT_LIMIT - len(source["transcript"])
+                            if room > 0:
+                                source["transcript"] += data[:room]
+                            if target["in"] is not None:
+                                was_idle = not target["pending"]
+                                target["pending"] += data
+                                if was_idle:
+                                    sel.register(target["in"], selectors.EVENT_WRITE)
+
+                        if max_queries and queries > max_queries:
+                            query_limit_hit = True
+                            break
+
+                        # Close a stdin whose writer side has finished
+                        for child in children.values():
+                            if child.get("eof") and not child["pending"] and child["in"] is not None:
+                                if child["in"] in sel.get_map():
+                                    sel.unregister(child["in"])
+                                os.close(child["in"])
+                                child["in"] = None
+                    if query_limit_hit:
+                        break
+
+            if timed_out or query_limit_hit:
+                try:
+                    os.killpg(pgid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+            results = {}
+            for name, child in children.items():
+                for fd in (child["in"], child["out"]):
+                    if fd is not None:
+                        os.close(fd)
+                status, cpu_time, maxrss_kb = reap(child["pid"])
+                child["stderr"].seek(0)
+                stderr_data = child["stderr"].read()
+                child["stderr"].close()
+                results[name] = {
+                    **self._measured_result(
+                        status,
+                        cpu_time,
+                        maxrss_kb,
+                        child["transcript"].decode(errors="replace"),
+                        stderr_data,
+                        time.monotonic() - started,
+                        child["limit_s"],
+                        safety_mem_mb,
+                    )
+                }
+            self.current_child_pgid = None
+
+        sol_a_result, interactor_result = results["solution"], results["interactor"]
+        if timed_out:
+            # Keep the transcript: it shows where the exchange stalled
+            sol_a_result = {
+                **self._wall_timeout_result(wall_timeout, sol_a_result["wall"]),
+                "stdout": sol_a_result["stdout"],
+                "stderr": sol_a_result["stderr"],
+                "returncode": sol_a_result["returncode"],
+            }
+        sol_a_result["queries"] = queries
+        sol_a_result["query_limit_hit"] = query_limit_hit
+        sol_a_result["round_latency_mean"] = statistics.fmean(latencies) if latencies else 0.0
+        sol_a_result["round_latency_max"] = max(latencies, default=0.0)
+        return sol_a_result, interactor_result
+
+    async def _run_async(
+        self, command, input_data, time_limit_s, mem_limit_mb, extra_env=None
+    ):
+        """
+        asyncio counterpart of _run_rusage, for the single-process
+        supervisor. asyncio.create_subprocess_exec reaps children with a
+        plain waitpid, which discards their rusage, so the child is spawned
+        through _spawn_child like in every other runner and watched on the
+        event loop through a pidfd instead; the launcher then reports its
+        rusage. Its socket round-trips block, so spawn and reap run on the
+        launcher thread (self.launcher_executor), never on the loop.
+        Cancelling the coroutine kills the child's process group.
+        """
+        loop = asyncio.get_running_loop()
+        in_r, in_w = os.pipe()
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+
+        def spawn():
+            try:
+                return self._spawn_child(
+                    shlex.split(command), [in_r, out_w, err_w], time_limit_s, mem_limit_mb, extra_env
+                )
+            finally:
+                for fd in (in_r, out_w, err_w):
+                    os.close(fd)
+
+        spawned = loop.run_in_executor(self.launcher_executor, spawn)
+        try:
+            pid, reap = await asyncio.shield(spawned)
+        except asyncio.CancelledError:
+            # The launcher starts the child regardless: stop it, then give up
+            try:
+                pid, reap = await spawned
+                os.killpg(pid, signal.SIGKILL)
+                await loop.run_in_executor(self.launcher_executor, reap, pid)
+            except Exception:
+                pass
+            for fd in (in_w, out_r, err_r):
+                os.close(fd)
+            raise
+        except Exception as e:
+            for fd in (in_w, out_r, err_r):
+                os.close(fd)
+            return self._tester_error_result(e)
+
+        async_child_pgids.add(pid)
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            pidfd = None  # Already exited (and reaped by the launcher)
+        started = time.monotonic()
+        wall_timeout = time_limit_s + 2
+
+        chunks = {out_r: [], err_r: []}
+        pending = {out_r: loop.create_future(), err_r: loop.create_future()}
+        exited = loop.create_future()
+        input_view = memoryview(input_data.encode() if input_data else b"")
+        offset = 0
+
+        def on_readable(fd):
+            try:
+                data = os.read(fd, 65536)
+            except BlockingIOError:
+                return
+            if data:
+                chunks[fd].append(data)
+            else:
+                loop.remove_reader(fd)
+                pending[fd].set_result(None)
+
+        def on_writable():
+            nonlocal offset
+            try:
+                offset += os.write(in_w, input_view[offset : offset + 65536])
+            except BlockingIOError:
+                return
+            except BrokenPipeError:
+                offset = len(input_view)
+            if offset >= len(input_view):
+                loop.remove_writer(in_w)
+                os.close(in_w)
+
+        for fd in (in_w, out_r, err_r):
+            os.set_blocking(fd, False)
+        for fd in (out_r, err_r):
+            loop.add_reader(fd, on_readable, fd)
+        if input_view:
+            loop.add_writer(in_w, on_writable)
+        else:
+            os.close(in_w)
+        if pidfd is None:
+            exited.set_result(None)
+        else:
+            loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+
+        try:
+            # Not wait_for(gather(...)): cancelling that leaves a gathering
+            # future whose CancelledError nobody retrieves
+            _, not_done = await asyncio.wait([exited, *pending.values()], timeout=wall_timeout)
+            timed_out = bool(not_done)
+        finally:
+            # Runs on timeout *and* on cancellation (first failure elsewhere)
+            if not exited.done():
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            if pidfd is not None:
+                loop.remove_reader(pidfd)
+                os.close(pidfd)
+            for fd in (out_r, err_r):
+                loop.remove_reader(fd)
+                os.close(fd)
+            if offset < len(input_view):
+                loop.remove_writer(in_w)
+                os.close(in_w)
+            # The child has exited: the launcher's report follows at once
+            try:
+                status, cpu_time, maxrss_kb = await loop.run_in_executor(
+                    self.launcher_executor, reap, pid
+                )
+            finally:
+                async_child_pgids.discard(pid)
+        wall_time = time.monotonic() - started
+
+        if timed_out:
+            return self._wall_timeout_result(wall_timeout, wall_time)
+        return self._measured_result(
+            status,
+            cpu_time,
+            maxrss_kb,
+            b"".join(chunks[out_r]).decode(errors="replace"),
+            b"".join(chunks[err_r]).decode(errors="replace"),
+            wall_time,
+            time_limit_s,
+            mem_limit_mb,
+        )
+
+    @staticmethod
+    def _make_limits_setter(time_s, mem_mb):
+        """Returns a 'preexec_fn' function that sets resource limits."""
+
+        def set_limits():
+            # This function runs in the child process *before* exec
+            if IS_UNIX:
+                # Set CPU Time Limit: SIGXCPU at the soft limit (the
+                # kernel sends SIGKILL, not SIGXCPU, if both are equal)
+                resource.setrlimit(resource.RLIMIT_CPU, (time_s, time_s + 1))
+
+                # Set Address Space (Virtual Memory) Limit (hard)
+                memory_bytes = mem_mb * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+        return set_limits
+
+    @property
+    def current_child_pgid(self):
+        """Process group of the child this worker is running, if any."""
+        return self._current_child_pgid
+
+    @current_child_pgid.setter
+    def current_child_pgid(self, pgid):
+        self._current_child_pgid = pgid
+        if _watch_slot is None or _watch_task_epoch is None:
+            return
+        # Published before the epoch check, so a child is killed either
+        # here or by the parent's _kill_watch_children
+        watch_pgids[_watch_slot] = pgid or -1
+        if pgid and watch_epoch.value != _watch_task_epoch:
+            try:
+                os.killpg(pgid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def _worker_sigterm_handler(self, signum, frame):
+        """
+        WORKER'S HANDLER
+        Gracefully kill child process group on terminate.
+        """
+        if self.current_child_pgid:
+            try:
+                # Kill the entire process group, not just the child
+                os.killpg(self.current_child_pgid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass  # Process already died
+        # Not sys.exit(): a SystemExit raised inside an at-fork hook (the
+        # signal can land while spawning a child) is swallowed, and the
+        # worker would keep running while the pool waits for it
+        os._exit(0)
+
+    def _parse_time_output(self, stderr_str):
+        """Parses the verbose output of /usr/bin/time (-v)."""
+        try:
+            user_time = float(
+                re.search(r"User time \(seconds\): ([\d\.]+)", stderr_str).group(1)
+            )
+            sys_time = float(
+                re.search(r"System time \(seconds\): ([\d\.]+)", stderr_str).group(1)
+            )
+            # This is the key: "Maximum resident set size" == "Peak RAM" (RSS)
+            mem_kb = int(
+                re.search(
+                    r"Maximum resident set size \(kbytes\): (\d+)", stderr_str
+                ).group(1)
+            )
+
+            return user_time + sys_time, mem_kb / 1024.0
+        except (AttributeError, TypeError):
+            # This is critical: if we can't parse, return 0.0
+            # Our logic in _run_single_test will handle this.
+            return 0.0, 0.0
+
+    def _run_command(
+        self, command, input_data, time_limit_s, mem_limit_mb, extra_env=None
+    ):
+        """
+        Runs a command with specified OS-level limits.
+        'extra_env' is merged into the child's environment.
+        """
+        # Forking a Python child is only safe from a single-threaded
+        # process (pool workers are; the main process may not be)
+        if command in self.warm_commands and threading.active_count() == 1:
+            program = self._load_warm_program(command)
+            if program:
+                return self._run_warm(
+                    program, input_data, time_limit_s, mem_limit_mb, extra_env
+                )
+
+        # shlex.split handles spaces in file paths (e.g., "python 'My Solution.py'")
+        command_parts = shlex.split(command)
+
+        if self.measure_backend == "rusage":
+            try:
+                return self._run_rusage(
+                    command_parts, input_data, time_limit_s, mem_limit_mb, extra_env
+                )
+            except Exception as e:
+                return self._tester_error_result(e)
+
+        # --- Fallback: '/usr/bin/time -v' (or no measurement at all) ---
+        if self.can_measure:
+            command_parts = [self.config["paths"]["time_binary"], "-v"] + command_parts
 
         # This wrapper function is the correct way to pass multiple
         # functions to preexec_fn and avoid lambda/tuple return issues.
@@ -234,278 +2104,2970 @@ class StressTester:
             os.setpgid(0, 0)  # Create a new process group
             self._make_limits_setter(time_limit_s, mem_limit_mb)()
 
+        started = time.monotonic()
+        try:
+            process = subprocess.Popen(
+                command_parts,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env={**os.environ, **extra_env} if extra_env else None,
+                preexec_fn=preexec_tasks,
+            )
+
+            # Record the Process Group ID (which is the same as the child's PID)
+            self.current_child_pgid = process.pid
+
+            # Wall clock timeout (safety net)
+            wall_timeout = time_limit_s + 2
+            try:
+                stdout_data, stderr_data = process.communicate(
+                    input=input_data, timeout=wall_timeout
+                )
+            finally:
+                # Ensure we clear the pgid once the process is done
+                self.current_child_pgid = None
+
+            cpu_time, peak_mem_mb = 0, 0
+            measured = False
+            if self.can_measure:
+                # Check if 'time' output is present before parsing
+                if ("User time" in stderr_data) or (
+                    "Maximum resident set size" in stderr_data
+                ):
+                    cpu_time, peak_mem_mb = self._parse_time_output(stderr_data)
+                    # A real 0MB program is fine; a missing line is not
+                    measured = "Maximum resident set size" in stderr_data
+                else:
+                    # 'time -v' didn't output what we expected
+                    pass  # cpu_time and peak_mem_mb remain 0
+
+            # Check if OS killed the process (e.g., TLE)
+            if process.returncode != 0:
+                # 'time -v' reports a killed child as "Command terminated by signal N"
+                killed = re.search(r"Command terminated by signal (\d+)", stderr_data)
+                error_type = self._classify_exit(
+                    -int(killed.group(1)) if killed else process.returncode,
+                    stderr_data,
+                    cpu_time,
+                    peak_mem_mb,
+                    time_limit_s,
+                    mem_limit_mb,
+                )
+                return {
+                    "stdout": stdout_data.strip(),
+                    "stderr": stderr_data.strip(),
+                    "time": cpu_time,
+                    "wall": time.monotonic() - started,
+                    "mem_mb": peak_mem_mb,
+                    "returncode": process.returncode,
+                    "error": error_type,
+                    "measured": measured,
+                }
+
+            # Process finished successfully
+            return {
+                "stdout": stdout_data.strip(),
+                "stderr": stderr_data.strip(),
+                "time": cpu_time,
+                "wall": time.monotonic() - started,
+                "mem_mb": peak_mem_mb,
+                "error": None,
+                "measured": measured,
+            }
+
+        except subprocess.TimeoutExpired:
+            process.kill()  # Kill the '/usr/bin/time' process
+            return self._wall_timeout_result(wall_timeout, time.monotonic() - started)
+        except Exception as e:
+            return self._tester_error_result(e)
+
+    @staticmethod
+    def _fingerprint_command(command):
+        """Hashes a command string together with its script's contents."""
+        digest = hashlib.sha256(command.encode())
+        script_path = Path(shlex.split(command)[-1])
+        try:
+            digest.update(script_path.read_bytes())
+        except OSError:
+            pass  # e.g. a binary on $PATH; the command string must do
+        return digest.hexdigest()
+
+    def _brute_cache_path(self, test_case):
+        """Content-addressed cache file for the brute's output on an input."""
+        key = hashlib.sha256(
+            f"{self.brute_fingerprint}\0{test_case}".encode()
+        ).hexdigest()
+        return Path(self.cfg_paths["brute_cache_dir"]) / key[:2] / key
+
+    def _brute_cache_get(self, test_case):
+        """Returns the cached brute stdout for this input, or None."""
+        path = self._brute_cache_path(test_case)
+        try:
+            stdout_data = path.read_text()
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            return None
+        return stdout_data
+
+    def _brute_cache_put(self, test_case, stdout_data):
+        """
+        Stores the brute's stdout. Atomic, so workers may race freely.
+        Each process evicts once it has written a quarter of its share
+        of 'brute_cache_mb', so the cache stays near the cap mid-run.
+        """
+        global _brute_cache_written
+        path = self._brute_cache_path(test_case)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(stdout_data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # A cache miss next time is harmless
+        _brute_cache_written += len(stdout_data)
+        cap = self.cfg_tester["brute_cache_mb"] * 1024 * 1024
+        if _brute_cache_written >= cap // (4 * self.num_workers):
+            _brute_cache_written = 0
+            self._evict_brute_cache(quiet=True)
+
+    def _evict_brute_cache(self, quiet=False):
+        """Deletes least-recently-used entries until under 'brute_cache_mb'."""
+        cache_dir = Path(self.cfg_paths["brute_cache_dir"])
+        if not cache_dir.exists():
+            return
+        entries = []
+        for path in cache_dir.glob("*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        cap = self.cfg_tester["brute_cache_mb"] * 1024 * 1024
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= cap:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        if evicted and not quiet:
+            print(f"Brute cache: evicted {evicted} least recently used entries.")
+
+    def _save_to_corpus(self, test_case, verdict, gen_result, minimized=False):
+        """
+        Stores a failing input in the regression corpus as <sha256>.txt,
+        with its verdict and origin in <sha256>.json. Returns the path.
+        """
+        corpus_dir = Path(self.cfg_paths["corpus_dir"])
+        corpus_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256(test_case.encode()).hexdigest()[:32]
+        case_path = corpus_dir / f"{digest}.txt"
+        meta_path = corpus_dir / f"{digest}.json"
+
+        meta = {}
+        if meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                meta = {}
+        meta.setdefault("first_seen", time.strftime("%Y-%m-%d %H:%M:%S"))
+        meta["verdict"] = verdict
+        meta["minimized"] = meta.get("minimized", False) or minimized
+        meta["hits"] = meta.get("hits", 0) + 1
+        if gen_result.get("seed") is not None and not meta["minimized"]:
+            meta["reproduce"] = self._describe_seed(gen_result)
+        if not case_path.exists():
+            case_path.write_text(test_case)
+        meta_path.write_text(json.dumps(meta, indent=4))
+        return case_path
+
+    def _corpus_tasks(self):
+        """
+        (test_index, gen_result) tasks replaying every corpus case.
+        Corpus cases get negative test indices, apart from the seeds.
+        """
+        if not self.cfg_paths["corpus_dir"]:
+            return []
+        corpus_dir = Path(self.cfg_paths["corpus_dir"])
+        tasks = []
+        for number, case_path in enumerate(sorted(corpus_dir.glob("*.txt")), 1):
+            gen_result = {
+                "stdout": case_path.read_text(),
+                "stderr": "",
+                "time": 0,
+                "mem_mb": 0,
+                "error": None,
+                "measured": False,
+                "corpus": case_path.name,
+            }
+            tasks.append((-number, gen_result))
+        return tasks
+
+    @staticmethod
+    def _describe_case(test_index, gen_result):
+        """'Test #12', or the corpus file a replayed case came from."""
+        if gen_result.get("replay"):
+            return "Last failing input"
+        if gen_result.get("corpus"):
+            return f"Corpus case '{gen_result['corpus']}'"
+        return f"Test #{test_index}"
+
+    def _split_batch(self, stdout_data):
+        """Splits batched generator output on delimiter lines."""
+        delimiter = self.cfg_tester["generator_delimiter"]
+        cases, current = [], []
+        for line in stdout_data.splitlines():
+            if line.strip() == delimiter:
+                if current:
+                    cases.append("\n".join(current).strip())
+                current = []
+            else:
+                current.append(line)
+        if current:
+            cases.append("\n".join(current).strip())
+        return [case for case in cases if case]
+
+    def _generate_cases(self, first_index, wanted):
+        """
+        Runs the generator once for up to 'wanted' cases (batched if
+        configured). Returns [(test_index, gen_result), ...]; on failure
+        a single entry whose gen_result carries the error.
+        """
+        safety_time_s = self.cfg_limits["brute_force_time_s"]
+        safety_mem_mb = self.cfg_limits["brute_force_mem_mb"]
+
+        if self.batch_size <= 1:
+            gen_result = self._run_command(
+                self.cfg_cmd["generator"],
+                None,
+                safety_time_s,
+                safety_mem_mb,
+                {SEED_ENV: str(first_index)},
+            )
+            gen_result["seed"] = first_index
+            return self._mark_duplicates([(first_index, gen_result)])
+
+        gen_result = self._run_command(
+            self.cfg_cmd["generator"],
+            None,
+            safety_time_s,
+            safety_mem_mb,
+            {BATCH_SIZE_ENV: str(wanted), SEED_ENV: str(first_index)},
+        )
+        gen_result["seed"] = first_index
+        cases = [] if gen_result["error"] else self._split_batch(gen_result["stdout"])
+        if not cases:
+            # Reported downstream as a normal "Generator Error"
+            if not gen_result["error"]:
+                gen_result["error"] = "Empty Batch"
+            return [(first_index, gen_result)]
+
+        return self._mark_duplicates(
+            [
+                (
+                    first_index + offset,
+                    {**gen_result, "stdout": case, "seed_offset": offset},
+                )
+                for offset, case in enumerate(cases[:wanted])
+            ]
+        )
+
+    @staticmethod
+    def _mark_duplicates(tasks):
+        """Flags cases that were generated before (when dedup is on)."""
+        fresh = [gen_result for _, gen_result in tasks if not gen_result["error"]]
+        if deduplicator is None or not fresh:
+            return tasks
+        digests = [
+            bytes.fromhex(gen_result["input_sha256"])[:16]
+            if "input_sha256" in gen_result
+            else hashlib.sha256(gen_result["stdout"].encode()).digest()[:16]
+            for gen_result in fresh
+        ]
+        for gen_result, seen in zip(fresh, deduplicator.mark_seen(digests)):
+            if seen:
+                gen_result["duplicate"] = True
+        return tasks
+
+    def _batched_tasks(self, slots, stop):
+        """
+        Runs the generator in batches (in the main process) and yields
+        (test_index, gen_result) tasks for the pool.
+        'slots' bounds how many cases are buffered ahead of the solvers.
+        """
+        test_index = self.first_test - 1
+        while test_index < self.last_test and not stop.is_set():
+            wanted = min(self.batch_size, self.last_test - test_index)
+            for task in self._generate_cases(test_index + 1, wanted):
+                if task[1]["error"]:
+                    # Let a worker report it as a normal "Generator Error"
+                    yield task
+                    return
+                # Block until the pool has room (or the run is over)
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                test_index = task[0]
+                yield task
+
+    def _describe_seed(self, gen_result):
+        """How to regenerate a case: the generator's environment."""
+        command = f"{SEED_ENV}={gen_result['seed']} {self.cfg_cmd['generator']}"
+        if "seed_offset" in gen_result:
+            return (
+                f"{BATCH_SIZE_ENV}={self.batch_size} {command} "
+                f"(case #{gen_result['seed_offset'] + 1} of the batch)"
+            )
+        return command
+
+    def _run_candidate(self, test_case, command=None):
+        """Runs solution_a (or another candidate) with *hybrid* limits."""
+        return self._run_command(
+            command or self.cfg_cmd["solution_a"],
+            test_case,
+            self.cfg_limits["problem_time_s"],  # Use REAL time limit (for OS TLE)
+            self.cfg_limits["brute_force_mem_mb"],  # Use HIGH limit (to *measure* RSS)
+        )
+
+    def _run_brute(self, test_case):
+        """Runs solution_b with safety limits, consulting the brute cache."""
+        if self.brute_fingerprint:
+            cached_stdout = self._brute_cache_get(test_case)
+            if cached_stdout is not None:
+                return {
+                    "stdout": cached_stdout,
+                    "stderr": "",
+                    "time": 0,
+                    "mem_mb": 0,
+                    "error": None,
+                    "measured": False,
+                    "cached": True,
+                }
+
+        sol_b_result = self._run_command(
+            self.cfg_cmd["solution_b"],
+            test_case,
+            self.cfg_limits["brute_force_time_s"],
+            self.cfg_limits["brute_force_mem_mb"],
+        )
+        if self.brute_fingerprint and not sol_b_result["error"]:
+            self._brute_cache_put(test_case, sol_b_result["stdout"])
+        return sol_b_result
+
+    def _judge_candidate(self, sol_a_result):
+        """
+        Verdicts that depend on solution_a alone (TLE, RE, MLE, Measure
+        Error), or None if its output still has to be compared.
+        """
+        # OS-level errors (TLE, RE, Segfault)
+        if sol_a_result["error"]:
+            return sol_a_result["error"]
+
+        if not sol_a_result["measured"]:
+            # We *cannot* measure (e.g., /usr/bin/time missing or its
+            # output failed to parse). We cannot give an "OK" verdict.
+            return "Measure Error"
+
+        # Measured Memory (MLE)
+        if sol_a_result["mem_mb"] > self.cfg_limits["problem_mem_mb"]:
+            return "MLE (Measured)"
+        return None
+
+    @staticmethod
+    def _iter_tokens(stream):
+        """Lazily yields (line_no, token_no, token) from a text stream."""
+        for line_no, line in enumerate(stream, 1):
+            for token_no, token in enumerate(line.split(), 1):
+                yield line_no, token_no, token
+
+    def _tokens_match(self, got, expected):
+        """Exact match, or |a - b| within float_eps (abs/rel, like feq)."""
+        if got == expected:
+            return True
+        # Integers must match exactly; only compare formatted reals loosely
+        if not any(c in got + expected for c in ".eE"):
+            return False
+        try:
+            x, y = float(got), float(expected)
+        except ValueError:
+            return False
+        eps = self.cfg_tester["float_eps"]
+        return abs(x - y) <= max(eps * max(abs(x), abs(y)), eps)
+
+    def _compare_token_streams(self, got_stream, expected_stream):
+        """
+        Streams both outputs token by token and stops at the first
+        mismatch. Returns None if they match, else a description of where
+        they differ (positions refer to the expected output).
+        """
+        got_tokens = self._iter_tokens(got_stream)
+        for line_no, token_no, expected in self._iter_tokens(expected_stream):
+            got = next(got_tokens, None)
+            if got is None:
+                return f"Output ended early: expected '{expected}' at line {line_no}, token {token_no}"
+            if not self._tokens_match(got[2], expected):
+                return (
+                    f"Line {line_no}, token {token_no}: expected '{expected}', "
+                    f"got '{got[2]}' (your line {got[0]}, token {got[1]})"
+                )
+        extra = next(got_tokens, None)
+        if extra is not None:
+            return f"Extra output: '{extra[2]}' at your line {extra[0]}, token {extra[1]}"
+        return None
+
+    def _run_checker_command(self, test_case, got, expected):
+        """
+        Delegates to the user's checker, testlib style:
+        'checker <input> <output> <answer>'. Exit code 0 means accepted.
+        Returns (verdict, message) as _run_checker_on_files.
+        """
+        with tempfile.TemporaryDirectory(prefix="stress_check_") as tmp:
+            paths = []
+            for name, data in (("input", test_case), ("output", got), ("answer", expected)):
+                path = Path(tmp) / f"{name}.txt"
+                path.write_text(data + "\n")
+                paths.append(str(path))
+            return self._run_checker_on_files(paths)
+
+    def _run_checker_on_files(self, paths):
+        """
+        Runs the checker on [input, output, answer] file paths. Returns
+        ("OK", None) if accepted, ("Wrong Answer", message) if it rejected
+        the output (testlib's exit codes 1 = WA and 2 = PE), and
+        ("Checker Error", message) for anything else: another exit code
+        (testlib's 3 = fail), a crash, a limit or a tester error.
+        """
+        result = self._run_command(
+            shlex.join(shlex.split(self.cfg_cmd["checker"]) + paths),
+            None,
+            self.cfg_limits["brute_force_time_s"],
+            self.cfg_limits["brute_force_mem_mb"],
+        )
+        if not result["error"]:
+            return "OK", None
+        message = result["stderr"] or result["stdout"]
+        if result["error"] == "RE":
+            if result.get("returncode") in (1, 2):
+                return "Wrong Answer", f"Checker rejected (exit code {result['returncode']}): {message}"
+            return "Checker Error", f"Checker failed (exit code {result.get('returncode')}): {message}"
+        return "Checker Error", f"Checker failed ({result['error']}): {message}"
+
+    def _judge_outputs(self, test_case, sol_a_result, sol_b_result):
+        """
+        Compares solution_a's output against the brute's with the
+        configured checker. Returns "OK", "Wrong Answer" or (if a checker
+        command failed) "Checker Error"; otherwise the checker's
+        explanation is stored in sol_a_result["checker"].
+        """
+        mode = self.cfg_tester["checker"]
+        if mode == "exact":
+            if sol_a_result["stdout"] == sol_b_result["stdout"]:
+                return "OK"
+            return "Wrong Answer"
+
+        if mode == "tokens":
+            detail = self._compare_token_streams(
+                io.StringIO(sol_a_result["stdout"]),
+                io.StringIO(sol_b_result["stdout"]),
+            )
+            verdict = "OK" if detail is None else "Wrong Answer"
+        else:
+            verdict, detail = self._run_checker_command(
+                test_case, sol_a_result["stdout"], sol_b_result["stdout"]
+            )
+        if detail is not None:
+            sol_a_result["checker"] = detail
+        return verdict
+
+    @staticmethod
+    def _stripped_view(mapped):
+        """Zero-copy view of a mapped output without surrounding whitespace."""
+        view = memoryview(mapped)
+        start, end = 0, len(view)
+        while start < end and view[start] in b" \t\r\n\f\v":
+            start += 1
+        while end > start and view[end - 1] in b" \t\r\n\f\v":
+            end -= 1
+        return view[start:end]
+
+    @staticmethod
+    def _map_fd(fd):
+        """Read-only mmap of a whole memfd (None if it is empty)."""
+        size = os.fstat(fd).st_size
+        return mmap.mmap(fd, size, prot=mmap.PROT_READ) if size else None
+
+    @staticmethod
+    def _fd_path(fd):
+        """A path that opens 'fd' afresh (own offset), also from children."""
+        return f"/proc/{os.getpid()}/fd/{fd}"
+
+    def _judge_large_outputs(self, input_fd, sol_a_result, sol_b_result):
+        """
+        _judge_outputs for the large-input mode, working on the output
+        memfds: 'exact' compares mmaps of both outputs, 'tokens' streams
+        them from the fds and 'command' hands the checker the fd paths.
+        """
+        out_a, out_b = sol_a_result["stdout_fd"], sol_b_result["stdout_fd"]
+        mode = self.cfg_tester["checker"]
+        if mode == "exact":
+            map_a, map_b = self._map_fd(out_a), self._map_fd(out_b)
+            try:
+                view_a = self._stripped_view(map_a or b"")
+                view_b = self._stripped_view(map_b or b"")
+                same = view_a == view_b
+                view_a.release()
+                view_b.release()
+            finally:
+                for mapped in (map_a, map_b):
+                    if mapped:
+                        mapped.close()
+            return "OK" if same else "Wrong Answer"
+
+        if mode == "tokens":
+            with open(self._fd_path(out_a), errors="replace") as got, open(
+                self._fd_path(out_b), errors="replace"
+            ) as expected:
+                detail = self._compare_token_streams(got, expected)
+            verdict = "OK" if detail is None else "Wrong Answer"
+        else:
+            verdict, detail = self._run_checker_on_files(
+                [self._fd_path(fd) for fd in (input_fd, out_a, out_b)]
+            )
+        if detail is not None:
+            sol_a_result["checker"] = detail
+        return verdict
+
+    def _make_pool(self):
+        """Creates the worker pool, pinning workers to cores if configured."""
+        if not self.worker_cores:
+            return multiprocessing.Pool(processes=self.num_workers)
+        free_cores = multiprocessing.Queue()
+        for core in self.worker_cores:
+            free_cores.put(core)
+        return multiprocessing.Pool(
+            processes=self.num_workers,
+            initializer=_pin_worker,
+            initargs=(free_cores,),
+        )
+
+    def _is_near_limit(self, verdict, sol_a_result):
+        """True if solution_a's time is within near_limit_margin of the limit."""
+        margin = self.cfg_tester["near_limit_margin"]
+        if margin <= 0 or verdict not in ("OK", "TLE (OS)", "TLE (Wall)"):
+            return False
+        limit = self.cfg_limits["problem_time_s"]
+        return sol_a_result["time"] >= (1 - margin) * limit
+
+    def _reverify_timing(self, result):
+        """
+        Re-runs a near-limit case serially (on the parent's core) several
+        times and replaces the verdict with the majority outcome, using
+        the median CPU time as the calibrated timing. Interactive cases
+        are re-run against the interactor.
+        """
+        test_index, verdict, test_case, sol_a, sol_b, gen_result = result
+        reruns = range(self.cfg_tester["near_limit_reruns"])
+        if self.interactive:
+            pairs = [self._run_interactive(test_case) for _ in reruns]
+            interactor_results = {id(r): interactor for r, interactor in pairs}
+            runs = [r for r, _ in pairs]
+        else:
+            runs = [self._run_candidate(test_case) for _ in reruns]
+        tle_runs = [r for r in runs if r["error"] in ("TLE (OS)", "TLE (Wall)")]
+        times = [r["time"] for r in runs]
+        calibration = {
+            "runs": len(runs),
+            "tle_runs": len(tle_runs),
+            "median_time": statistics.median(times),
+            "first_verdict": verdict,
+        }
+
+        if 2 * len(tle_runs) > len(runs):
+            sol_a = {**tle_runs[0], "time": calibration["median_time"], "calibrated": calibration}
+            return (test_index, sol_a["error"], test_case, sol_a, sol_b, gen_result)
+
+        # Mostly within the limit: judge a passing run like any other test
+        passing = [r for r in runs if r not in tle_runs]
+        closest = min(passing, key=lambda r: abs(r["time"] - calibration["median_time"]))
+        sol_a = {**closest, "time": calibration["median_time"], "calibrated": calibration}
+        if self.interactive:
+            sol_b = interactor_results[id(closest)]
+            verdict = self._judge_interactive(sol_a, sol_b)
+            return (test_index, verdict, test_case, sol_a, sol_b, gen_result)
+        if sol_b.get("skipped"):
+            # The pipelined scheduler skips the brute on a TLE
+            sol_b = self._run_brute(test_case)
+        verdict = self._judge_candidate(sol_a)
+        if not verdict:
+            verdict = (
+                "Brute Force Error"
+                if sol_b["error"]
+                else self._judge_outputs(test_case, sol_a, sol_b)
+            )
+        return (test_index, verdict, test_case, sol_a, sol_b, gen_result)
+
+    def _run_task(self, task):
+        """Pool entry point: unpacks a (test_index, gen_result) task."""
+        return self._run_single_test(*task)
+
+    def _run_stage(self, job):
+        """
+        Pool entry point of the pipelined scheduler: runs one stage
+        ("generate", "solution_a" or "solution_b") of one test.
+        """
+        signal.signal(signal.SIGTERM, self._worker_sigterm_handler)
+        stage, test_index, payload = job
+        if stage == "generate":
+            return stage, test_index, self._generate_cases(test_index, payload)
+        if stage == "solution_a":
+            return stage, test_index, self._run_candidate(payload)
+        return stage, test_index, self._run_brute(payload)
+
+    def _pipelined_results(self):
+        """
+        Stage-pipelined scheduler. Generation, solution_a and solution_b
+        runs are separate pool jobs; both solutions of a test are queued
+        as soon as its input exists, and the brute is skipped when
+        solution_a alone already decides the verdict.
+        Yields the same result tuples as _run_single_test.
+        """
+        gen_size = max(1, self.batch_size)
+        # Keep about two rounds of work generated ahead of the solvers
+        lookahead = 2 * self.num_workers
+
+        pending = {stage: deque() for stage in PIPELINE_STAGES}
+        running = dict.fromkeys(PIPELINE_STAGES, 0)
+        self.stage_stats = {
+            stage: {"sum": 0, "max": 0} for stage in PIPELINE_STAGES
+        }
+        self.stage_stats["samples"] = 0
+        done = queue.Queue()
+        tests = {}  # test_index -> {"gen": ..., "a": ..., "b": ...}
+        next_index = self.first_test
+
+        def submit(stage, test_index, payload):
+            running[stage] += 1
+            pool.apply_async(
+                self._run_stage,
+                ((stage, test_index, payload),),
+                callback=done.put,
+                error_callback=done.put,
+            )
+
+        while True:
+            # Queue generation while the solvers are running low
+            queued_cases = len(pending["solution_a"]) + gen_size * (
+                len(pending["generate"]) + running["generate"]
+            )
+            while next_index <= self.last_test and queued_cases < lookahead:
+                wanted = min(gen_size, self.last_test - next_index + 1)
+                pending["generate"].append((next_index, wanted))
+                next_index += wanted
+                queued_cases += wanted
+
+            # Fill idle workers, downstream stages first
+            while sum(running.values()) < self.num_workers:
+                stage = next((st for st in PIPELINE_STAGES if pending[st]), None)
+                if stage is None:
+                    break
+                submit(stage, *pending[stage].popleft())
+
+            if not sum(running.values()):
+                return  # Nothing queued, nothing running: all tests done
+
+            message = done.get()
+            if isinstance(message, BaseException):
+                raise message
+            stage, test_index, payload = message
+            running[stage] -= 1
+
+            self.stage_stats["samples"] += 1
+            for st in PIPELINE_STAGES:
+                depth = len(pending[st])
+                self.stage_stats[st]["sum"] += depth
+                self.stage_stats[st]["max"] = max(self.stage_stats[st]["max"], depth)
+
+            if stage == "generate":
+                for case_index, gen_result in payload:
+                    if gen_result["error"]:
+                        yield (
+                            case_index,
+                            "Generator Error",
+                            "N/A",
+                            gen_result,
+                            gen_result,
+                            gen_result,
+                        )
+                        return
+                    if gen_result.get("duplicate"):
+                        yield self._duplicate_result(case_index, gen_result)
+                        continue
+                    tests[case_index] = {"gen": gen_result, "a": None, "b": None}
+                    pending["solution_a"].append((case_index, gen_result["stdout"]))
+                    pending["solution_b"].append((case_index, gen_result["stdout"]))
+                continue
+
+            test = tests[test_index]
+            test["a" if stage == "solution_a" else "b"] = payload
+            test_case = test["gen"]["stdout"]
+
+            if stage == "solution_a":
+                verdict = self._judge_candidate(payload)
+                if verdict:
+                    # No need to wait for (or even start) the brute
+                    yield (
+                        test_index,
+                        verdict,
+                        test_case,
+                        payload,
+                        test["b"] or self._skipped_brute_result(),
+                        test["gen"],
+                    )
+                    return
+
+            if test["a"] is None or test["b"] is None:
+                continue
+
+            del tests[test_index]
+            sol_a_result, sol_b_result = test["a"], test["b"]
+            if sol_b_result["error"]:
+                verdict = "Brute Force Error"
+            else:
+                verdict = self._judge_outputs(test_case, sol_a_result, sol_b_result)
+            yield (
+                test_index,
+                verdict,
+                test_case,
+                sol_a_result,
+                sol_b_result,
+                test["gen"],
+            )
+
+    async def _async_test(self, children, test_index):
+        """
+        One test under the asyncio supervisor: generate, then run both
+        solutions concurrently. 'children' bounds concurrent processes.
+        """
+        safety_time_s = self.cfg_limits["brute_force_time_s"]
+        safety_mem_mb = self.cfg_limits["brute_force_mem_mb"]
+
+        async with children:
+            gen_result = await self._run_async(
+                self.cfg_cmd["generator"],
+                None,
+                safety_time_s,
+                safety_mem_mb,
+                {SEED_ENV: str(test_index)},
+            )
+        gen_result["seed"] = test_index
+        if gen_result["error"]:
+            return (test_index, "Generator Error", "N/A", gen_result, gen_result, gen_result)
+        self._mark_duplicates([(test_index, gen_result)])
+        if gen_result.get("duplicate"):
+            return self._duplicate_result(test_index, gen_result)
+        test_case = gen_result["stdout"]
+
+        async def candidate():
+            async with children:
+                return await self._run_async(
+                    self.cfg_cmd["solution_a"],
+                    test_case,
+                    self.cfg_limits["problem_time_s"],
+                    safety_mem_mb,
+                )
+
+        async def brute():
+            if self.brute_fingerprint:
+                cached_stdout = self._brute_cache_get(test_case)
+                if cached_stdout is not None:
+                    return {
+                        "stdout": cached_stdout,
+                        "stderr": "",
+                        "time": 0,
+                        "mem_mb": 0,
+                        "error": None,
+                        "measured": False,
+                        "cached": True,
+                    }
+            async with children:
+                sol_b_result = await self._run_async(
+                    self.cfg_cmd["solution_b"], test_case, safety_time_s, safety_mem_mb
+                )
+            if self.brute_fingerprint and not sol_b_result["error"]:
+                self._brute_cache_put(test_case, sol_b_result["stdout"])
+            return sol_b_result
+
+        sol_a_result, sol_b_result = await asyncio.gather(candidate(), brute())
+
+        # Same precedence as _run_single_test
+        if sol_b_result["error"]:
+            verdict = "Brute Force Error"
+        else:
+            verdict = self._judge_candidate(sol_a_result)
+        if not verdict:
+            if self.cfg_tester["checker"] == "command":
+                verdict = await asyncio.to_thread(
+                    self._judge_outputs, test_case, sol_a_result, sol_b_result
+                )
+            else:
+                verdict = self._judge_outputs(test_case, sol_a_result, sol_b_result)
+        return (test_index, verdict, test_case, sol_a_result, sol_b_result, gen_result)
+
+    async def _async_results(self):
+        """
+        asyncio supervisor: drives every child from this one process, with
+        at most 'num_workers' children alive at once. On the first failure
+        all in-flight tests are cancelled (killing their process groups)
+        before the failure is yielded.
+        """
+        children = asyncio.Semaphore(self.num_workers)
+        indices = iter(range(self.first_test, self.last_test + 1))
+        # Tests in flight; a few more than children so the semaphore stays busy
+        window = 2 * self.num_workers
+        in_flight = set()
+
+        async def cancel_all():
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            in_flight.clear()
+
+        try:
+            while True:
+                for test_index in itertools.islice(indices, window - len(in_flight)):
+                    in_flight.add(asyncio.create_task(self._async_test(children, test_index)))
+                if not in_flight:
+                    return
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                in_flight.difference_update(done)
+                for task in done:
+                    result = task.result()
+                    if result[1] not in ("OK", "Duplicate"):
+                        await cancel_all()
+                        yield result
+                        return
+                    yield result
+        finally:
+            await cancel_all()
+
+    def _asyncio_results(self):
+        """Synchronous view of _async_results for run()'s result loop."""
+        loop = asyncio.new_event_loop()
+        # One thread talks to the ChildLauncher, which serves one thread only
+        self.launcher_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        results = self._async_results()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.close()
+            self.launcher_executor.submit(_close_launcher).result()
+            self.launcher_executor.shutdown()
+
+    @staticmethod
+    def _duplicate_result(test_index, gen_result):
+        """Result tuple for a case that was already judged earlier."""
+        return (
+            test_index,
+            "Duplicate",
+            gen_result["stdout"],
+            gen_result,
+            gen_result,
+            gen_result,
+        )
+
+    @staticmethod
+    def _skipped_brute_result():
+        """Placeholder solution_b result for a brute that never ran."""
+        return {
+            "stdout": "",
+            "stderr": "",
+            "time": 0,
+            "mem_mb": 0,
+            "error": None,
+            "measured": False,
+            "skipped": True,
+        }
+
+    def _format_stage_depths(self):
+        """One-line summary of the pipelined scheduler's queue depths."""
+        samples = max(1, self.stage_stats["samples"])
+        parts = []
+        for stage in ("generate", "solution_a", "solution_b"):
+            stats = self.stage_stats[stage]
+            parts.append(
+                f"{stage}: avg {stats['sum'] / samples:.1f}, max {stats['max']}"
+            )
+        return "Queue depth -- " + " | ".join(parts)
+
+    def _run_single_test(self, test_index, gen_result=None):
+        """
+        The "worker" function that runs and judges a single test case.
+        This runs in a separate process from the pool.
+        'gen_result' is given when the case came from a batched generator.
+        """
+        # Set the worker's own SIGTERM handler
+        signal.signal(signal.SIGTERM, self._worker_sigterm_handler)
+        if self.large_input:
+            return self._run_large_test(test_index, gen_result)
+        if self.interactive:
+            return self._run_interactive_test(test_index, gen_result)
+
+        # --- 1. Run Generator (with safety limits) ---
+        if gen_result is None:
+            _, gen_result = self._generate_cases(test_index, 1)[0]
+        if gen_result["error"]:
+            return (
+                test_index,
+                "Generator Error",
+                "N/A",
+                gen_result,
+                gen_result,
+                gen_result,
+            )
+        if gen_result.get("duplicate"):
+            return self._duplicate_result(test_index, gen_result)
+        test_case = gen_result["stdout"]
+
+        # --- 2. Run Solution A (with *hybrid* limits) ---
+        sol_a_result = self._run_candidate(test_case)
+
+        # --- 3. Run Solution B (with safety limits), unless cached ---
+        sol_b_result = self._run_brute(test_case)
+
+        # --- 4. Judge the Results ---
+
+        # 4a. Check Brute Force
+        if sol_b_result["error"]:
+            return (
+                test_index,
+                "Brute Force Error",
+                test_case,
+                sol_a_result,
+                sol_b_result,
+                gen_result,
+            )
+
+        # 4b/4c. Check Solution A's OS-level errors and measured memory
+        verdict = self._judge_candidate(sol_a_result)
+        if verdict:
+            return (
+                test_index,
+                verdict,
+                test_case,
+                sol_a_result,
+                sol_b_result,
+                gen_result,
+            )
+
+        # 4d. Check for Wrong Answer (Only if TLE/RE/MLE all passed)
+        # 5. If all passed, it's OK
+        verdict = self._judge_outputs(test_case, sol_a_result, sol_b_result)
+        return (test_index, verdict, test_case, sol_a_result, sol_b_result, gen_result)
+
+    def _tournament_tasks(self, tasks, alive, slots):
+        """
+        Tags tasks with the candidates still in the running. 'slots'
+        bounds how many are queued ahead, so 'alive' is read just before a
+        worker is free and a failed candidate is only run on a few more
+        inputs already in flight.
+        """
+        for task in tasks:
+            while not slots.acquire(timeout=0.1):
+                if tasks_stop.is_set():
+                    return
+            yield task + (tuple(sorted(alive)),)
+
+    def _run_tournament_test(self, task):
+        """
+        Pool entry point of tournament mode: one generated input and one
+        brute run, judged against every candidate still in the running.
+        Returns (test_index, verdict, test_case, outcomes, sol_b_result,
+        gen_result); 'outcomes' maps candidate number to (verdict, result)
+        and 'verdict' is only set when no candidate could be judged.
+        """
+        signal.signal(signal.SIGTERM, self._worker_sigterm_handler)
+        test_index, gen_result, alive = task
+
+        if gen_result is None:
+            _, gen_result = self._generate_cases(test_index, 1)[0]
+        if gen_result["error"]:
+            return (test_index, "Generator Error", "N/A", {}, gen_result, gen_result)
+        if gen_result.get("duplicate"):
+            return (test_index, "Duplicate", gen_result["stdout"], {}, gen_result, gen_result)
+        test_case = gen_result["stdout"]
+
+        runs = {
+            number: self._run_candidate(test_case, self.candidates[number][1])
+            for number in alive
+        }
+        sol_b_result = self._run_brute(test_case)
+        if sol_b_result["error"]:
+            return (test_index, "Brute Force Error", test_case, {}, sol_b_result, gen_result)
+
+        outcomes = {}
+        for number, sol_a_result in runs.items():
+            verdict = self._judge_candidate(sol_a_result)
+            if not verdict:
+                verdict = self._judge_outputs(test_case, sol_a_result, sol_b_result)
+            outcomes[number] = (verdict, sol_a_result)
+        return (test_index, None, test_case, outcomes, sol_b_result, gen_result)
+
+    def _tournament_failure_path(self, number):
+        """failing_input.txt -> failing_input.3.txt for candidate #3."""
+        failing_file = Path(self.cfg_paths["failing_input_file"])
+        return failing_file.with_name(f"{failing_file.stem}.{number + 1}{failing_file.suffix}")
+
+    @staticmethod
+    def _format_mem(result):
+        """A result's memory for reports; warm-start figures are marked."""
+        if result.get("warm"):
+            return f"{result['mem_mb']:.1f}MB above the preloaded interpreter (warm start)"
+        return f"{result['mem_mb']:.1f}MB"
+
+    def _report_tournament_failure(self, number, test_index, verdict, test_case, sol_a, gen_result):
+        """Short report of a candidate's first failure; saves its input."""
+        label = self.candidates[number][0]
+        print(
+            f"\n{RED}--- Candidate #{number + 1} ({label}) failed on "
+            f"{self._describe_case(test_index, gen_result)}: {verdict} ---{RESET}"
+        )
+        print(f"(Time: {sol_a['time']:.3f}s, Mem: {self._format_mem(sol_a)})")
+        failing_file = self._tournament_failure_path(number)
+        failing_file.write_text(test_case)
+        print(f"Failing test case saved to '{failing_file}'")
+        if gen_result.get("seed") is not None:
+            print(f"Reproduce with: {self._describe_seed(gen_result)}")
+        if self.cfg_paths["corpus_dir"]:
+            self._save_to_corpus(test_case, verdict, gen_result)
+        if sol_a.get("checker"):
+            print(f"{CYAN}Checker:{RESET} {sol_a['checker']}")
+        if sol_a["stderr"]:
+            print(f"{CYAN}Stderr:{RESET} {sol_a['stderr'].splitlines()[-1]}")
+
+    def _report_tournament(self, stats, tests_run, finished):
+        """Per-candidate verdict table with relative CPU times."""
+        medians = {
+            number: statistics.median(stat["times"])
+            for number, stat in stats.items()
+            if stat["times"]
+        }
+        fastest = min(medians.values(), default=0)
+        print(f"\n\n{CYAN}--- Tournament Results ({tests_run} tests) ---{RESET}")
+        print(
+            f"{'#':>2}  {'candidate':<28} {'tests':>6} {'median':>8} {'max':>8} "
+            f"{'max mem':>9} {'vs best':>8}  verdict"
+        )
+        for number, (label, _) in enumerate(self.candidates):
+            stat = stats[number]
+            times = stat["times"]
+            if stat["failure"]:
+                failed_on, verdict = stat["failure"]
+                outcome = f"{RED}{verdict} on #{failed_on}{RESET}"
+            elif finished:
+                outcome = f"{GREEN}Passed{RESET}"
+            else:
+                outcome = f"{YELLOW}No failure (stopped early){RESET}"
+            if times:
+                timing = (
+                    f"{medians[number]:>7.3f}s {max(times):>7.3f}s {stat['max_mem']:>7.1f}MB "
+                    f"{medians[number] / fastest if fastest else 1.0:>7.2f}x"
+                )
+            else:
+                timing = f"{'-':>8} {'-':>8} {'-':>9} {'-':>8}"
+            print(f"{number + 1:>2}  {label[:28]:<28} {stat['tests']:>6} {timing}  {outcome}")
+
+    def tournament(self):
+        """
+        Tournament mode: every candidate in 'solution_a' is judged on the
+        same generated inputs against a single brute run per input. Stops
+        at the first failure, or with 'tournament_keep_going' once every
+        candidate has failed or all tests are done. Uses the global 'pool'.
+        """
+        global pool, tasks_stop, deduplicator
+        print(
+            f"Tournament of {len(self.candidates)} candidates over "
+            f"{self.cfg_tester['max_tests']} tests (seeds {self.first_test}..{self.last_test})...\n"
+        )
+
+        if self.brute_fingerprint:
+            self._evict_brute_cache()
+
+        dedup_manager = None
+        if self.cfg_tester["dedup"]:
+            dedup_manager = self._start_deduplicator()
+
+        keep_going = self.cfg_tester["tournament_keep_going"]
+        alive = set(range(len(self.candidates)))
+        stats = {
+            number: {"tests": 0, "times": [], "max_mem": 0.0, "failure": None}
+            for number in alive
+        }
+        tests_run = 0
+        finished = False
+
+        pool = self._make_pool()
+        slots, tasks_stop = None, threading.Event()
+        if self.batch_size > 1:
+            slots = threading.Semaphore(2 * self.batch_size * self.num_workers)
+            tasks = self._batched_tasks(slots, tasks_stop)
+        else:
+            tasks = ((i, None) for i in range(self.first_test, self.last_test + 1))
+        tasks = itertools.chain(self._corpus_tasks(), tasks)
+        # Candidates that already failed are not run on later inputs
+        queued = threading.Semaphore(2 * self.num_workers)
+        tasks = self._tournament_tasks(tasks, alive, queued)
+
+        try:
+            results = pool.imap_unordered(self._run_tournament_test, tasks)
+            for test_index, verdict, test_case, outcomes, sol_b, gen_result in results:
+                queued.release()
+                if slots:
+                    slots.release()
+                if verdict == "Duplicate":
+                    continue
+                tests_run += 1
+
+                if verdict:
+                    # Nothing to judge the candidates against
+                    print(
+                        f"\n\n{RED}--- FAILURE on {self._describe_case(test_index, gen_result)}: "
+                        f"{verdict} ---{RESET}"
+                    )
+                    failing_file = Path(self.cfg_paths["failing_input_file"])
+                    failing_file.write_text(test_case)
+                    print(f"Failing test case saved to '{failing_file}'")
+                    if sol_b["stderr"]:
+                        print(f"\n{CYAN}--- STDERR ---{RESET}\n{sol_b['stderr']}")
+                    break
+
+                failed_now = False
+                for number, (candidate_verdict, sol_a) in sorted(outcomes.items()):
+                    if number not in alive:
+                        continue  # Queued before it failed elsewhere
+                    stat = stats[number]
+                    stat["tests"] += 1
+                    if candidate_verdict == "OK":
+                        stat["times"].append(sol_a["time"])
+                        stat["max_mem"] = max(stat["max_mem"], sol_a["mem_mb"])
+                        continue
+                    failed_now = True
+                    alive.discard(number)
+                    stat["failure"] = (test_index, candidate_verdict)
+                    self._report_tournament_failure(
+                        number, test_index, candidate_verdict, test_case, sol_a, gen_result
+                    )
+
+                if not failed_now:
+                    print(f"{GREEN}.{RESET}", end="", flush=True)
+                    if tests_run % 80 == 0:  # Newline every 80 tests
+                        print()
+                if not alive or (failed_now and not keep_going):
+                    break
+            else:
+                finished = True
+
+            tasks_stop.set()
+            if finished:
+                pool.close()
+            else:
+                pool.terminate()
+            pool.join()
+            self._report_tournament(stats, tests_run, finished)
+
+        except KeyboardInterrupt:
+            # Handled by _main_shutdown_handler (see run())
+            pass
+        except Exception as e:
+            print(f"\n\n{RED}A critical error occurred: {e}{RESET}")
+            tasks_stop.set()
+            pool.terminate()
+            pool.join()
+        finally:
+            if dedup_manager:
+                self._report_duplicates()
+                dedup_manager.shutdown()
+                deduplicator = None
+
+    def _run_interactive_test(self, test_index, gen_result=None):
+        """
+        _run_single_test for interactive problems: the generated case is
+        the interactor's secret input, and the interactor's exit code
+        (0 = accepted) replaces the comparison with a brute force.
+        """
+        if gen_result is None:
+            _, gen_result = self._generate_cases(test_index, 1)[0]
+        if gen_result["error"]:
+            return (test_index, "Generator Error", "N/A", gen_result, gen_result, gen_result)
+        if gen_result.get("duplicate"):
+            return self._duplicate_result(test_index, gen_result)
+        test_case = gen_result["stdout"]
+
+        sol_a_result, interactor_result = self._run_interactive(test_case)
+        verdict = self._judge_interactive(sol_a_result, interactor_result)
+        return (test_index, verdict, test_case, sol_a_result, interactor_result, gen_result)
+
+    def _judge_interactive(self, sol_a_result, interactor_result):
+        """Verdict of one interactive run (sets sol_a_result["checker"] on a WA)."""
+        if sol_a_result["query_limit_hit"]:
+            verdict = "Query Limit Exceeded"
+        elif interactor_result["returncode"] < 0 and sol_a_result["error"] != "TLE (Wall)":
+            # The interactor itself crashed: not a verdict on solution_a
+            verdict = "Interactor Error"
+        else:
+            verdict = self._judge_candidate(sol_a_result)
+        if not verdict:
+            if interactor_result["returncode"] == 0:
+                verdict = "OK"
+            else:
+                verdict = "Wrong Answer"
+                sol_a_result["checker"] = (
+                    interactor_result["stderr"]
+                    or f"Interactor exited with code {interactor_result['returncode']}"
+                )
+        return verdict
+
+    def _run_large_test(self, test_index, gen_result=None):
+        """
+        _run_single_test for the large-input mode: the generator writes
+        into a memfd that both solutions read as stdin, and their outputs
+        stay in memfds until judged. Texts are only decoded (and sent back
+        to the parent) when the result will be reported or re-run.
+        """
+        safety_time_s = self.cfg_limits["brute_force_time_s"]
+        safety_mem_mb = self.cfg_limits["brute_force_mem_mb"]
+
+        if gen_result is None:
+            gen_result = self._run_to_memfd(
+                self.cfg_cmd["generator"],
+                None,
+                safety_time_s,
+                safety_mem_mb,
+                {SEED_ENV: str(test_index)},
+            )
+            gen_result["seed"] = test_index
+        else:
+            # Corpus and minimizer cases arrive as text
+            input_fd = os.memfd_create("input")
+            with os.fdopen(os.dup(input_fd), "w") as input_file:
+                input_file.write(gen_result["stdout"])
+            gen_result = {**gen_result, "stdout_fd": input_fd}
+
+        results = [gen_result]
+        input_fd = gen_result["stdout_fd"]
+        try:
+            if gen_result["error"]:
+                return (test_index, "Generator Error", "N/A", gen_result, gen_result, gen_result)
+
+            input_map = self._map_fd(input_fd)
+            gen_result["input_sha256"] = hashlib.sha256(input_map or b"").hexdigest()
+            if input_map:
+                input_map.close()
+            self._mark_duplicates([(test_index, gen_result)])
+            if gen_result.get("duplicate"):
+                return self._duplicate_result(test_index, gen_result)
+
+            def run(command, time_limit_s):
+                stdin_fd = os.open(self._fd_path(input_fd), os.O_RDONLY)
+                try:
+                    result = self._run_to_memfd(command, stdin_fd, time_limit_s, safety_mem_mb)
+                finally:
+                    os.close(stdin_fd)
+                results.append(result)
+                return result
+
+            sol_a_result = run(self.cfg_cmd["solution_a"], self.cfg_limits["problem_time_s"])
+            sol_b_result = run(self.cfg_cmd["solution_b"], safety_time_s)
+
+            # Same precedence as _run_single_test
+            if sol_b_result["error"]:
+                verdict = "Brute Force Error"
+            else:
+                verdict = self._judge_candidate(sol_a_result)
+            if not verdict:
+                verdict = self._judge_large_outputs(input_fd, sol_a_result, sol_b_result)
+
+            test_case = ""
+            if verdict != "OK" or self._is_near_limit(verdict, sol_a_result):
+                with open(self._fd_path(input_fd), errors="replace") as input_file:
+                    test_case = input_file.read().strip()
+                for result in (sol_a_result, sol_b_result):
+                    with open(self._fd_path(result["stdout_fd"]), errors="replace") as output:
+                        result["stdout"] = output.read().strip()
+            return (test_index, verdict, test_case, sol_a_result, sol_b_result, gen_result)
+        finally:
+            for result in results:
+                os.close(result.pop("stdout_fd"))
+
+    def _check_candidate(self, candidate):
+        """Pool entry point of the minimizer: judges one candidate input."""
+        gen_result = {
+            "stdout": candidate,
+            "stderr": "",
+            "time": 0,
+            "mem_mb": 0,
+            "error": None,
+            "measured": False,
+        }
+        return self._run_single_test(0, gen_result)
+
+    @staticmethod
+    def _with_count_fixes(rows, removed, before, size_at):
+        """
+        Yields the reduced input 'rows' (lists of tokens) as text with its
+        count headers kept valid. 'before' is (row, col): the integer
+        tokens strictly before it may be counts.
+        'size_at(row, col)' is the size a count at that position had
+        before the removal: the rest of its line if it starts the edited
+        line, the length of the edited line, or the number of lines after
+        it (-1 where no count can be).
+
+        A token equal to its size is taken as the count of what was cut
+        ("n" then n values or n lines), and only the variant with it
+        decreased by 'removed' is yielded. Without such a match, the
+        reduced input is yielded as is, then with one nearby integer
+        decremented by 'removed' or 1 ("n m" / "t" style counts).
+        """
+        row_i, col_i = before
+        positions = []
+        for r in range(min(row_i, len(rows) - 1), -1, -1):
+            end = col_i if r == row_i else len(rows[r])
+            for c in range(end - 1, -1, -1):
+                if rows[r][c].lstrip("-").isdigit():
+                    positions.append((r, c))
+            if len(positions) >= 3:
+                break
+        positions = positions[:3]
+
+        # Counts sit at the start of the edited line or on the short
+        # header lines just above it
+        headers = [(row_i, 0)] if 0 < col_i else []
+        for r in range(min(row_i, len(rows)) - 1, max(row_i - 4, -1), -1):
+            if len(rows[r]) <= 3:
+                headers += [(r, c) for c in range(len(rows[r]) - 1, -1, -1)]
+        for r, c in headers:
+            if not rows[r][c].isdigit():
+                continue
+            value = int(rows[r][c])
+            if value == size_at(r, c) and value >= removed:
+                fixed = [row[:] for row in rows]
+                fixed[r][c] = str(value - removed)
+                yield "\n".join(" ".join(row) for row in fixed)
+                return
+
+        yield "\n".join(" ".join(row) for row in rows)
+        for r, c in positions:
+            for step in sorted({removed, 1}, reverse=True):
+                value = int(rows[r][c]) - step
+                if value < 0:
+                    continue
+                fixed = [row[:] for row in rows]
+                fixed[r][c] = str(value)
+                yield "\n".join(" ".join(row) for row in fixed)
+
+    def _reduction_candidates(self, test_case):
+        """
+        Candidate reductions of a failing input, most aggressive first:
+        drop chunks of lines, drop chunks of tokens, shrink integers.
+        Every candidate is strictly smaller, so minimization terminates.
+        Counts are shrunk together with their arrays (_with_count_fixes).
+        """
+        rows = [line.split() for line in test_case.split("\n")]
+
+        # 1. Drop chunks of lines (halving the chunk size each pass)
+        def lines_after(r, c):
+            return len(rows) - r - 1
+
+        chunk = len(rows) // 2
+        while chunk >= 1:
+            for start in range(0, len(rows), chunk):
+                reduced = rows[:start] + rows[start + chunk :]
+                if reduced:
+                    yield from self._with_count_fixes(
+                        reduced, min(chunk, len(rows) - start), (start, 0), lines_after
+                    )
+            chunk //= 2
+
+        # 2. Drop chunks of tokens inside each line
+        for r, row in enumerate(rows):
+
+            def row_size(count_r, count_c, r=r, row=row):
+                if count_r == r:
+                    return len(row) - 1 if count_c == 0 else -1
+                return len(row)
+
+            chunk = len(row) // 2
+            while chunk >= 1 and len(row) > 1:
+                for start in range(0, len(row), chunk):
+                    reduced = [x[:] for x in rows]
+                    reduced[r] = row[:start] + row[start + chunk :]
+                    if reduced[r]:
+                        yield from self._with_count_fixes(
+                            reduced, min(chunk, len(row) - start), (r, start), row_size
+                        )
+                chunk //= 2
+
+        # 3. Shrink integers towards zero (counts only shrink with their arrays)
+        for r, row in enumerate(rows):
+            for c, token in enumerate(row):
+                if not token.lstrip("-").isdigit():
+                    continue
+                value = int(token)
+                if value > 0 and value in (
+                    len(row) - 1 if c == 0 else -1,
+                    len(rows[r + 1]) if r + 1 < len(rows) else -1,
+                    lines_after(r, c),
+                ):
+                    continue
+                for smaller in sorted({0, 1, value // 2, value - 1}, key=abs):
+                    if abs(smaller) < abs(value):
+                        reduced = [x[:] for x in rows]
+                        reduced[r][c] = str(smaller)
+                        yield "\n".join(" ".join(x) for x in reduced)
+
+    def _hook_candidates(self, test_case):
+        """
+        Candidates from the optional format-aware 'minimizer' command: it
+        reads the current input on stdin and prints smaller variants
+        separated by generator_delimiter lines.
+        """
+        if "minimizer" not in self.cfg_cmd:
+            return []
+        result = self._run_command(
+            self.cfg_cmd["minimizer"],
+            test_case,
+            self.cfg_limits["brute_force_time_s"],
+            self.cfg_limits["brute_force_mem_mb"],
+        )
+        if result["error"]:
+            return []
+        return [
+            case for case in self._split_batch(result["stdout"]) if len(case) < len(test_case)
+        ]
+
+    def _minimize_failure(self, failure):
+        """
+        Delta-debugs a failing input: repeatedly judges rounds of
+        candidate reductions in parallel on a fresh pool and keeps the
+        first one that reproduces the same kind of verdict. solution_b
+        judges every candidate, so one it cannot parse comes back as a
+        "Brute Force Error" and is rejected.
+        Returns the result tuple of the smallest input found.
+        """
+        global pool
+        _, verdict, test_case, _, _, _ = failure
+        wanted = verdict.split(" (")[0]  # e.g. "TLE (OS)" ~ "TLE (Wall)"
+        deadline = time.monotonic() + self.cfg_tester["minimize_time_s"]
+        round_size = 2 * self.num_workers
+
+        print(f"\n{CYAN}Minimizing failing input ({len(test_case)} bytes)...{RESET}")
+        pool = self._make_pool()
+        best, tried = failure, 0
+        try:
+            improved = True
+            while improved and time.monotonic() < deadline:
+                improved = False
+                candidates = itertools.chain(
+                    self._hook_candidates(best[2]),
+                    self._reduction_candidates(best[2]),
+                )
+                while not improved and time.monotonic() < deadline:
+                    batch = []
+                    for candidate in candidates:
+                        if candidate not in batch:
+                            batch.append(candidate)
+                        if len(batch) == round_size:
+                            break
+                    if not batch:
+                        break
+                    tried += len(batch)
+                    for result in pool.map(self._check_candidate, batch):
+                        if result[1].split(" (")[0] == wanted:
+                            best, improved = result, True
+                            print(f"{GREEN}.{RESET}", end="", flush=True)
+                            break
+        finally:
+            pool.terminate()
+            pool.join()
+
+        timed_out = time.monotonic() >= deadline
+        print(
+            f"\nTried {tried} candidates{' (time budget reached)' if timed_out else ''}: "
+            f"{len(test_case)} -> {len(best[2])} bytes."
+        )
+        return best
+
+    def _print_failure_details(self, verdict, test_case, sol_a, sol_b, gen_result):
+        """Prints the input, both answers and every stderr of a failure."""
+        print(f"{CYAN}--- INPUT ---{RESET}")
+        print(test_case)
+        print(f"\n{CYAN}--- YOUR ({verdict}) ANSWER ---{RESET}")
+        print(sol_a["stdout"])
+
+        if self.interactive:
+            print(f"\n{CYAN}--- INTERACTOR'S RESPONSES ---{RESET}")
+            print(sol_b["stdout"])
+            if sol_a.get("checker"):
+                print(f"\n{CYAN}--- INTERACTOR ---{RESET}\n{sol_a['checker']}")
+        elif verdict in ("Wrong Answer", "Checker Error"):
+            print(f"\n{CYAN}--- CORRECT (Brute) ANSWER ---{RESET}")
+            print(sol_b["stdout"])
+            if sol_a.get("checker"):
+                print(f"\n{CYAN}--- CHECKER ---{RESET}\n{sol_a['checker']}")
+
+        if gen_result["stderr"]:
+            print(
+                f"\n{CYAN}--- GENERATOR STDERR ---{RESET}\n{gen_result['stderr']}"
+            )
+        if sol_a["stderr"]:
+            print(
+                f"\n{CYAN}--- YOUR (solution_a) STDERR ---{RESET}\n{sol_a['stderr']}"
+            )
+        if sol_b["stderr"] and not self.interactive:
+            print(
+                f"\n{CYAN}--- BRUTE FORCE (solution_b) STDERR ---{RESET}\n{sol_b['stderr']}"
+            )
+
+    def _report_minimized(self, minimized):
+        """Saves and prints the minimized counterexample."""
+        _, verdict, test_case, sol_a, sol_b, _ = minimized
+        minimized_file = Path(self.cfg_paths["minimized_input_file"])
+        minimized_file.write_text(test_case)
+        print(f"Minimized test case ({verdict}) saved to '{minimized_file}'\n")
+
+        print(f"{CYAN}--- MINIMIZED INPUT ---{RESET}")
+        print(test_case)
+        print(f"\n{CYAN}--- YOUR ({verdict}) ANSWER ---{RESET}")
+        print(sol_a["stdout"])
+        if verdict == "Wrong Answer":
+            print(f"\n{CYAN}--- CORRECT (Brute) ANSWER ---{RESET}")
+            print(sol_b["stdout"])
+            if sol_a.get("checker"):
+                print(f"\n{CYAN}--- CHECKER ---{RESET}\n{sol_a['checker']}")
+
+    @staticmethod
+    def _plain_python_command(command):
+        """[interpreter, script] for a 'python script.py' command, else None."""
+        parts = shlex.split(command)
+        if len(parts) == 2 and PYTHON_INTERPRETER_RE.match(Path(parts[0]).name):
+            return parts
+        return None
+
+    @staticmethod
+    def _profile_label(func):
+        """'sol.py:12(solve)' for a pstats function key, or the builtin's name."""
+        filename, line, name = func
+        if filename == "~":
+            return name.replace(";", ",")
+        return f"{Path(filename).name}:{line}({name})".replace(";", ",")
+
+    @staticmethod
+    def _is_profiler_frame(func):
+        """Frames of PROFILE_WRAPPER itself (its cap handler, Profiler.disable)."""
+        return func[0] == "<string>" or "_lsprof" in func[2]
+
+    def _collapse_profile(self, stats):
+        """
+        Approximate collapsed stacks ('a;b;c <microseconds>' lines) for
+        flamegraph tools. cProfile only records caller -> callee edges,
+        so each function's self time is split between its callers in
+        proportion to the time spent under each of them.
+        """
+        entries = {
+            func: entry
+            for func, entry in stats.stats.items()
+            if not self._is_profiler_frame(func)
+        }
+        folded = {}
+
+        def walk(func, path, fraction):
+            callers = {
+                caller: edge
+                for caller, edge in entries[func][4].items()
+                if caller in entries and caller not in path
+            }
+            if not callers or len(path) >= 128:
+                yield (func,) + path, fraction
+                return
+            total = sum(edge[3] for edge in callers.values())
+            calls = sum(edge[1] for edge in callers.values())
+            for caller, edge in callers.items():
+                share = edge[3] / total if total > 0 else edge[1] / max(calls, 1)
+                if fraction * share >= 1e-4:
+                    yield from walk(caller, (func,) + path, fraction * share)
+
+        for func, (_, _, self_time, _, _) in entries.items():
+            if self_time <= 0:
+                continue
+            for stack, fraction in walk(func, (), 1.0):
+                line = ";".join(self._profile_label(frame) for frame in stack)
+                folded[line] = folded.get(line, 0) + self_time * fraction * 1e6
+        return [f"{line} {round(us)}" for line, us in sorted(folded.items()) if us >= 1]
+
+    def _profile_case(self, test_case, label):
+        """
+        Re-runs solution_a on 'test_case' under cProfile with the time
+        limit raised by 'profile_time_factor', then prints the top
+        'profile_top' functions by self time and saves the raw profile
+        and its collapsed stacks. Only plain Python commands are profiled.
+        """
+        if self.interactive:
+            print(f"\n{YELLOW}Not profiling: solution_a needs the interactor.{RESET}")
+            return
+        parts = self._plain_python_command(self.cfg_cmd["solution_a"])
+        if not parts:
+            print(f"\n{YELLOW}Not profiling: solution_a is not a plain Python command.{RESET}")
+            return
+
+        cap_s = self.cfg_limits["problem_time_s"] * self.cfg_tester["profile_time_factor"]
+        profile_file = Path(self.cfg_paths["profile_file"])
+        profile_file.unlink(missing_ok=True)
+        print(f"\n{CYAN}Profiling solution_a on the {label} (cap {cap_s:g}s)...{RESET}")
+        result = self._run_command(
+            shlex.join([parts[0], "-c", PROFILE_WRAPPER, parts[1], str(profile_file), str(cap_s)]),
+            test_case,
+            math.ceil(cap_s) + 1,  # Safety net; the wrapper stops at cap_s
+            self.cfg_limits["brute_force_mem_mb"],
+        )
+        if not profile_file.exists():
+            print(f"{YELLOW}No profile was written ({result['error']}).{RESET}")
+            if result["stderr"]:
+                print(result["stderr"])
+            return
+
+        stats = pstats.Stats(str(profile_file))
+        capped = " (stopped at the cap)" if result["error"] and result["time"] >= 0.95 * cap_s else ""
+        print(f"Profiled run: {result['time']:.3f}s CPU{capped}, {stats.total_calls} calls\n")
+
+        rows = sorted(
+            (
+                (entry[2], entry[3], entry[1], func)
+                for func, entry in stats.stats.items()
+                if not self._is_profiler_frame(func)
+            ),
+            reverse=True,
+        )[: self.cfg_tester["profile_top"]]
+        print(f"{'self (s)':>10} {'cum (s)':>10} {'calls':>10}  function")
+        for self_time, cum_time, calls, func in rows:
+            print(f"{self_time:>10.3f} {cum_time:>10.3f} {calls:>10}  {self._profile_label(func)}")
+
+        folded_file = profile_file.with_suffix(".folded")
+        folded_file.write_text("\n".join(self._collapse_profile(stats)) + "\n")
+        print(f"\nProfile saved to '{profile_file}', collapsed stacks to '{folded_file}'")
+
+    def _sample_rss(self, command, test_case):
+        """
+        Runs 'command' with the brute force limits (so it can grow past
+        the problem's memory limit) and samples its VmRSS from
+        /proc/<pid>/status every 'mle_sample_ms'.
+        Returns [(seconds, rss_mb), ...].
+        """
+        interval = self.cfg_tester["mle_sample_ms"] / 1000
+        time_limit_s = self.cfg_limits["brute_force_time_s"]
+
+        in_r, in_w = os.pipe()
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        try:
+            pid, reap = self._spawn_child(
+                shlex.split(command),
+                [in_r, devnull, devnull],
+                time_limit_s,
+                self.cfg_limits["brute_force_mem_mb"],
+            )
+        except Exception:
+            os.close(in_w)
+            raise
+        finally:
+            for fd in (in_r, devnull):
+                os.close(fd)
+        self.current_child_pgid = pid
+
+        def feed():
+            try:
+                with open(in_w, "wb") as stdin:
+                    stdin.write(test_case.encode())
+            except OSError:
+                pass  # The child exited (or was killed) without reading it all
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        samples = []
+        started = time.monotonic()
+        deadline = started + time_limit_s + 2
+        exited = False
+        try:
+            while not exited and time.monotonic() < deadline:
+                try:
+                    with open(f"/proc/{pid}/status") as status:
+                        for line in status:
+                            if line.startswith("VmRSS:"):
+                                rss_mb = int(line.split()[1]) / 1024
+                                samples.append((time.monotonic() - started, rss_mb))
+                                break
+                except OSError:
+                    break  # Exited (and reaped by the launcher) meanwhile
+                # Sleeps between samples, but wakes up as soon as it exits
+                exited = not self._wait_for_exit(pid, interval)
+        finally:
+            if not exited:
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            reap(pid)
+            self.current_child_pgid = None
+        feeder.join()
+        return samples
+
+    def _print_rss_timeline(self, samples, rows=20, width=40):
+        """Prints the RSS curve as a bar per time slice (the slice's max)."""
+        limit = self.cfg_limits["problem_mem_mb"]
+        duration = samples[-1][0] or 1e-9
+        scale = max(max(mb for _, mb in samples), limit)
+        slices = [0.0] * rows
+        for seconds, rss_mb in samples:
+            index = min(int(seconds / duration * rows), rows - 1)
+            slices[index] = max(slices[index], rss_mb)
+        for index, rss_mb in enumerate(slices):
+            bar = "#" * round(width * rss_mb / scale)
+            color = RED if rss_mb > limit else GREEN
+            print(f"{(index + 1) * duration / rows:>7.3f}s {rss_mb:>8.1f}MB {color}{bar}{RESET}")
+
+    def _diagnose_memory(self, test_case):
+        """
+        MLE diagnostics for 'test_case': an RSS-over-time curve of
+        solution_a (any command) and, for Python solutions, the top
+        'mle_top' allocation sites by tracemalloc at (near) peak heap.
+        """
+        if self.interactive:
+            print(f"\n{YELLOW}Not diagnosing memory: solution_a needs the interactor.{RESET}")
+            return
+        command = self.cfg_cmd["solution_a"]
+        print(f"\n{CYAN}Sampling solution_a's memory on the failing input...{RESET}")
+        samples = self._sample_rss(command, test_case)
+        if samples:
+            peak_s, peak_mb = max(samples, key=lambda sample: sample[1])
+            print(
+                f"Peak RSS {peak_mb:.1f}MB at {peak_s:.3f}s "
+                f"(limit {self.cfg_limits['problem_mem_mb']}MB, {len(samples)} samples)\n"
+            )
+            self._print_rss_timeline(samples)
+            timeline_file = Path(self.cfg_paths["memory_timeline_file"])
+            with timeline_file.open("w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["time_s", "rss_mb"])
+                writer.writerows((f"{s:.4f}", f"{mb:.2f}") for s, mb in samples)
+            print(f"\nRSS timeline saved to '{timeline_file}'")
+        else:
+            print(f"{YELLOW}solution_a exited before the first sample.{RESET}")
+
+        parts = self._plain_python_command(command)
+        if not parts:
+            return
+        print(f"\n{CYAN}Tracing allocations with tracemalloc...{RESET}")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot_file = Path(tmp_dir) / "peak.snapshot"
+            result = self._run_command(
+                shlex.join([parts[0], "-c", MEMORY_WRAPPER, parts[1], str(snapshot_file)]),
+                test_case,
+                self.cfg_limits["brute_force_time_s"],
+                self.cfg_limits["brute_force_mem_mb"],
+            )
+            if not snapshot_file.exists():
+                print(f"{YELLOW}No allocation snapshot was written ({result['error']}).{RESET}")
+                return
+            snapshot = tracemalloc.Snapshot.load(str(snapshot_file))
+
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, "<string>"),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, threading.__file__),  # The watcher thread
+            ]
+        )
+        stats = snapshot.statistics("lineno")
+        total_mb = sum(stat.size for stat in stats) / 2**20
+        print(f"Traced heap at peak: {total_mb:.1f}MB\n")
+        print(f"{'size (MB)':>10} {'blocks':>10}  line")
+        for stat in stats[: self.cfg_tester["mle_top"]]:
+            frame = stat.traceback[0]
+            source = linecache.getline(frame.filename, frame.lineno).strip()
+            print(
+                f"{stat.size / 2**20:>10.1f} {stat.count:>10}  "
+                f"{Path(frame.filename).name}:{frame.lineno}  {source}"
+            )
+
+    def _run_benchmark_job(self, job):
+        """
+        Pool entry point of the benchmark: generates one input of the
+        given size and runs solution_a on it with the usual limits.
+        """
+        signal.signal(signal.SIGTERM, self._worker_sigterm_handler)
+        size, repeat = job
+        gen_result = self._run_command(
+            self.cfg_cmd["generator"],
+            None,
+            self.cfg_limits["brute_force_time_s"],
+            self.cfg_limits["brute_force_mem_mb"],
+            {BENCHMARK_SIZE_ENV: str(size), SEED_ENV: str(repeat + 1)},
+        )
+        if gen_result["error"]:
+            return size, repeat, "Generator Error", gen_result
+        sol_a_result = self._run_candidate(gen_result["stdout"])
+        verdict = self._judge_candidate(sol_a_result) or "OK"
+        return size, repeat, verdict, sol_a_result
+
+    @staticmethod
+    def _percentile(values, fraction):
+        """Nearest-rank percentile of a non-empty list."""
+        ordered = sorted(values)
+        rank = max(1, math.ceil(fraction * len(ordered)))
+        return ordered[rank - 1]
+
+    @staticmethod
+    def _fit_complexity(points):
+        """
+        Least-squares fit of time = a + c * f(n) for each growth model.
+        Returns [(model, a, c, relative_rms_error), ...], best first.
+        """
+        fits = []
+        for model, f in COMPLEXITY_MODELS.items():
+            xs = [f(n) for n, _ in points]
+            ts = [t for _, t in points]
+            mean_x, mean_t = statistics.fmean(xs), statistics.fmean(ts)
+            var_x = sum((x - mean_x) ** 2 for x in xs)
+            if var_x == 0:
+                a, c = mean_t, 0.0
+            else:
+                c = sum((x - mean_x) * (t - mean_t) for x, t in zip(xs, ts)) / var_x
+                a = mean_t - c * mean_x
+                if a < 0:  # Negative startup cost is unphysical: refit through 0
+                    a = 0.0
+                    c = sum(x * t for x, t in zip(xs, ts)) / sum(x * x for x in xs)
+            if c < 0:
+                continue  # Shrinking with n; not a growth model
+            errors = [
+                ((a + c * x) - t) / max(t, 1e-3) for x, t in zip(xs, ts)
+            ]
+            rms = math.sqrt(statistics.fmean(e * e for e in errors))
+            fits.append((model, a, c, rms))
+        return sorted(fits, key=lambda fit: fit[3])
+
+    def benchmark(self):
+        """
+        Benchmark mode: runs solution_a on a series of input sizes
+        (passed to the generator as STRESS_N), reports median/p95 CPU time
+        and peak RSS per size, fits the growth curve and extrapolates it
+        to the maximum constraint. Uses the global 'pool'.
+        """
+        global pool
+        cfg = self.config.get("benchmark", {})
+        sizes = cfg.get("sizes", [1000, 2000, 5000, 10000, 20000, 50000, 100000, 200000])
+        repeats = cfg.get("repeats", 5)
+        max_n = cfg.get("max_n", max(sizes))
+        report_file = Path(self.script_dir / cfg.get("report_file", "benchmark.json"))
+
+        print(
+            f"Benchmarking solution_a on {len(sizes)} sizes x {repeats} repeats...\n"
+        )
+        jobs = [(size, repeat) for size in sizes for repeat in range(repeats)]
+        samples = {size: [] for size in sizes}
+        failures = {}
+
+        pool = self._make_pool()
+        try:
+            for size, _, verdict, result in pool.imap_unordered(
+                self._run_benchmark_job, jobs
+            ):
+                if verdict == "OK":
+                    samples[size].append(result)
+                    print(f"{GREEN}.{RESET}", end="", flush=True)
+                else:
+                    failures.setdefault(size, verdict)
+                    print(f"{RED}x{RESET}", end="", flush=True)
+            pool.close()
+            pool.join()
+        except KeyboardInterrupt:
+            return  # _main_shutdown_handler shuts the pool down
+        print("\n")
+
+        rows = []
+        print(f"{'n':>10} {'median s':>10} {'p95 s':>10} {'median MB':>10} {'p95 MB':>10}  verdict")
+        for size in sizes:
+            times = [r["time"] for r in samples[size]]
+            mems = [r["mem_mb"] for r in samples[size]]
+            row = {"n": size, "runs": len(times), "verdict": failures.get(size, "OK")}
+            if times:
+                row.update(
+                    median_time_s=statistics.median(times),
+                    p95_time_s=self._percentile(times, 0.95),
+                    median_mem_mb=statistics.median(mems),
+                    p95_mem_mb=self._percentile(mems, 0.95),
+                )
+                color = GREEN if size not in failures else RED
+                print(
+                    f"{size:>10} {row['median_time_s']:>10.3f} {row['p95_time_s']:>10.3f} "
+                    f"{row['median_mem_mb']:>10.1f} {row['p95_mem_mb']:>10.1f}  {color}{row['verdict']}{RESET}"
+                )
+            else:
+                print(f"{size:>10} {'-':>10} {'-':>10} {'-':>10} {'-':>10}  {RED}{row['verdict']}{RESET}")
+            rows.append(row)
+
+        # Fit on sizes that fully passed (TLE'd sizes would flatten the curve)
+        points = [(row["n"], row["median_time_s"]) for row in rows if row["verdict"] == "OK"]
+        report = {"sizes": rows, "fit": None}
+        if len(points) >= 3:
+            fits = self._fit_complexity(points)
+            model, a, c, rms = fits[0]
+            predicted = a + c * COMPLEXITY_MODELS[model](max_n)
+            limit = self.cfg_limits["problem_time_s"]
+            color = GREEN if predicted <= limit else RED
+            print(f"\nBest fit: {CYAN}{model}{RESET} (relative RMS error {rms:.1%})")
+            if len(fits) > 1:
+                print(f"Runner-up: {fits[1][0]} (relative RMS error {fits[1][3]:.1%})")
+            print(
+                f"Predicted time at n = {max_n}: {color}{predicted:.3f}s{RESET} "
+                f"(limit {limit}s)"
+            )
+            report["fit"] = {
+                "model": model,
+                "intercept_s": a,
+                "coefficient": c,
+                "relative_rms_error": rms,
+                "max_n": max_n,
+                "predicted_time_s": predicted,
+                "models": [
+                    {"model": m, "relative_rms_error": e} for m, _, _, e in fits
+                ],
+            }
+        else:
+            print(f"\n{YELLOW}Need at least 3 passing sizes to fit a growth curve.{RESET}")
+
+        if report_file.suffix == ".csv":
+            with report_file.open("w", newline="") as f:
+                writer = csv.DictWriter(
+                    f,
+                    fieldnames=[
+                        "n", "runs", "verdict", "median_time_s", "p95_time_s",
+                        "median_mem_mb", "p95_mem_mb",
+                    ],
+                )
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            report_file.write_text(json.dumps(report, indent=4))
+        print(f"Report saved to '{report_file}'")
+
+    def _hunt_env(self, genome):
+        """Generator environment of a parameter genome."""
+        env = {SEED_ENV: str(genome["seed"])}
+        for name, value in genome["params"].items():
+            env[f"{HUNT_PARAM_ENV_PREFIX}{name}"] = str(value)
+        return env
+
+    def _run_hunt_job(self, genome):
+        """
+        Pool entry point of the worst-case hunter: builds the input of a
+        genome (generator parameters, or an input text) and measures
+        solution_a on it with the usual limits.
+        """
+        signal.signal(signal.SIGTERM, self._worker_sigterm_handler)
+        if isinstance(genome, str):
+            test_case = genome
+        else:
+            gen_result = self._run_command(
+                self.cfg_cmd["generator"],
+                None,
+                self.cfg_limits["brute_force_time_s"],
+                self.cfg_limits["brute_force_mem_mb"],
+                self._hunt_env(genome),
+            )
+            if gen_result["error"]:
+                return genome, "Generator Error", gen_result
+            test_case = gen_result["stdout"]
+            if not self.config["hunt"].get("params"):
+                # Input mode: from now on the input itself is mutated
+                genome = test_case
+        sol_a_result = self._run_candidate(test_case)
+        verdict = self._judge_candidate(sol_a_result) or "OK"
+        return genome, verdict, sol_a_result
+
+    def _hunt_fitness(self, verdict, result):
+        """Sort key of a measured genome: limit-breaking verdicts first."""
+        if verdict in ("Generator Error", "Tester RE"):
+            return (-1, 0.0)
+        if verdict.startswith("TLE") or verdict.startswith("MLE"):
+            return (1, result["time"] if verdict.startswith("TLE") else result["mem_mb"])
+        key = "mem_mb" if self.config["hunt"].get("objective") == "memory" else "time"
+        return (0, result[key])
+
+    @staticmethod
+    def _mutate_params(genome, space, rng):
+        """
+        A new seed, and/or one parameter rescaled: pushed to a bound,
+        redrawn log-uniformly over its range, or scaled by up to 8x.
+        """
+        params = dict(genome["params"])
+        seed = genome["seed"]
+        if not space or rng.random() < 0.5:
+            seed = rng.randrange(1, 2**31)
+        if space and (seed == genome["seed"] or rng.random() < 0.5):
+            name = rng.choice(sorted(space))
+            lo, hi = space[name]
+            roll = rng.random()
+            if roll < 0.1:
+                value = hi
+            elif roll < 0.15:
+                value = lo
+            elif roll < 0.35:
+                value = round(math.exp(rng.uniform(math.log(max(lo, 1)), math.log(max(hi, 1)))))
+            else:
+                value = round(max(params[name], 1) * 2 ** rng.uniform(-3, 3))
+            params[name] = min(max(value, lo), hi)
+        return {"seed": seed, "params": params}
+
+    @staticmethod
+    def _mutate_input(test_case, rng):
+        """
+        Mutates an input's numbers in place (structure is kept): copies
+        another number, nudges one, or sets it to the largest/smallest
+        number present. The first line (usually sizes) is left alone.
+        """
+        rows = [line.split() for line in test_case.split("\n")]
+        first = 1 if len(rows) > 1 else 0
+        spots = [
+            (r, c)
+            for r in range(first, len(rows))
+            for c, token in enumerate(rows[r])
+            if token.lstrip("-").isdigit()
+        ]
+        if not spots:
+            return test_case
+        values = [int(rows[r][c]) for r, c in spots]
+        for _ in range(1 + int(rng.expovariate(1.0))):
+            r, c = rng.choice(spots)
+            roll = rng.random()
+            if roll < 0.3:
+                value = rng.choice(values)
+            elif roll < 0.5:
+                value = max(values)
+            elif roll < 0.6:
+                value = min(values)
+            else:
+                value = int(rows[r][c]) + rng.choice((-1, 1))
+            rows[r][c] = str(value)
+        return "\n".join(" ".join(row) for row in rows)
+
+    def hunt(self):
+        """
+        Worst-case hunter: an evolutionary search for the input that makes
+        solution_a slowest (or hungriest, with objective "memory").
+        Genomes are generator parameters from the "hunt" section (passed
+        as STRESS_<NAME> plus a seed) or, without parameters, generated
+        inputs whose numbers get mutated. Each generation keeps the best
+        half and refills the population with mutants of it; the winner is
+        re-measured serially and saved. Uses the global 'pool'.
+        """
+        global pool
+        cfg = self.config.setdefault("hunt", {})
+        space = cfg.get("params", {})
+        population_size = max(2, cfg.get("population", 2 * self.num_workers))
+        generations = cfg.get("generations", 30)
+        deadline = time.monotonic() + cfg.get("time_budget_s", 120)
+        report_file = Path(self.script_dir / cfg.get("report_file", "worst_case.txt"))
+        objective = "memory" if cfg.get("objective") == "memory" else "time"
+        rng = random.Random(self.first_test)
+
+        for name, bounds in space.items():
+            if len(bounds) != 2 or bounds[0] > bounds[1]:
+                raise KeyError(
+                    f"Config Error: hunt param '{name}' must be [min, max], got {bounds}."
+                )
+
+        print(
+            f"Hunting for the worst-case {objective} of solution_a "
+            f"({population_size} per generation, {generations} generations)..."
+        )
+        if space:
+            print(f"Search space: {CYAN}{space}{RESET}\n")
+            population = [
+                {
+                    "seed": rng.randrange(1, 2**31),
+                    "params": {name: rng.randint(lo, hi) for name, (lo, hi) in space.items()},
+                }
+                for _ in range(population_size)
+            ]
+        else:
+            print(f"Search space: {CYAN}numbers of generated inputs{RESET}\n")
+            population = [
+                {"seed": self.first_test + i, "params": {}} for i in range(population_size)
+            ]
+
+        limit = self.cfg_limits["problem_time_s"]
+        mem_limit = self.cfg_limits["problem_mem_mb"]
+        measured = []  # (fitness, genome, verdict, result) of the current elite
+        pool = self._make_pool()
         try:
-            process = subprocess.Popen(
-                command_parts,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                preexec_fn=preexec_tasks,
+            for generation in range(1, generations + 1):
+                results = pool.map(self._run_hunt_job, population)
+                measured += [
+                    (self._hunt_fitness(verdict, result), genome, verdict, result)
+                    for genome, verdict, result in results
+                ]
+                measured.sort(key=lambda entry: entry[0], reverse=True)
+                measured = measured[: max(1, population_size // 2)]
+
+                fitness, genome, verdict, result = measured[0]
+                color = RED if fitness[0] == 1 else (YELLOW if result["time"] > 0.8 * limit else GREEN)
+                where = genome["params"] if isinstance(genome, dict) else f"{len(genome)} bytes"
+                print(
+                    f"Generation {generation:>3}: worst {color}{result['time']:.3f}s "
+                    f"({result['time'] / limit:.0%} of limit), {result['mem_mb']:.1f}MB{RESET} "
+                    f"[{verdict}] {where}"
+                )
+                if fitness[0] == 1 or time.monotonic() >= deadline:
+                    break
+
+                # Refill the population with mutants of the elite
+                population = []
+                while len(population) < population_size:
+                    parent = rng.choice(measured)[1]
+                    if isinstance(parent, str):
+                        population.append(self._mutate_input(parent, rng))
+                    else:
+                        population.append(self._mutate_params(parent, space, rng))
+            pool.close()
+            pool.join()
+        except KeyboardInterrupt:
+            return  # _main_shutdown_handler shuts the pool down
+
+        # --- Report the worst case, re-measured serially ---
+        _, genome, verdict, result = measured[0]
+        if isinstance(genome, str):
+            test_case = genome
+        else:
+            test_case = self._run_command(
+                self.cfg_cmd["generator"],
+                None,
+                self.cfg_limits["brute_force_time_s"],
+                self.cfg_limits["brute_force_mem_mb"],
+                self._hunt_env(genome),
+            )["stdout"]
+        runs = [self._run_candidate(test_case) for _ in range(self.cfg_tester["near_limit_reruns"])]
+        median_time = statistics.median(r["time"] for r in runs)
+        peak_mem = max(r["mem_mb"] for r in runs)
+        report_file.write_text(test_case)
+
+        color = RED if median_time > limit else (YELLOW if median_time > 0.8 * limit else GREEN)
+        print(f"\n{CYAN}--- WORST CASE ({verdict} on first run) ---{RESET}")
+        print(
+            f"Median CPU time over {len(runs)} runs: {color}{median_time:.3f}s{RESET} "
+            f"= {median_time / limit:.0%} of the {limit}s limit"
+        )
+        print(f"Peak RSS: {peak_mem:.1f}MB = {peak_mem / mem_limit:.0%} of the {mem_limit}MB limit")
+        if isinstance(genome, dict):
+            env = " ".join(f"{k}={v}" for k, v in self._hunt_env(genome).items())
+            print(f"Reproduce with: {env} {self.cfg_cmd['generator']}")
+        print(f"Worst input ({len(test_case)} bytes) saved to '{report_file}'")
+
+    def _shard_status_path(self):
+        first = self.cfg_tester["first_seed"]  # Not moved by --resume
+        return Path(self.cfg_tester["shard_dir"]) / f"shard-{first}-{self.last_test}.json"
+
+    def _shard_tick(self, status, tests_run, failure=None, force=False):
+        """
+        Publishes this shard's progress to its status file (at most once a
+        second unless forced) and returns True if the coordinator asked
+        all shards to stop. No-op outside shard mode.
+        """
+        if not self.cfg_tester["shard_dir"]:
+            return False
+        now = time.monotonic()
+        if force or now - self._shard_last_write >= 1.0:
+            self._shard_last_write = now
+            path = self._shard_status_path()
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {
+                        "first": self.cfg_tester["first_seed"],
+                        "last": self.last_test,
+                        "status": status,
+                        "tests_run": tests_run,
+                        "failure": failure,
+                    }
+                )
             )
+            os.replace(tmp_path, path)
+        return (Path(self.cfg_tester["shard_dir"]) / "STOP").exists()
 
-            # Record the Process Group ID (which is the same as the child's PID)
-            self.current_child_pgid = process.pid
+    def coordinate(self, shards, launch=True, resume=False):
+        """
+        Local coordinator: splits the seed range into shards, launches one
+        tester per shard (unless only watching shards started elsewhere on
+        a shared 'shard_dir'), merges their progress, and stops every
+        shard as soon as one of them fails.
+        """
+        shard_dir = Path(self.cfg_tester["shard_dir"] or self.script_dir / "shards")
+        shard_dir.mkdir(parents=True, exist_ok=True)
 
-            # Wall clock timeout (safety net)
-            wall_timeout = time_limit_s + 2
-            try:
-                stdout_data, stderr_data = process.communicate(
-                    input=input_data, timeout=wall_timeout
+        processes = []
+        if launch:
+            # Only a launching coordinator owns the shard files; a watcher
+            # must not delete the status of shards still running
+            for old in shard_dir.glob("shard-*.json"):
+                old.unlink()
+            (shard_dir / "STOP").unlink(missing_ok=True)
+            total = self.last_test - self.first_test + 1
+            cores = max(1, self.num_workers // shards)
+            bounds = [self.first_test + total * i // shards for i in range(shards + 1)]
+            print(f"Launching {shards} shards with {cores} cores each (logs in '{shard_dir}'):")
+            for start, end in zip(bounds, bounds[1:]):
+                if start == end:
+                    continue
+                log = open(shard_dir / f"shard-{start}-{end - 1}.log", "w")
+                command = [
+                    sys.executable,
+                    str(Path(__file__).resolve()),
+                    "stress",
+                    "--seed-range",
+                    f"{start}:{end}",
+                    "--shard-dir",
+                    str(shard_dir),
+                    "--num-cores",
+                    str(cores),
+                ] + (["--resume"] if resume else [])
+                processes.append(
+                    subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
                 )
-            finally:
-                # Ensure we clear the pgid once the process is done
-                self.current_child_pgid = None
+                log.close()
+                print(f"  seeds {start}..{end - 1}")
+            shards = len(processes)
+        else:
+            print(f"Watching for {shards} shards in '{shard_dir}'...")
 
-            cpu_time, peak_mem_mb = 0, 0
-            if self.can_measure:
-                # Check if 'time' output is present before parsing
-                if ("User time" in stderr_data) or (
-                    "Maximum resident set size" in stderr_data
-                ):
-                    cpu_time, peak_mem_mb = self._parse_time_output(stderr_data)
-                else:
-                    # 'time -v' didn't output what we expected
-                    pass  # cpu_time and peak_mem_mb remain 0
+        failure = None
+        while True:
+            statuses = []
+            for path in shard_dir.glob("shard-*.json"):
+                try:
+                    statuses.append(json.loads(path.read_text()))
+                except (OSError, json.JSONDecodeError):
+                    continue  # Being replaced right now
+            tests_run = sum(st["tests_run"] for st in statuses)
+            finished = [st for st in statuses if st["status"] != "running"]
+            failed = [st for st in statuses if st["status"] == "failed"]
+            print(
+                f"\r\033[K{len(statuses) - len(finished)} shards running, "
+                f"{len(finished)}/{shards} finished, {tests_run} tests",
+                end="",
+                flush=True,
+            )
 
-            # Check if OS killed the process (e.g., TLE)
-            if process.returncode != 0:
-                error_type = "RE"  # Default
-                if "MemoryError" in stderr_data:
-                    error_type = "MLE (from Python)"
-                elif "Command terminated by signal" in stderr_data:
-                    if "CPU time limit exceeded" in stderr_data:
-                        error_type = "TLE (OS)"
-                    elif "Segmentation fault" in stderr_data:
-                        error_type = "RE (Segfault)"
-                    else:
-                        # This is our safety net AS limit (e.g. 2GB)
-                        error_type = "MLE (Safety Net)"
-                return {
-                    "stdout": stdout_data.strip(),
-                    "stderr": stderr_data.strip(),
-                    "time": cpu_time,
-                    "mem_mb": peak_mem_mb,
-                    "error": error_type,
-                }
+            if failed and failure is None:
+                failure = failed[0]
+                (shard_dir / "STOP").touch()
+            if len(finished) >= shards or (
+                processes and all(p.poll() is not None for p in processes)
+            ):
+                break
+            time.sleep(0.5)
 
-            # Process finished successfully
-            return {
-                "stdout": stdout_data.strip(),
-                "stderr": stderr_data.strip(),
-                "time": cpu_time,
-                "mem_mb": peak_mem_mb,
-                "error": None,
-            }
+        for process in processes:
+            process.wait()
 
-        except subprocess.TimeoutExpired:
-            process.kill()  # Kill the '/usr/bin/time' process
-            return {
-                "stdout": "",
-                "stderr": "",
-                "time": wall_timeout,
-                "mem_mb": 0,
-                "error": "TLE (Wall)",
-            }
-        except Exception as e:
-            return {
-                "stdout": "",
-                "stderr": f"Tester RE: {e}",
-                "time": 0,
-                "mem_mb": 0,
-                "error": "Tester RE",
-            }
+        if failure:
+            details = failure["failure"]
+            log_path = shard_dir / f"shard-{failure['first']}-{failure['last']}.log"
+            print(
+                f"\n\n{RED}--- FAILURE in shard {failure['first']}..{failure['last']} "
+                f"on seed {details['test']}: {details['verdict']} ---{RESET}"
+            )
+            print(f"Reproduce with: {details['reproduce']}")
+            print(f"Shard log: '{log_path}'")
+        elif len(finished) >= shards:
+            print(f"\n\n{GREEN}All {shards} shards passed ({tests_run} tests)!{RESET}")
+        else:
+            print(f"\n\n{YELLOW}Some shards exited without a final status; see their logs.{RESET}")
+
+    def _watched_files(self):
+        """Scripts of all commands and candidates, plus "build" sources."""
+        commands = list(self.cfg_cmd.values())
+        commands += [command for _, command in self.candidates or []]
+        build_dir = Path(self.cfg_paths["build_cache_dir"])
+        files = set()
+        for command in commands:
+            script = Path(shlex.split(command)[-1])
+            if script.is_file() and script.parent != build_dir:
+                files.add(script)
+        for build in self.config.get("build", {}).values():
+            files.add(self.script_dir / build["source"])
+        return files
 
-    def _run_single_test(self, test_index):
+    def _refresh_commands(self):
+        """After an edit: rebuilds "build" entries and re-keys the brute cache."""
+        if self.config.get("build"):
+            self._build_commands(self.config["build"])
+        if self.brute_fingerprint:
+            self.brute_fingerprint = self._fingerprint_command(self.cfg_cmd["solution_b"])
+
+    def _watch_tasks(self, epoch, tasks, slots):
         """
-        The "worker" function that runs and judges a single test case.
-        This runs in a separate process from the pool.
+        Tags tasks with the watch epoch. 'slots' bounds how many are
+        queued ahead, so a cancelled run leaves little to skip.
         """
-        # Set the worker's own SIGTERM handler
-        signal.signal(signal.SIGTERM, self._worker_sigterm_handler)
+        for task in tasks:
+            while not slots.acquire(timeout=0.1):
+                if watch_epoch.value != epoch or tasks_stop.is_set():
+                    return
+            if watch_epoch.value != epoch:
+                return
+            yield (epoch,) + task
 
-        # --- Define Limits ---
-        problem_time_s = self.cfg_limits["problem_time_s"]
-        problem_mem_mb = self.cfg_limits["problem_mem_mb"]
-        safety_time_s = self.cfg_limits["brute_force_time_s"]
-        safety_mem_mb = self.cfg_limits["brute_force_mem_mb"]
+    def _run_watch_task(self, task):
+        """
+        Pool entry point of watch mode: skips tasks of a cancelled run,
+        and publishes the running child's process group in the worker's
+        'watch_pgids' slot so a cancel can kill it mid-test.
+        """
+        global _watch_slot, _watch_task_epoch
+        epoch, test_index, gen_result = task
+        if watch_epoch.value != epoch:
+            return (test_index, "Cancelled", "", {}, {}, {})
+        if _watch_slot is None:
+            with watch_pgids.get_lock():
+                free = [i for i, pgid in enumerate(watch_pgids) if pgid == 0]
+                if free:
+                    _watch_slot = free[0]
+                    watch_pgids[_watch_slot] = -1
+        _watch_task_epoch = epoch
+        try:
+            result = self._run_single_test(test_index, gen_result)
+        finally:
+            _watch_task_epoch = None
+        if watch_epoch.value != epoch:
+            return (test_index, "Cancelled", "", {}, {}, {})
+        return result
 
-        # --- 1. Run Generator (with safety limits) ---
-        gen_result = self._run_command(
-            self.cfg_cmd["generator"], None, safety_time_s, safety_mem_mb
-        )
-        if gen_result["error"]:
-            return (
-                test_index,
-                "Generator Error",
-                "N/A",
-                gen_result,
-                gen_result,
-                gen_result,
+    def _kill_watch_children(self):
+        """Kills the children the workers are running (after an epoch bump)."""
+        with watch_pgids.get_lock():
+            for pgid in watch_pgids:
+                if pgid > 0:
+                    try:
+                        os.killpg(pgid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+
+    def watch(self):
+        """
+        Watch mode: runs the stress test, then waits for an edit to any
+        command's script (or "build" source) and runs again on the same
+        pool, so workers, warm programs and caches are reused. An edit
+        mid-run cancels the run: queued tests are skipped and the children
+        of in-flight ones are killed. Every run replays the last failing input
+        (and the corpus) first. Uses the global 'pool'.
+        """
+        global pool, tasks_stop, watch_epoch, watch_pgids
+        watcher = FileWatcher(self._watched_files())
+        method = "inotify" if watcher.fd is not None else "polling"
+        print(f"Watching {len(watcher.paths)} files ({method}). Press Ctrl+C to stop.")
+
+        if self.brute_fingerprint:
+            self._evict_brute_cache()
+        watch_epoch = multiprocessing.Value("i", 0)
+        # Room for workers the pool replaces
+        watch_pgids = multiprocessing.Array("i", 2 * self.num_workers)
+        tasks_stop = threading.Event()
+        pool = self._make_pool()
+        last_failure = None
+        try:
+            for run_number in itertools.count(1):
+                with watch_epoch.get_lock():
+                    watch_epoch.value += 1
+                    epoch = watch_epoch.value
+                print(
+                    f"\n{CYAN}--- Run {run_number} ({time.strftime('%H:%M:%S')}) ---{RESET}"
+                )
+                tasks = self._corpus_tasks()
+                if last_failure is not None and all(
+                    gen_result["stdout"] != last_failure for _, gen_result in tasks
+                ):
+                    tasks.insert(
+                        0,
+                        (
+                            0,
+                            {
+                                "stdout": last_failure,
+                                "stderr": "",
+                                "time": 0,
+                                "mem_mb": 0,
+                                "error": None,
+                                "measured": False,
+                                "replay": True,
+                            },
+                        ),
+                    )
+                seeds = ((i, None) for i in range(self.first_test, self.last_test + 1))
+                slots = threading.Semaphore(2 * self.num_workers)
+                results = pool.imap_unordered(
+                    self._run_watch_task,
+                    self._watch_tasks(epoch, itertools.chain(tasks, seeds), slots),
+                )
+
+                tests_run, failure, changed = 0, None, []
+                while not changed:
+                    try:
+                        result = results.next(timeout=0.2)
+                    except multiprocessing.TimeoutError:
+                        changed = watcher.changed()
+                        continue
+                    except StopIteration:
+                        break
+                    slots.release()
+                    changed = watcher.changed()
+                    if result[1] in ("Cancelled", "Duplicate"):
+                        continue
+                    tests_run += 1
+                    if result[1] != "OK":
+                        failure = result
+                        break
+                    print(f"{GREEN}.{RESET}", end="", flush=True)
+                    if tests_run % 80 == 0:  # Newline every 80 tests
+                        print()
+
+                # Cancel whatever is still queued or running
+                with watch_epoch.get_lock():
+                    watch_epoch.value += 1
+                self._kill_watch_children()
+
+                if failure:
+                    test_index, verdict, test_case, sol_a, sol_b, gen_result = failure
+                    last_failure = test_case
+                    print(
+                        f"\n\n{RED}--- FAILURE on {self._describe_case(test_index, gen_result)}: "
+                        f"{verdict} ---{RESET}"
+                    )
+                    print(f"(Time: {sol_a['time']:.3f}s, Mem: {self._format_mem(sol_a)})\n")
+                    failing_file = Path(self.cfg_paths["failing_input_file"])
+                    failing_file.write_text(test_case)
+                    print(f"Failing test case saved to '{failing_file}'")
+                    if self.cfg_paths["corpus_dir"] and verdict not in UNMINIMIZABLE_VERDICTS:
+                        self._save_to_corpus(test_case, verdict, gen_result)
+                    print()
+                    self._print_failure_details(verdict, test_case, sol_a, sol_b, gen_result)
+                elif not changed:
+                    print(f"\n\n{GREEN}Passed all {tests_run} tests!{RESET}")
+                    last_failure = None
+
+                while True:
+                    if not changed:
+                        print(f"\n{CYAN}Waiting for changes...{RESET}")
+                        while not changed:
+                            changed = watcher.changed(timeout=1.0)
+                    names = ", ".join(path.name for path in changed)
+                    print(f"\n{YELLOW}Changed: {names}{RESET}")
+                    changed = []
+                    try:
+                        self._refresh_commands()
+                        break
+                    except RuntimeError as e:
+                        print(f"{RED}{e}{RESET}")
+        except KeyboardInterrupt:
+            pass  # _main_shutdown_handler shuts the pool down
+        finally:
+            watcher.close()
+            # Also ends the task feeder, and kills children the workers'
+            # SIGTERM handlers may not get to
+            with watch_epoch.get_lock():
+                watch_epoch.value += 1
+            self._kill_watch_children()
+
+    def _checkpoint_key(self):
+        """Hashes everything a checkpoint is only valid for."""
+        key = {
+            "commands": {
+                name: self._fingerprint_command(command) for name, command in self.cfg_cmd.items()
+            },
+            "limits": self.cfg_limits,
+            "seeds": [self.cfg_tester["first_seed"], self.last_test],
+            "tester": {
+                name: self.cfg_tester[name]
+                for name in ("checker", "generator_batch_size", "large_input", "interactive")
+            },
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+    def _load_checkpoint(self):
+        """The checkpoint of an interrupted run of this config, or None."""
+        if not self.cfg_paths["checkpoint_file"]:
+            raise KeyError("Config Error: --resume needs 'paths.checkpoint_file'.")
+        path = Path(self.cfg_paths["checkpoint_file"])
+        try:
+            checkpoint = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            print(f"{YELLOW}No checkpoint at '{path}'; starting from the first seed.{RESET}")
+            return None
+        if checkpoint["key"] != self._checkpoint_key():
+            print(
+                f"{YELLOW}The checkpoint is for other scripts or settings; "
+                f"starting from the first seed.{RESET}"
             )
-        test_case = gen_result["stdout"]
+            return None
+        return checkpoint
 
-        # --- 2. Run Solution A (with *hybrid* limits) ---
-        sol_a_result = self._run_command(
-            self.cfg_cmd["solution_a"],
-            test_case,
-            problem_time_s,  # Use REAL time limit (for OS TLE)
-            safety_mem_mb,  # Use HIGH memory limit (to *measure* RSS)
+    def _write_checkpoint(self, next_seed, tests_run, telemetry, resumed_from):
+        """Atomically saves progress: every seed below 'next_seed' is done."""
+        path = Path(self.cfg_paths["checkpoint_file"])
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "key": self._checkpoint_key(),
+                    "next_seed": next_seed,
+                    "tests_run": tests_run,
+                    "elapsed_s": (resumed_from["elapsed_s"] if resumed_from else 0)
+                    + time.monotonic()
+                    - telemetry.started,
+                    "slowest": telemetry.slowest,
+                    "max_rss": telemetry.max_rss,
+                    "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+            )
         )
+        os.replace(tmp_path, path)
+        self._checkpoint_last_write = time.monotonic()
 
-        # --- 3. Run Solution B (with safety limits) ---
-        sol_b_result = self._run_command(
-            self.cfg_cmd["solution_b"], test_case, safety_time_s, safety_mem_mb
+    @staticmethod
+    def _script_sha256(command):
+        """Hashes the script of a command (the command itself if not a file)."""
+        try:
+            return hashlib.sha256(Path(shlex.split(command)[-1]).read_bytes()).hexdigest()
+        except OSError:
+            return hashlib.sha256(command.encode()).hexdigest()
+
+    def _open_history(self):
+        """Starts this run's record in the history database."""
+        return RunHistory(
+            self.cfg_paths["history_db"],
+            {
+                "host": os.uname().nodename,
+                "outcome": "running",
+                "solution_a": self.cfg_cmd["solution_a"],
+                "solution_a_sha256": self._script_sha256(self.cfg_cmd["solution_a"]),
+                "solution_b_sha256": self._script_sha256(self.cfg_cmd["solution_b"])
+                if "solution_b" in self.cfg_cmd
+                else None,
+                "generator_sha256": self._script_sha256(self.cfg_cmd["generator"]),
+                "problem_time_s": self.cfg_limits["problem_time_s"],
+                "problem_mem_mb": self.cfg_limits["problem_mem_mb"],
+                "first_seed": self.first_test,
+                "max_tests": self.cfg_tester["max_tests"],
+            },
         )
 
-        # --- 4. Judge the Results ---
+    @staticmethod
+    def _wilcoxon_p(differences):
+        """
+        Two-sided p-value of the Wilcoxon signed-rank test (normal
+        approximation, average ranks for ties; zero differences dropped).
+        """
+        differences = [d for d in differences if d != 0]
+        n = len(differences)
+        if n == 0:
+            return 1.0
+        ordered = sorted(range(n), key=lambda i: abs(differences[i]))
+        ranks = [0.0] * n
+        start = 0
+        while start < n:
+            end = start
+            while end + 1 < n and abs(differences[ordered[end + 1]]) == abs(
+                differences[ordered[start]]
+            ):
+                end += 1
+            for position in range(start, end + 1):
+                ranks[ordered[position]] = (start + end) / 2 + 1
+            start = end + 1
+        w_plus = sum(rank for rank, d in zip(ranks, differences) if d > 0)
+        mean = n * (n + 1) / 4
+        sd = math.sqrt(n * (n + 1) * (2 * n + 1) / 24)
+        return math.erfc(abs(w_plus - mean) / sd / math.sqrt(2))
 
-        # 4a. Check Brute Force
-        if sol_b_result["error"]:
-            return (
-                test_index,
-                "Brute Force Error",
-                test_case,
-                sol_a_result,
-                sol_b_result,
-                gen_result,
+    def _find_history_run(self, db, ref):
+        """A run row by id, or the latest run of a solution_a hash prefix."""
+        if ref.isdigit():
+            row = db.execute("SELECT * FROM runs WHERE id = ?", (int(ref),)).fetchone()
+        else:
+            row = db.execute(
+                "SELECT * FROM runs WHERE solution_a_sha256 LIKE ? ORDER BY id DESC",
+                (ref + "%",),
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Config Error: no run '{ref}' in the history database.")
+        return row
+
+    def compare(self, base=None, new=None, alpha=0.01, min_slowdown=0.05):
+        """
+        Compares two recorded runs of solution_a on the inputs they have
+        in common (same input hash): shift of the CPU time and RSS
+        distributions, verdict changes, and the slowest-down inputs.
+        A slowdown is flagged when the paired Wilcoxon test gives
+        p < 'alpha' and the median time grew by over 'min_slowdown'.
+        By default 'new' is the latest run and 'base' the latest earlier
+        run of a different solution_a version.
+        """
+        if not self.cfg_paths["history_db"] or not Path(self.cfg_paths["history_db"]).exists():
+            raise KeyError("Config Error: 'paths.history_db' has no recorded runs yet.")
+        db = sqlite3.connect(self.cfg_paths["history_db"])
+        db.row_factory = sqlite3.Row
+        try:
+            if new:
+                new_run = self._find_history_run(db, new)
+            else:
+                new_run = db.execute("SELECT * FROM runs ORDER BY id DESC").fetchone()
+                if new_run is None:
+                    raise KeyError("Config Error: the history database has no runs.")
+            if base:
+                base_run = self._find_history_run(db, base)
+            else:
+                base_run = db.execute(
+                    "SELECT * FROM runs WHERE id < ? AND solution_a_sha256 != ? "
+                    "ORDER BY id DESC",
+                    (new_run["id"], new_run["solution_a_sha256"]),
+                ).fetchone()
+                if base_run is None:
+                    raise KeyError(
+                        "Config Error: no earlier run of another solution_a version to compare with."
+                    )
+
+            pairs = db.execute(
+                "SELECT b.input_sha256, b.seed, b.verdict, b.time_s, b.mem_mb, "
+                "n.verdict, n.time_s, n.mem_mb "
+                "FROM tests b JOIN tests n ON n.input_sha256 = b.input_sha256 "
+                "WHERE b.run_id = ? AND n.run_id = ? GROUP BY b.input_sha256",
+                (base_run["id"], new_run["id"]),
+            ).fetchall()
+        finally:
+            db.close()
+
+        for label, run in (("Base", base_run), ("New", new_run)):
+            print(
+                f"{label}: run #{run['id']} ({run['started']}, {run['host']}) "
+                f"solution_a {run['solution_a_sha256'][:12]}, {run['tests_run']} tests, {run['outcome']}"
             )
+        if base_run["host"] != new_run["host"]:
+            print(f"{YELLOW}Warning: the runs were recorded on different hosts.{RESET}")
+        if base_run["problem_time_s"] != new_run["problem_time_s"]:
+            print(f"{YELLOW}Warning: the runs used different time limits.{RESET}")
+        if not pairs:
+            print(f"\n{YELLOW}The runs have no inputs in common.{RESET}")
+            return
+        print(f"\n{len(pairs)} common inputs\n")
 
-        # 4b. Check Solution A's OS-level errors (TLE, RE, Segfault)
-        if sol_a_result["error"]:
-            return (
-                test_index,
-                sol_a_result["error"],
-                test_case,
-                sol_a_result,
-                sol_b_result,
-                gen_result,
+        timed = [pair for pair in pairs if pair[3] is not None and pair[6] is not None]
+        slowdown = False
+        print(f"{'':8} {'base p50':>10} {'new p50':>10} {'base p90':>10} {'new p90':>10} {'change':>8} {'p-value':>9}")
+        for label, base_col, new_col, unit in (("CPU time", 3, 6, "s"), ("RSS", 4, 7, "MB")):
+            base_values = [pair[base_col] for pair in timed]
+            new_values = [pair[new_col] for pair in timed]
+            if not base_values:
+                continue
+            base_median = statistics.median(base_values)
+            new_median = statistics.median(new_values)
+            change = new_median / base_median - 1 if base_median else 0.0
+            p_value = self._wilcoxon_p([n - b for b, n in zip(base_values, new_values)])
+            significant = p_value < alpha and change > min_slowdown
+            color = RED if significant else GREEN if p_value < alpha and change < 0 else ""
+            print(
+                f"{color}{label:8} {base_median:>9.3f}{unit} {new_median:>9.3f}{unit} "
+                f"{self._percentile(base_values, 0.9):>9.3f}{unit} "
+                f"{self._percentile(new_values, 0.9):>9.3f}{unit} "
+                f"{change:>+8.1%} {p_value:>9.2g}{RESET if color else ''}"
             )
+            slowdown = slowdown or (label == "CPU time" and significant)
 
-        # 4c. Check Measured Memory (MLE)
-        if self.can_measure:
-            # We *can* measure. Check if parsing failed (mem_mb is 0).
-            # We check if mem_mb is 0 AND 'Maximum resident set size' is NOT in stderr,
-            # which means parsing failed. A real 0MB program is fine.
-            if (
-                sol_a_result["mem_mb"] == 0.0
-                and "Maximum resident set size" not in sol_a_result["stderr"]
-            ):
-                # This means parsing failed!
-                return (
-                    test_index,
-                    "Measure Error",
-                    test_case,
-                    sol_a_result,
-                    sol_b_result,
-                    gen_result,
-                )
+        changed = [pair for pair in pairs if pair[2] != pair[5]]
+        if changed:
+            print(f"\n{YELLOW}{len(changed)} inputs changed verdict{RESET}, e.g.:")
+            for pair in changed[:5]:
+                print(f"  seed {pair[1]}: {pair[2]} -> {pair[5]}")
 
-            # Parsing succeeded. Now, check the actual limit.
-            if sol_a_result["mem_mb"] > problem_mem_mb:
-                return (
-                    test_index,
-                    "MLE (Measured)",
-                    test_case,
-                    sol_a_result,
-                    sol_b_result,
-                    gen_result,
-                )
+        worst = sorted(
+            (pair for pair in timed if pair[3] > 0), key=lambda pair: pair[6] / pair[3], reverse=True
+        )[:5]
+        if worst:
+            print("\nLargest slowdowns:")
+            for pair in worst:
+                print(f"  seed {pair[1]}: {pair[3]:.3f}s -> {pair[6]:.3f}s ({pair[6] / pair[3]:.2f}x)")
 
+        if slowdown:
+            print(f"\n{RED}Significant slowdown of solution_a (p < {alpha}).{RESET}")
         else:
-            # We *cannot* measure (e.g., /usr/bin/time missing).
-            # We cannot give an "OK" verdict.
-            return (
-                test_index,
-                "Measure Error",
-                test_case,
-                sol_a_result,
-                sol_b_result,
-                gen_result,
+            print(f"\n{GREEN}No significant slowdown.{RESET}")
+
+    def _start_deduplicator(self):
+        """Starts the manager process holding the shared seen-set."""
+        global deduplicator
+        manager = DedupManager()
+        # Ctrl+C is handled by the main process, which shuts this down
+        manager.start(signal.signal, (signal.SIGINT, signal.SIG_IGN))
+        deduplicator = manager.CaseDeduplicator(
+            self.cfg_tester["dedup_exact_limit"], self.cfg_tester["dedup_bloom_mb"]
+        )
+        return manager
+
+    def _report_duplicates(self):
+        """Prints the unique-case count and duplicate ratio."""
+        stats = deduplicator.stats()
+        total = stats["unique"] + stats["duplicates"]
+        if not total:
+            return
+        ratio = stats["duplicates"] / total
+        color = YELLOW if ratio >= 0.9 else CYAN
+        print(
+            f"Unique cases: {CYAN}{stats['unique']}{RESET}, duplicates skipped: "
+            f"{color}{stats['duplicates']} ({ratio:.1%}){RESET}"
+            f"{' [Bloom filter]' if stats['bloom'] else ''}"
+        )
+        if ratio >= 0.9:
+            print(
+                f"{YELLOW}The generator mostly repeats itself; its search space is likely exhausted.{RESET}"
             )
 
-        # 4d. Check for Wrong Answer (Only if TLE/RE/MLE all passed)
-        if sol_a_result["stdout"] != sol_b_result["stdout"]:
-            return (
-                test_index,
-                "Wrong Answer",
-                test_case,
-                sol_a_result,
-                sol_b_result,
-                gen_result,
+    def run(self, resume=False):
+        """
+        Main entry point. Uses the global 'pool'. With 'resume', continues
+        from the checkpoint of an interrupted run of the same config.
+        """
+        global pool, tasks_stop, deduplicator
+        if self.candidates:
+            return self.tournament()
+        checkpoint = self._load_checkpoint() if resume else None
+        if checkpoint:
+            self.first_test = checkpoint["next_seed"]
+            print(
+                f"Resuming from seed {self.first_test}: {checkpoint['tests_run']} tests "
+                f"done in {time.strftime('%H:%M:%S', time.gmtime(checkpoint['elapsed_s']))} "
+                f"(checkpoint of {checkpoint['updated']})."
             )
+        print(
+            f"Starting {self.last_test - self.first_test + 1} tests "
+            f"(seeds {self.first_test}..{self.last_test})...\n"
+        )
 
-        # 5. If all passed, it's OK
-        return (test_index, "OK", test_case, sol_a_result, sol_b_result, gen_result)
+        if self.brute_fingerprint:
+            self._evict_brute_cache()
 
-    def run(self):
-        """Main entry point. Uses the global 'pool'."""
-        global pool
-        print(f"Starting {self.cfg_tester['max_tests']} tests...\n")
+        dedup_manager = None
+        if self.cfg_tester["dedup"]:
+            dedup_manager = self._start_deduplicator()
 
-        pool = multiprocessing.Pool(processes=self.num_workers)
-        test_indices = range(1, self.cfg_tester["max_tests"] + 1)
-        tests_run = 0
+        # Past failures are replayed before any random test
+        corpus_tasks = self._corpus_tasks()
+        if corpus_tasks:
+            print(f"Replaying {CYAN}{len(corpus_tasks)}{RESET} corpus cases first.")
+
+        # The asyncio supervisor drives all children from this process
+        # (a pool is still needed to replay the corpus)
+        use_pool = self.cfg_tester["scheduler"] != "asyncio" or corpus_tasks
+        pool = self._make_pool() if use_pool else None
+        tests_run = checkpoint["tests_run"] if checkpoint else 0
+        slowest = None  # Slowest passing result, for profile_slowest_passing
+        self._shard_last_write = 0.0
+        self._shard_tick("running", tests_run, force=True)
+        telemetry = RunTelemetry(self.num_workers, self.cfg_paths["run_log_file"])
+        if checkpoint:
+            telemetry.slowest = tuple(checkpoint["slowest"])
+            telemetry.max_rss = checkpoint["max_rss"]
+
+        # Checkpoint progress: results arrive out of order, so only the
+        # seeds below 'next_seed' are known to be all done
+        next_seed, done_seeds = self.first_test, set()
+        self._checkpoint_last_write = time.monotonic()
+        history = self._open_history() if self.cfg_paths["history_db"] else None
+        outcome = "interrupted"
+
+        # Batched generation: a bounded queue of pre-generated cases
+        slots, tasks_stop = None, threading.Event()
+        if self.batch_size > 1:
+            slots = threading.Semaphore(2 * self.batch_size * self.num_workers)
+            tasks = self._batched_tasks(slots, tasks_stop)
+        else:
+            tasks = ((i, None) for i in range(self.first_test, self.last_test + 1))
 
         try:
-            # imap_unordered is best for performance
-            for result in pool.imap_unordered(self._run_single_test, test_indices):
+            if self.cfg_tester["scheduler"] == "pipelined":
+                slots = None
+                results = self._pipelined_results()
+            elif self.cfg_tester["scheduler"] == "asyncio":
+                slots = None
+                results = self._asyncio_results()
+            else:
+                # imap_unordered is best for performance
+                results = pool.imap_unordered(
+                    self._run_task, itertools.chain(corpus_tasks, tasks)
+                )
+            if corpus_tasks and self.cfg_tester["scheduler"] != "sequential":
+                # The other schedulers only start once the corpus is done
+                results = itertools.chain(
+                    pool.imap_unordered(self._run_task, corpus_tasks), results
+                )
+
+            for result in results:
+                if slots:
+                    slots.release()
+                if result[0] > 0:  # Not a corpus case
+                    done_seeds.add(result[0])
+                    while next_seed in done_seeds:
+                        done_seeds.remove(next_seed)
+                        next_seed += 1
+                if (
+                    self.cfg_paths["checkpoint_file"]
+                    and time.monotonic() - self._checkpoint_last_write
+                    >= self.cfg_tester["checkpoint_interval_s"]
+                ):
+                    self._write_checkpoint(next_seed, tests_run, telemetry, checkpoint)
+                if result[1] == "Duplicate":
+                    continue  # Already judged; counted by the deduplicator
                 tests_run += 1
+                if self._is_near_limit(result[1], result[3]):
+                    result = self._reverify_timing(result)
                 test_index, verdict, test_case, sol_a, sol_b, gen_result = result
+                telemetry.record(result)
+                if history:
+                    history.record(result)
+                if verdict == "OK" and (slowest is None or sol_a["time"] > slowest[3]["time"]):
+                    slowest = result
+
+                if verdict == "OK" and self._shard_tick("running", tests_run):
+                    tasks_stop.set()
+                    if pool:
+                        pool.terminate()
+                        pool.join()
+                    self._shard_tick("stopped", tests_run, force=True)
+                    print(f"\n\n{YELLOW}Stopped by the coordinator (another shard failed).{RESET}")
+                    outcome = "stopped"
+                    return
 
                 # --- Centralized Printing ---
-                if verdict == "OK":
+                if verdict == "OK" and self.cfg_tester["live_status"]:
+                    telemetry.maybe_print()
+                elif verdict == "OK":
                     print(f"{GREEN}.{RESET}", end="", flush=True)
                     if tests_run % 80 == 0:  # Newline every 80 tests
+                        if self.stage_stats:
+                            print(f"  {self._format_stage_depths()}", end="")
                         print()
                 else:
                     # Failure found! Stop everything.
-                    pool.terminate()
+                    tasks_stop.set()
+                    outcome = f"failed: {verdict}"
+                    if pool:
+                        pool.terminate()
+                    telemetry.close()
+                    print(f"\n{telemetry.status_line()}", end="")
 
                     # --- Full Failure Report ---
                     print(
-                        f"\n\n{RED}--- FAILURE on Test #{test_index}: {verdict} ---{RESET}"
+                        f"\n\n{RED}--- FAILURE on {self._describe_case(test_index, gen_result)}: "
+                        f"{verdict} ---{RESET}"
                     )
 
                     time_str = f"Time: {sol_a['time']:.3f}s"
-                    mem_str = f"Mem: {sol_a['mem_mb']:.1f}MB"
+                    mem_str = f"Mem: {self._format_mem(sol_a)}"
                     print(f"({time_str}, {mem_str})\n")
+                    if "queries" in sol_a:
+                        print(
+                            f"Queries: {sol_a['queries']}, round latency "
+                            f"mean {sol_a['round_latency_mean'] * 1000:.2f}ms, "
+                            f"max {sol_a['round_latency_max'] * 1000:.2f}ms\n"
+                        )
+                    if sol_a.get("calibrated"):
+                        calibration = sol_a["calibrated"]
+                        print(
+                            f"Re-verified over {calibration['runs']} serial runs: "
+                            f"median {calibration['median_time']:.3f}s, "
+                            f"{calibration['tle_runs']}/{calibration['runs']} TLE "
+                            f"(first run: {calibration['first_verdict']})\n"
+                        )
 
                     # Save the failing test case
                     failing_file = Path(self.cfg_paths["failing_input_file"])
                     failing_file.write_text(test_case)
-                    print(f"Failing test case saved to '{failing_file}'\n")
+                    print(f"Failing test case saved to '{failing_file}'")
+                    if gen_result.get("seed") is not None:
+                        print(f"Reproduce with: {self._describe_seed(gen_result)}")
+                    if self.cfg_paths["corpus_dir"] and verdict not in UNMINIMIZABLE_VERDICTS:
+                        corpus_file = self._save_to_corpus(test_case, verdict, gen_result)
+                        print(f"Added to the regression corpus as '{corpus_file.name}'")
+                    print()
+                    self._shard_tick(
+                        "failed",
+                        tests_run,
+                        {
+                            "test": test_index,
+                            "verdict": verdict,
+                            "reproduce": self._describe_seed(gen_result)
+                            if gen_result.get("seed") is not None
+                            else str(failing_file),
+                        },
+                        force=True,
+                    )
 
                     # --- Detailed Report ---
-                    print(f"{CYAN}--- INPUT ---{RESET}")
-                    print(test_case)
-                    print(f"\n{CYAN}--- YOUR ({verdict}) ANSWER ---{RESET}")
-                    print(sol_a["stdout"])
+                    self._print_failure_details(verdict, test_case, sol_a, sol_b, gen_result)
 
-                    if verdict == "Wrong Answer":
-                        print(f"\n{CYAN}--- CORRECT (Brute) ANSWER ---{RESET}")
-                        print(sol_b["stdout"])
+                    if self.stage_stats:
+                        print(f"\n{self._format_stage_depths()}")
 
-                    if gen_result["stderr"]:
-                        print(
-                            f"\n{CYAN}--- GENERATOR STDERR ---{RESET}\n{gen_result['stderr']}"
-                        )
-                    if sol_a["stderr"]:
-                        print(
-                            f"\n{CYAN}--- YOUR (solution_a) STDERR ---{RESET}\n{sol_a['stderr']}"
-                        )
-                    if sol_b["stderr"]:
-                        print(
-                            f"\n{CYAN}--- BRUTE FORCE (solution_b) STDERR ---{RESET}\n{sol_b['stderr']}"
-                        )
+                    if pool:
+                        pool.join()  # Wait for termination
+
+                    if verdict in ("TLE (OS)", "TLE (Wall)") and self.cfg_tester["profile_on_tle"]:
+                        self._profile_case(test_case, "failing input")
+                    elif verdict.startswith("MLE") and self.cfg_tester["diagnose_mle"]:
+                        self._diagnose_memory(test_case)
 
-                    pool.join()  # Wait for termination
+                    if (
+                        self.cfg_tester["minimize"]
+                        and verdict not in UNMINIMIZABLE_VERDICTS
+                    ):
+                        minimized = self._minimize_failure(result)
+                        if minimized is not result:
+                            self._report_minimized(minimized)
+                            if self.cfg_paths["corpus_dir"]:
+                                self._save_to_corpus(
+                                    minimized[2], minimized[1], gen_result, minimized=True
+                                )
                     return  # Exit the run() method
 
             # Loop finished without a 'break'
+            outcome = "passed"
+            self._shard_tick("passed", tests_run, force=True)
+            telemetry.close()
+            print(f"\n{telemetry.status_line()}", end="")
             print(f"\n\n{GREEN}Passed all {tests_run} tests!{RESET}")
-            pool.close()
-            pool.join()
+            if self.stage_stats:
+                print(self._format_stage_depths())
+            if pool:
+                pool.close()
+                pool.join()
+            if slowest and self.cfg_tester["profile_slowest_passing"]:
+                slowest_case = self._describe_case(slowest[0], slowest[5]).lower()
+                print(f"\nSlowest passing case: {slowest_case} ({slowest[3]['time']:.3f}s)")
+                self._profile_case(slowest[2], "slowest passing input")
 
         except KeyboardInterrupt:
             # The SIGINT signal handler (_main_shutdown_handler)
@@ -516,9 +5078,27 @@ class StressTester:
         except Exception as e:
             # Catch any other unexpected error
             print(f"\n\n{RED}A critical error occurred: {e}{RESET}")
+            telemetry.close()
+            tasks_stop.set()
             if pool:
                 pool.terminate()
                 pool.join()
+        finally:
+            if history:
+                history.close(outcome, tests_run)
+            if self.cfg_paths["checkpoint_file"]:
+                if outcome == "passed" or outcome.startswith("failed"):
+                    Path(self.cfg_paths["checkpoint_file"]).unlink(missing_ok=True)
+                else:
+                    self._write_checkpoint(next_seed, tests_run, telemetry, checkpoint)
+                    print(
+                        f"Progress saved to '{self.cfg_paths['checkpoint_file']}' "
+                        f"(next seed {next_seed}); continue with --resume."
+                    )
+            if dedup_manager:
+                self._report_duplicates()
+                dedup_manager.shutdown()
+                deduplicator = None
 
 
 if __name__ == "__main__":
@@ -536,10 +5116,86 @@ if __name__ == "__main__":
         # Build the absolute path to the config.json file
         CONFIG_FILE_PATH = SCRIPT_DIR / "config.json"
 
+        parser = argparse.ArgumentParser(
+            description="Parallel stress tester for competitive programming solutions."
+        )
+        parser.add_argument(
+            "mode",
+            nargs="?",
+            default="stress",
+            choices=["stress", "benchmark", "coordinate", "hunt", "watch", "compare"],
+            help="'stress' (default) compares solution_a with solution_b; "
+            "'benchmark' measures how solution_a scales with input size; "
+            "'coordinate' runs the seed range as shards and merges them; "
+            "'hunt' searches for the input that makes solution_a slowest; "
+            "'watch' re-runs on every edit of the scripts; "
+            "'compare' compares the timings of two recorded runs",
+        )
+        parser.add_argument(
+            "--seed-range",
+            metavar="A:B",
+            help="only test seeds A..B-1 (e.g. one shard per machine)",
+        )
+        parser.add_argument(
+            "--shard-dir",
+            help="directory (possibly shared) where shards publish progress",
+        )
+        parser.add_argument(
+            "--shards", type=int, default=2, help="number of shards to coordinate"
+        )
+        parser.add_argument(
+            "--watch-only",
+            action="store_true",
+            help="coordinate shards started elsewhere instead of launching them",
+        )
+        parser.add_argument(
+            "--base",
+            help="compare: base run id or solution_a hash prefix (default: previous version)",
+        )
+        parser.add_argument(
+            "--new", help="compare: new run id or solution_a hash prefix (default: latest run)"
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="continue an interrupted run from paths.checkpoint_file",
+        )
+        parser.add_argument("--num-cores", type=int, help="override tester.num_cores")
+        args = parser.parse_args()
+
+        overrides = {}
+        if args.seed_range:
+            first, _, end = args.seed_range.partition(":")
+            overrides["first_seed"] = int(first)
+            overrides["max_tests"] = int(end) - int(first)
+        if args.shard_dir:
+            overrides["shard_dir"] = str(Path(args.shard_dir).resolve())
+        if args.num_cores is not None:
+            overrides["num_cores"] = args.num_cores
+
         try:
-            tester = StressTester(config_path=CONFIG_FILE_PATH, script_dir=SCRIPT_DIR)
-            tester.run()
+            tester = StressTester(
+                config_path=CONFIG_FILE_PATH,
+                script_dir=SCRIPT_DIR,
+                tester_overrides=overrides,
+            )
+            if args.mode == "benchmark":
+                tester.benchmark()
+            elif args.mode == "hunt":
+                tester.hunt()
+            elif args.mode == "watch":
+                tester.watch()
+            elif args.mode == "compare":
+                tester.compare(args.base, args.new)
+            elif args.mode == "coordinate":
+                tester.coordinate(args.shards, launch=not args.watch_only, resume=args.resume)
+            else:
+                tester.run(resume=args.resume)
         except (FileNotFoundError, KeyError, json.JSONDecodeError) as e:
             # Catch config-related startup errors
             print(f"\n{RED}Configuration Error: {e}{RESET}")
             sys.exit(1)
+        except RuntimeError as e:
+            # A "build" entry failed to compile
+            print(f"\n{RED}{e}{RESET}")
+            sys.exit(1)
@@ -0,0 +1,324 @@
+"""
+Fast random test data for stress_test generators.
+
+    import testgen as tg
+
+    n = tg.param("N", tg.randint(1, 10))
+    a = tg.array(n, 1, 10**9)
+    tg.emit(n, a)
+
+The module-level functions share one generator seeded from STRESS_SEED
+(set by main.py for every test), so any case can be regenerated from its
+test index; Gen(seed) gives an independent stream. Primitives draw a
+whole batch per call (random.choices / random.sample / getrandbits)
+instead of one random.randint per element, and the formatters build the
+whole input as one string that is written once.
+
+NumPy is used only when asked for (Gen(seed, numpy=True)): it is faster
+for huge arrays, but its stream differs from the 'random' one, so the
+same seed gives other cases than on a machine without NumPy.
+"""
+
+import math
+import os
+import random
+import sys
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# Same names as in main.py
+SEED_ENV = "STRESS_SEED"
+BATCH_SIZE_ENV = "STRESS_BATCH_SIZE"
+PARAM_ENV_PREFIX = "STRESS_"
+
+# Ranges wider than this lose uniformity in random.choices (53-bit floats)
+_CHOICES_MAX_RANGE = 2**53
+
+LOWERCASE = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _env_seed():
+    """$STRESS_SEED as an int (any other string is used as is), or None."""
+    seed = os.environ.get(SEED_ENV)
+    if seed is None:
+        return None
+    try:
+        return int(seed)
+    except ValueError:
+        return seed
+
+
+def param(name, default):
+    """
+    Integer parameter NAME from $STRESS_NAME (set by the benchmark as
+    STRESS_N, and by the worst-case hunter), else 'default'.
+    """
+    value = os.environ.get(PARAM_ENV_PREFIX + name)
+    return int(value) if value is not None else default
+
+
+class Gen:
+    """A seeded source of random test data."""
+
+    def __init__(self, seed=None, numpy=False):
+        if numpy and not HAS_NUMPY:
+            raise ImportError("Gen(numpy=True) needs NumPy installed.")
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed) if numpy else None
+
+    # --- Scalars ---
+
+    def randint(self, lo, hi):
+        """Uniform integer in [lo, hi]."""
+        return self.rng.randint(lo, hi)
+
+    def choice(self, values):
+        """One element of 'values', uniformly."""
+        return self.rng.choice(values)
+
+    # --- Arrays ---
+
+    def array(self, n, lo, hi):
+        """n uniform integers in [lo, hi]."""
+        if self.np_rng is not None and -(2**63) <= lo and hi < 2**63 - 1:
+            return self.np_rng.integers(lo, hi + 1, size=n).tolist()
+        if hi - lo + 1 <= _CHOICES_MAX_RANGE:
+            return self.rng.choices(range(lo, hi + 1), k=n)
+        bits = (hi - lo).bit_length()
+        getrandbits = self.rng.getrandbits
+        values = []
+        while len(values) < n:
+            value = getrandbits(bits)
+            if value <= hi - lo:
+                values.append(lo + value)
+        return values
+
+    def distinct(self, n, lo, hi):
+        """n distinct integers in [lo, hi], in random order."""
+        if n > hi - lo + 1:
+            raise ValueError(f"Cannot pick {n} distinct values from [{lo}, {hi}].")
+        return self.rng.sample(range(lo, hi + 1), n)
+
+    def sorted_array(self, n, lo, hi, distinct=False):
+        values = self.distinct(n, lo, hi) if distinct else self.array(n, lo, hi)
+        values.sort()
+        return values
+
+    def permutation(self, n, start=1):
+        """A uniform permutation of start..start+n-1."""
+        if self.np_rng is not None:
+            return (self.np_rng.permutation(n) + start).tolist()
+        values = list(range(start, start + n))
+        self.rng.shuffle(values)
+        return values
+
+    # --- Strings ---
+
+    def string(self, n, alphabet=LOWERCASE):
+        """n characters drawn uniformly from 'alphabet'."""
+        return "".join(self.rng.choices(alphabet, k=n))
+
+    def brackets(self, pairs, brackets="()"):
+        """
+        A uniform balanced bracket sequence with 'pairs' pairs: by the
+        cycle lemma, exactly one rotation of a shuffle of n opening and
+        n + 1 closing brackets is a Dyck word followed by one closing
+        bracket.
+        """
+        opening, closing = brackets
+        steps = [1] * pairs + [-1] * (pairs + 1)
+        self.rng.shuffle(steps)
+        depth, lowest, start = 0, 0, 0
+        for index, step in enumerate(steps):
+            depth += step
+            if depth < lowest:
+                lowest, start = depth, index + 1
+        rotated = steps[start:] + steps[:start]
+        return "".join(opening if step == 1 else closing for step in rotated[:-1])
+
+    # --- Trees and graphs (vertices 1..n, edges as (u, v) tuples) ---
+
+    def parents(self, n, depth="random"):
+        """
+        Parent array of a tree rooted at 1: parents[i] is the parent of
+        vertex i + 2. 'depth' is "random" (parent drawn among all earlier
+        vertices, O(log n) deep), "deep" (among the last few) or "path".
+        """
+        if depth == "path":
+            return list(range(1, n))
+        if depth == "deep":
+            return [max(1, v - self.rng.randint(1, 3)) for v in range(2, n + 1)]
+        random_ = self.rng.random
+        return [int(random_() * (v - 1)) + 1 for v in range(2, n + 1)]
+
+    def tree(self, n, shape="uniform"):
+        """
+        Edges of a random tree on 1..n, in random order and orientation.
+        'shape': "uniform" (a uniform labeled tree, by Pruefer decoding),
+        "random", "deep" or "path" (see parents()) or "star"; all but
+        "uniform" are relabeled randomly.
+        """
+        if n <= 1:
+            return []
+        if shape == "uniform":
+            edges = self._pruefer_tree(n)
+        else:
+            if shape == "star":
+                parents = [1] * (n - 1)
+            else:
+                parents = self.parents(n, shape)
+            labels = [0] + self.permutation(n)
+            edges = [(labels[parent], labels[child]) for child, parent in enumerate(parents, 2)]
+        self.rng.shuffle(edges)
+        return self._orient(edges)
+
+    def _orient(self, edges):
+        """Flips each edge with probability 1/2 (one random bit per edge)."""
+        flips = format(self.rng.getrandbits(len(edges)), f"0{len(edges)}b")
+        return [(v, u) if flip == "1" else (u, v) for flip, (u, v) in zip(flips, edges)]
+
+    def _pruefer_tree(self, n):
+        """Linear-time decoding of a uniform random Pruefer sequence."""
+        if n <= 1:
+            return []
+        if n == 2:
+            return [(1, 2)]
+        code = self.array(n - 2, 1, n)
+        degree = [1] * (n + 1)
+        for vertex in code:
+            degree[vertex] += 1
+        edges = []
+        pointer = 1
+        while degree[pointer] != 1:
+            pointer += 1
+        leaf = pointer
+        for vertex in code:
+            edges.append((leaf, vertex))
+            degree[vertex] -= 1
+            if degree[vertex] == 1 and vertex < pointer:
+                leaf = vertex
+            else:
+                pointer += 1
+                while degree[pointer] != 1:
+                    pointer += 1
+                leaf = pointer
+        edges.append((leaf, n))
+        return edges
+
+    def _pairs(self, n, m):
+        """m distinct unordered pairs (i, j), 0 <= i < j < n."""
+        indices = self.rng.sample(range(n * (n - 1) // 2), m)
+        pairs = []
+        for index in indices:
+            j = (1 + math.isqrt(1 + 8 * index)) // 2
+            pairs.append((index - j * (j - 1) // 2, j))
+        return pairs
+
+    def dag(self, n, m):
+        """m distinct edges of a random DAG on 1..n (hidden random topological order)."""
+        if m > n * (n - 1) // 2:
+            raise ValueError(f"A DAG on {n} vertices has at most {n * (n - 1) // 2} edges.")
+        order = self.permutation(n)
+        return [(order[i], order[j]) for i, j in self._pairs(n, m)]
+
+    def graph(self, n, m, connected=True):
+        """
+        m distinct edges of a simple undirected graph on 1..n (no loops
+        or multi-edges), connected if asked: a uniform spanning tree plus
+        m - n + 1 extra edges.
+        """
+        total = n * (n - 1) // 2
+        if m > total:
+            raise ValueError(f"A simple graph on {n} vertices has at most {total} edges.")
+        if not connected:
+            labels = self.permutation(n)
+            return [(labels[i], labels[j]) for i, j in self._pairs(n, m)]
+        if m < n - 1:
+            raise ValueError(f"A connected graph on {n} vertices needs at least {n - 1} edges.")
+
+        edges = self._pruefer_tree(n)
+        seen = {(min(u, v), max(u, v)) for u, v in edges}
+        # Tree edges are at most n - 1 of the sampled pairs
+        for i, j in self._pairs(n, min(total, m - (n - 1) + len(seen))):
+            if len(edges) == m:
+                break
+            if (i + 1, j + 1) not in seen:
+                edges.append((i + 1, j + 1))
+        self.rng.shuffle(edges)
+        return self._orient(edges)
+
+    def weighted(self, edges, lo, hi):
+        """(u, v, w) triples with uniform weights in [lo, hi]."""
+        return [(u, v, w) for (u, v), w in zip(edges, self.array(len(edges), lo, hi))]
+
+
+# --- Formatters ---
+
+
+def line(values):
+    """Space-separated values on one line."""
+    return " ".join(map(str, values))
+
+
+def lines(rows):
+    """One line per row (each a scalar or a sequence)."""
+    return "\n".join(
+        line(row) if isinstance(row, (list, tuple)) else str(row) for row in rows
+    )
+
+
+def render(*parts):
+    """
+    The text of an input: each part on its own line(s). A scalar or a
+    string is one line, a list of scalars one space-separated line, and
+    a list of tuples/lists (e.g. edges) one line per item.
+    """
+    out = []
+    for part in parts:
+        if isinstance(part, (list, tuple)):
+            if part and isinstance(part[0], (list, tuple)):
+                out.append(lines(part))
+            else:
+                out.append(line(part))
+        else:
+            out.append(str(part))
+    return "\n".join(out)
+
+
+def emit(*parts):
+    """Writes render(*parts) to stdout in one call."""
+    sys.stdout.write(render(*parts) + "\n")
+
+
+def emit_cases(make_case, delimiter="---"):
+    """
+    Batched generation: writes $STRESS_BATCH_SIZE cases (1 if unset),
+    each the string returned by make_case(), separated by 'delimiter'
+    lines (main.py's tester.generator_delimiter).
+    """
+    count = int(os.environ.get(BATCH_SIZE_ENV, "1"))
+    sys.stdout.write(f"\n{delimiter}\n".join(make_case() for _ in range(count)) + "\n")
+
+
+# --- Module-level generator (seeded from $STRESS_SEED) ---
+
+_default = Gen(_env_seed())
+randint = _default.randint
+choice = _default.choice
+array = _default.array
+distinct = _default.distinct
+sorted_array = _default.sorted_array
+permutation = _default.permutation
+string = _default.string
+brackets = _default.brackets
+parents = _default.parents
+tree = _default.tree
+dag = _default.dag
+graph = _default.graph
+weighted = _default.weighted
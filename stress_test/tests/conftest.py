@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# main.py and testgen.py are scripts, not a package: import them from
+# their directory, as generators do with 'import testgen'
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
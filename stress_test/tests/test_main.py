@@ -0,0 +1,138 @@
+import hashlib
+import io
+import signal
+
+import pytest
+
+from main import CaseDeduplicator, StressTester
+
+
+def digest(text):
+    """A case digest as _mark_duplicates computes it."""
+    return hashlib.sha256(text.encode()).digest()[:16]
+
+
+@pytest.fixture
+def tester():
+    """A StressTester with just the settings the comparison reads."""
+    tester = StressTester.__new__(StressTester)
+    tester.cfg_tester = {"float_eps": 1e-6}
+    return tester
+
+
+# --- Token comparison ---
+
+
+@pytest.mark.parametrize(
+    "got, expected",
+    [
+        ("1 2 3", "1 2 3"),
+        ("1\n2   3\n", "1 2\n3"),
+        ("0.3333333", "0.333333333"),
+        ("1000000.5", "1000000.0"),  # Within the relative epsilon
+        ("1e-7", "0"),  # Within the absolute epsilon
+        ("2.0E3", "2000.0"),
+    ],
+)
+def test_token_streams_match(tester, got, expected):
+    assert tester._compare_token_streams(io.StringIO(got), io.StringIO(expected)) is None
+
+
+@pytest.mark.parametrize(
+    "got, expected, message",
+    [
+        ("1 2 4", "1 2 3", "Line 1, token 3: expected '3', got '4'"),
+        ("1000001", "1000000", "expected '1000000', got '1000001'"),  # Integers are exact
+        ("0.5001", "0.5", "expected '0.5', got '0.5001'"),
+        ("1 2", "1 2 3", "Output ended early: expected '3' at line 1, token 3"),
+        ("1 2 3\n4", "1 2 3", "Extra output: '4' at your line 2, token 1"),
+        ("nan", "1.0", "expected '1.0', got 'nan'"),
+    ],
+)
+def test_token_streams_differ(tester, got, expected, message):
+    detail = tester._compare_token_streams(io.StringIO(got), io.StringIO(expected))
+    assert detail is not None
+    assert message in detail
+
+
+# --- Growth model fit ---
+
+SIZES = [1000, 2000, 5000, 10000, 20000, 50000, 100000, 200000]
+
+
+@pytest.mark.parametrize(
+    "model, cost",
+    [
+        ("O(n)", lambda n: 0.02 + 2e-7 * n),
+        ("O(n log n)", lambda n: 0.02 + 5e-8 * n * (n.bit_length() - 1)),
+        ("O(n^2)", lambda n: 0.02 + 1e-10 * n * n),
+    ],
+)
+def test_fit_complexity_finds_the_growth_model(model, cost):
+    fits = StressTester._fit_complexity([(n, cost(n)) for n in SIZES])
+    best, a, c, rms = fits[0]
+    assert best == model
+    assert a == pytest.approx(0.02, abs=0.01)
+    assert rms < 0.05
+
+
+def test_fit_complexity_sorts_by_error_and_skips_shrinking_models():
+    fits = StressTester._fit_complexity([(n, 0.05) for n in SIZES])
+    errors = [fit[3] for fit in fits]
+    assert errors == sorted(errors)
+    assert all(c >= 0 for _, _, c, _ in fits)
+    assert fits[0][3] == pytest.approx(0.0, abs=1e-9)
+
+
+# --- Case deduplication ---
+
+
+def test_deduplicator_is_exact_below_the_limit():
+    dedup = CaseDeduplicator(exact_limit=10, bloom_mb=1)
+    assert dedup.mark_seen([digest("a"), digest("b"), digest("a")]) == [False, False, True]
+    assert dedup.stats()["bloom"] is False
+    assert (dedup.unique, dedup.duplicates) == (2, 1)
+
+
+def test_deduplicator_switches_to_a_bloom_filter_past_the_limit():
+    dedup = CaseDeduplicator(exact_limit=3, bloom_mb=1)
+    first = [digest(str(i)) for i in range(4)]
+    assert dedup.mark_seen(first) == [False] * 4
+    assert dedup.bloom is not None
+    assert not dedup.exact
+
+    # Digests seen before the switch are still known, new ones are not
+    assert dedup.mark_seen(first) == [True] * 4
+    assert dedup.mark_seen([digest(str(i)) for i in range(4, 100)]) == [False] * 96
+    assert (dedup.unique, dedup.duplicates) == (100, 4)
+
+
+# --- Exit status classification ---
+
+
+@pytest.mark.parametrize(
+    "returncode, stderr, kwargs, verdict",
+    [
+        (-signal.SIGXCPU, "", {}, "TLE (OS)"),
+        # The hard CPU limit of a child that ignored SIGXCPU
+        (-signal.SIGKILL, "", {"cpu_time": 2.0, "time_limit_s": 1}, "TLE (OS)"),
+        # The OOM killer at the memory limit
+        (-signal.SIGKILL, "", {"peak_mb": 256.0, "mem_limit_mb": 256}, "MLE (Safety Net)"),
+        (
+            -signal.SIGKILL,
+            "",
+            {"cpu_time": 0.1, "peak_mb": 10.0, "time_limit_s": 1, "mem_limit_mb": 256},
+            "RE (signal SIGKILL)",
+        ),
+        (-signal.SIGKILL, "", {}, "RE (signal SIGKILL)"),
+        (-signal.SIGSEGV, "", {}, "RE (Segfault)"),
+        (-signal.SIGABRT, "terminate called after throwing an instance of 'std::bad_alloc'", {}, "MLE (Safety Net)"),
+        (-signal.SIGABRT, "", {}, "RE (signal SIGABRT)"),
+        (-signal.SIGFPE, "", {}, "RE (signal SIGFPE)"),
+        (1, "Traceback ...\nMemoryError", {}, "MLE (from Python)"),
+        (101, "memory allocation of 1024 bytes failed", {}, "MLE (Safety Net)"),
+        (1, "Traceback ...\nValueError", {}, "RE"),
+    ],
+)
+def test_classify_exit(returncode, stderr, kwargs, verdict):
+    assert StressTester._classify_exit(returncode, stderr, **kwargs) == verdict
@@ -0,0 +1,125 @@
+import pytest
+
+import testgen
+
+
+def is_tree(n, edges):
+    """n - 1 edges on 1..n that connect every vertex (union-find)."""
+    parent = list(range(n + 1))
+
+    def find(v):
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for u, v in edges:
+        parent[find(u)] = find(v)
+    return len(edges) == n - 1 and len({find(v) for v in range(1, n + 1)}) == 1
+
+
+def is_connected(n, edges):
+    adjacent = {v: [] for v in range(1, n + 1)}
+    for u, v in edges:
+        adjacent[u].append(v)
+        adjacent[v].append(u)
+    seen, stack = {1}, [1]
+    while stack:
+        for w in adjacent[stack.pop()]:
+            if w not in seen:
+                seen.add(w)
+                stack.append(w)
+    return len(seen) == n
+
+
+def is_simple(n, edges):
+    """No loops, no multi-edges, vertices in 1..n."""
+    pairs = {(min(u, v), max(u, v)) for u, v in edges}
+    return (
+        len(pairs) == len(edges)
+        and all(u != v for u, v in edges)
+        and all(1 <= u <= n and 1 <= v <= n for u, v in edges)
+    )
+
+
+@pytest.mark.parametrize("shape", ["uniform", "random", "deep", "path", "star"])
+@pytest.mark.parametrize("n", [1, 2, 3, 10, 500])
+def test_tree_is_a_tree(shape, n):
+    gen = testgen.Gen(n)
+    edges = gen.tree(n, shape)
+    assert is_tree(n, edges)
+    assert is_simple(n, edges)
+
+
+@pytest.mark.parametrize("depth", ["random", "deep", "path"])
+def test_parents_point_to_earlier_vertices(depth):
+    parents = testgen.Gen(1).parents(1000, depth)
+    assert len(parents) == 999
+    assert all(1 <= p < v for v, p in enumerate(parents, 2))
+
+
+@pytest.mark.parametrize("n, m", [(1, 0), (2, 1), (5, 4), (5, 10), (50, 49), (50, 300), (200, 5000)])
+def test_graph_is_connected_simple_with_m_edges(n, m):
+    for seed in range(5):
+        edges = testgen.Gen(seed).graph(n, m)
+        assert len(edges) == m
+        assert is_simple(n, edges)
+        assert is_connected(n, edges)
+
+
+@pytest.mark.parametrize("n, m", [(5, 0), (5, 10), (100, 40)])
+def test_disconnected_graph_is_simple_with_m_edges(n, m):
+    edges = testgen.Gen(3).graph(n, m, connected=False)
+    assert len(edges) == m
+    assert is_simple(n, edges)
+
+
+def test_graph_rejects_impossible_edge_counts():
+    gen = testgen.Gen(0)
+    with pytest.raises(ValueError):
+        gen.graph(5, 11)
+    with pytest.raises(ValueError):
+        gen.graph(5, 3)
+
+
+def test_dag_edges_follow_one_topological_order():
+    n, m = 60, 400
+    edges = testgen.Gen(7).dag(n, m)
+    assert len(edges) == m
+    assert is_simple(n, edges)
+    # Kahn's algorithm consumes every vertex only if there is no cycle
+    indegree = {v: 0 for v in range(1, n + 1)}
+    for _, v in edges:
+        indegree[v] += 1
+    ready = [v for v, d in indegree.items() if d == 0]
+    visited = 0
+    while ready:
+        u = ready.pop()
+        visited += 1
+        for a, b in edges:
+            if a == u:
+                indegree[b] -= 1
+                if indegree[b] == 0:
+                    ready.append(b)
+    assert visited == n
+
+
+@pytest.mark.parametrize("pairs", [0, 1, 2, 7, 1000])
+def test_brackets_are_balanced(pairs):
+    for seed in range(20):
+        sequence = testgen.Gen(seed).brackets(pairs, "[]")
+        assert len(sequence) == 2 * pairs
+        depth = 0
+        for bracket in sequence:
+            depth += 1 if bracket == "[" else -1
+            assert depth >= 0
+        assert depth == 0
+
+
+def test_same_seed_gives_the_same_case():
+    assert testgen.Gen(42).graph(30, 60) == testgen.Gen(42).graph(30, 60)
+    assert testgen.Gen(42).array(100, -5, 5) == testgen.Gen(42).array(100, -5, 5)
+
+
+def test_render_puts_each_part_on_its_own_lines():
+    assert testgen.render(3, [1, 2, 3], [(1, 2), (2, 3)], "ab") == "3\n1 2 3\n1 2\n2 3\nab"